@@ -0,0 +1,72 @@
+"""
+Indexed Agent Query Benchmark
+
+Times CollectionAgentAPI queries against a linear scan over the same
+modules, plus the cost of building the indexes and of removing and
+re-adding one module.
+
+Run from the repository root:
+    python -m benchmarks.bench_agent_queries [module_count]
+"""
+
+import sys
+import time
+
+from benchmarks.corpus import CorpusSpec, generate
+from interpreter.agent_api import CollectionAgentAPI
+from interpreter.parser import CogentParser
+
+
+def _per_call(fn, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def _scan_annotated(modules, key):
+    found = []
+
+    def walk(steps):
+        for step in steps:
+            if key in step.annotations:
+                found.append(step)
+            for field in ("steps", "try_steps", "catch_steps"):
+                walk(getattr(step, field, None) or ())
+
+    for module in modules:
+        walk(module.process)
+    return found
+
+
+def run(modules=2000):
+    parser = CogentParser()
+    models = parser.parse_string(generate(CorpusSpec(modules=modules, annotation_density=0.05)),
+                                 as_semantic_model=True).children
+    start = time.perf_counter()
+    api = CollectionAgentAPI(models)
+    build_sec = time.perf_counter() - start
+    queries = {
+        "modules_importing": (lambda: api.modules_importing("Gen7"),
+                              lambda: [m.name for m in models if "Gen7" in m.imports]),
+        "steps_annotated": (lambda: api.steps_annotated("cost"),
+                            lambda: _scan_annotated(models, "cost")),
+        "modules_with_input_type": (lambda: api.modules_with_input_type("List<T0>"),
+                                    lambda: [m.name for m in models if any(i.type_name == "List<T0>" for i in m.inputs)]),
+    }
+    results = {"modules": len(models), "build_sec": build_sec, "queries": {}}
+    for name, (indexed, scan) in queries.items():
+        results["queries"][name] = {"indexed_sec": _per_call(indexed), "scan_sec": _per_call(scan)}
+    module = models[len(models) // 2]
+    results["update_sec"] = _per_call(lambda: (api.remove(module.name), api.add(module)))
+    return results
+
+
+if __name__ == "__main__":
+    modules = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    r = run(modules)
+    print(f"modules {r['modules']}  index build {r['build_sec'] * 1000:.1f} ms  "
+          f"remove+add one module {r['update_sec'] * 1e6:.0f} us")
+    print(f"{'query':26s} {'indexed us':>11s} {'scan us':>10s}")
+    for name, q in r["queries"].items():
+        print(f"{name:26s} {q['indexed_sec'] * 1e6:11.1f} {q['scan_sec'] * 1e6:10.1f}")
@@ -0,0 +1,64 @@
+"""
+Async Runtime Benchmark
+
+Runs a wide `for` loop whose handler is a fake I/O call (an asyncio sleep)
+sequentially and under several @concurrency limits, and reports
+iterations per second next to the thread-pool Runtime for comparison.
+
+Run from the repository root:
+    python -m benchmarks.bench_async_runtime [iterations] [sleep_ms]
+"""
+
+import asyncio
+import sys
+import time
+
+from interpreter.async_runtime import AsyncRuntime
+from interpreter.parser import CogentParser
+from interpreter.runtime import Runtime
+
+SOURCE = '''
+module Wide {{
+    goal: "Wide loop"
+    inputs: [items: List<Int>]
+    process: [{annotation}for item in items: ["Call service"]]
+}}
+'''
+
+
+def run(iterations=500, sleep_ms=10.0, limits=(8, 64, 256)):
+    parser = CogentParser()
+    delay = sleep_ms / 1000
+
+    def module(annotation):
+        return parser.parse_string(SOURCE.format(annotation=annotation), as_semantic_model=True).children[0]
+
+    async def call_service(text, scope):
+        await asyncio.sleep(delay)
+        return scope["item"]
+
+    inputs = {"items": list(range(iterations))}
+    runtime = AsyncRuntime(handlers={"Call service": call_service})
+    results = {}
+    cases = [("sequential", module(""))] + [(f"concurrency={n}", module(f"@concurrency({n}) ")) for n in limits]
+    for name, mod in cases:
+        start = time.perf_counter()
+        runtime.run_sync(mod, inputs)
+        results[f"async {name}"] = iterations / (time.perf_counter() - start)
+
+    def blocking_call(text, scope):
+        time.sleep(delay)
+        return scope["item"]
+
+    with Runtime(handlers={"Call service": blocking_call}, max_workers=limits[0]) as threaded:
+        start = time.perf_counter()
+        threaded.run(module("@parallel "), inputs)
+        results[f"threads workers={limits[0]}"] = iterations / (time.perf_counter() - start)
+    return results
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    sleep_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+    for name, per_sec in run(iterations, sleep_ms).items():
+        print(f"{name:24s} {per_sec:10.0f} iterations/s")
@@ -0,0 +1,56 @@
+"""
+Binary Model Format Benchmark
+
+Compares encode/decode time and encoded size of the binary model format
+against pickle and JSON (via model_to_dict) on a synthetic corpus. Lazy
+decode leaves process lists undecoded until they are touched.
+
+Run from the repository root:
+    python -m benchmarks.bench_binary_format [module_count]
+"""
+
+import json
+import pickle
+import sys
+import time
+
+from benchmarks.corpus import CorpusSpec, generate
+from interpreter.binary_format import encode_modules, decode_modules
+from interpreter.parser import CogentParser
+from interpreter.semantic_model import model_to_dict
+
+
+def _best(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(modules=500):
+    parser = CogentParser()
+    models = parser.parse_string(generate(CorpusSpec(modules=modules, depth=2)), as_semantic_model=True).children
+    codecs = {
+        "binary": (lambda: encode_modules(models), decode_modules),
+        "binary-lazy": (lambda: encode_modules(models), lambda data: decode_modules(data, lazy=True)),
+        "pickle": (lambda: pickle.dumps(models, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads),
+        "json": (lambda: json.dumps(model_to_dict(models)).encode("utf-8"), lambda data: json.loads(data)),
+    }
+    results = {}
+    for name, (encode, decode) in codecs.items():
+        data = encode()
+        results[name] = {
+            "bytes": len(data),
+            "encode_sec": _best(encode),
+            "decode_sec": _best(lambda: decode(data)),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    modules = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    print(f"{'format':12s} {'size KB':>10s} {'encode ms':>10s} {'decode ms':>10s}")
+    for name, r in run(modules).items():
+        print(f"{name:12s} {r['bytes'] / 1024:10.1f} {r['encode_sec'] * 1000:10.2f} {r['decode_sec'] * 1000:10.2f}")
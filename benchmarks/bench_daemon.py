@@ -0,0 +1,58 @@
+"""
+Parse Daemon Benchmark
+
+Compares parsing one file in a fresh `python -m interpreter.cli parse`
+process (interpreter start-up, imports and grammar load every time) with a
+round-trip to a warm ParseDaemon through DaemonClient, cold and cached.
+
+Run from the repository root:
+    python -m benchmarks.bench_daemon [round_trips]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from interpreter.daemon import DaemonClient, ParseDaemon
+
+EXAMPLE = "examples/decking_analysis.cg"
+
+
+def _ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def run(round_trips=200):
+    results = {}
+    results["fresh process"] = _ms(lambda: subprocess.run(
+        [sys.executable, "-m", "interpreter.cli", "parse", "-q", "-j", "1", EXAMPLE],
+        check=True, capture_output=True), 5)
+    with open(EXAMPLE) as f:
+        source = f.read()
+    with tempfile.TemporaryDirectory() as directory:
+        daemon = ParseDaemon(os.path.join(directory, "cogent.sock"))
+        thread = daemon.start()
+        with DaemonClient(daemon.socket_path) as client:
+            counter = iter(range(10 ** 9))
+            # A distinct module name per call defeats the parse cache.
+            results["daemon, uncached"] = _ms(
+                lambda: client.parse(source.replace("DeckingAnalysisTX", f"Deck{next(counter)}")), round_trips)
+            results["daemon, cached"] = _ms(lambda: client.parse(source), round_trips)
+            results["daemon, by path"] = _ms(lambda: client.parse(path=EXAMPLE), round_trips)
+        daemon.shutdown()
+        thread.join()
+    return results
+
+
+if __name__ == "__main__":
+    round_trips = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    for name, ms in run(round_trips).items():
+        print(f"{name:20s} {ms:9.2f} ms median")
@@ -0,0 +1,61 @@
+"""
+Execution Plan Benchmark
+
+Measures per-step dispatch overhead of compiled plans against tree-walking
+on a deeply nested for/try process with a trivial handler, run many times.
+"compiled" includes the per-run plan cache lookup, keyed by the module's
+structural hash, which is cached on the module after the first run;
+"compiled, plan reused" passes the plan in directly, and "compiled,
+invalidated" calls Runtime.invalidate before every run, as a caller that
+edits the module in place must, so the hash is recomputed each time.
+
+Run from the repository root:
+    python -m benchmarks.bench_execution_plan [runs] [depth]
+"""
+
+import sys
+import time
+
+from interpreter.parser import CogentParser
+from interpreter.runtime import Runtime
+
+
+def make_source(depth):
+    """
+    A process `depth` for-loops deep (two iterations each), each level wrapped
+    in try/catch and carrying a couple of text steps.
+    """
+    body = '["Leaf"]'
+    for level in range(depth):
+        body = (f'[try ["Before {level}", for v{level} in items: {body}, "After {level}"] '
+                f'catch err{level} ["Recover {level}"]]')
+    return f'module Deep {{ goal: "Dispatch" inputs: [items: List<Int>] process: {body} }}'
+
+
+def run(runs=50, depth=6):
+    parser = CogentParser()
+    module = parser.parse_string(make_source(depth), as_semantic_model=True).children[0]
+    inputs = {"items": [1, 2]}
+    results = {}
+    scenarios = (("tree-walking", False), ("compiled", True), ("compiled, plan reused", True),
+                 ("compiled, invalidated", True))
+    for name, compiled in scenarios:
+        runtime = Runtime(default=lambda text, scope: None, compiled=compiled)
+        plan = runtime.compile(module) if name.endswith("reused") else None
+        invalidate = name.endswith("invalidated")
+        steps = len(runtime.run(module, inputs, plan=plan).results)
+        start = time.perf_counter()
+        for _ in range(runs):
+            if invalidate:
+                runtime.invalidate(module)
+            runtime.run(module, inputs, plan=plan)
+        elapsed = time.perf_counter() - start
+        results[name] = {"steps_per_run": steps, "ns_per_step": elapsed / (runs * steps) * 1e9}
+    return results
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+    for name, r in run(runs, depth).items():
+        print(f"{name:24s} {r['steps_per_run']:6d} steps/run {r['ns_per_step']:8.0f} ns/step")
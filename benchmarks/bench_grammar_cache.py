@@ -0,0 +1,45 @@
+"""
+Grammar Cache Benchmark
+
+Measures CogentParser construction time:
+  cold        - no in-process grammar and an empty on-disk cache
+  disk-warm   - no in-process grammar, LALR tables loaded from disk
+  memory-warm - grammar already compiled in this process
+
+Run from the repository root:
+    python -m benchmarks.bench_grammar_cache
+"""
+
+import os
+import statistics
+import tempfile
+import time
+
+from interpreter.parser import CogentParser, clear_grammar_cache
+
+TRIALS = 5
+
+
+def _time_construction():
+    start = time.perf_counter()
+    CogentParser()
+    return time.perf_counter() - start
+
+
+def run(trials=TRIALS):
+    results = {"cold": [], "disk-warm": [], "memory-warm": []}
+    for _ in range(trials):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            os.environ["COGENT_CACHE_DIR"] = cache_dir
+            clear_grammar_cache()
+            results["cold"].append(_time_construction())
+            clear_grammar_cache()
+            results["disk-warm"].append(_time_construction())
+            results["memory-warm"].append(_time_construction())
+    os.environ.pop("COGENT_CACHE_DIR", None)
+    return {name: statistics.median(times) for name, times in results.items()}
+
+
+if __name__ == "__main__":
+    for name, seconds in run().items():
+        print(f"{name:12s} {seconds * 1000:10.3f} ms")
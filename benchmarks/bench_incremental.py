@@ -0,0 +1,45 @@
+"""
+Incremental Reparse Benchmark
+
+Edits one process step in the middle of a large multi-module source and
+compares a full `parse_string` against `CogentParser.reparse`.
+
+Run from the repository root:
+    python -m benchmarks.bench_incremental [module_count]
+"""
+
+import statistics
+import sys
+import time
+
+from benchmarks.bench_semantic_build import make_source
+from interpreter.parser import CogentParser
+
+
+def run(modules=500, trials=7):
+    parser = CogentParser()
+    source = make_source(modules)
+    doc = parser.parse_document(source)
+    target = f"module Bench{modules // 2} "
+    step_at = source.index('"Score item"', source.index(target))
+    edit = (step_at, step_at + len('"Score item"'), '"Score item carefully"')
+    edited = source[:edit[0]] + edit[2] + source[edit[1]:]
+
+    full, incremental = [], []
+    for _ in range(trials):
+        start = time.perf_counter()
+        parser.parse_string(edited, as_semantic_model=True)
+        full.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        parser.reparse(doc, *edit)
+        incremental.append(time.perf_counter() - start)
+    full_ms = statistics.median(full) * 1000
+    incremental_ms = statistics.median(incremental) * 1000
+    return {"modules": modules, "full_ms": full_ms, "incremental_ms": incremental_ms,
+            "speedup": full_ms / incremental_ms}
+
+
+if __name__ == "__main__":
+    modules = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    for name, value in run(modules).items():
+        print(f"{name:16s} {value:10.2f}")
@@ -0,0 +1,88 @@
+"""
+Structural Hashing Benchmark
+
+Simulates a feedback loop: a corpus plus `versions` copies in which one
+step per module was edited. Reports
+
+- hashing a module from scratch, and again once cached, against the old
+  content hash (SHA-256 of the binary encoding) that plan caches used,
+- diffing each module against its edited version, against comparing the
+  two with model_to_dict,
+- memory held by all versions before and after dedup_modules.
+
+Run from the repository root:
+    python -m benchmarks.bench_merkle [modules] [versions]
+"""
+
+import gc
+import hashlib
+import sys
+import time
+import tracemalloc
+
+from benchmarks.corpus import CorpusSpec, generate
+from interpreter.binary_format import encode_modules
+from interpreter.merkle import clear_hashes, dedup_modules, diff, structural_hash
+from interpreter.parser import CogentParser
+from interpreter.semantic_model import model_to_dict
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def _edit(source, k):
+    # Change the first step text of every module; the rest stays identical.
+    return source.replace('"Step 0 at', f'"Step 0 v{k} at')
+
+
+def run(modules=200, versions=10):
+    parser = CogentParser()
+    source = generate(CorpusSpec(modules=modules, steps=10, depth=2))
+    base = parser.parse_string(source, as_semantic_model=True).children
+    results = {}
+
+    results["sha256_encode_us"] = _timed(lambda: [hashlib.sha256(encode_modules([m])).hexdigest()
+                                                  for m in base]) / modules * 1e6
+    clear_hashes(base)
+    results["hash_cold_us"] = _timed(lambda: [structural_hash(m) for m in base]) / modules * 1e6
+    results["hash_cached_us"] = _timed(lambda: [structural_hash(m) for m in base]) / modules * 1e6
+
+    edited = parser.parse_string(_edit(source, 0), as_semantic_model=True).children
+    for m in edited:
+        structural_hash(m)
+    changes = []
+    results["diff_us"] = _timed(lambda: [changes.extend(diff(a, b)) for a, b in zip(base, edited)]) / modules * 1e6
+    results["changes"] = len(changes)
+    results["model_to_dict_compare_us"] = _timed(
+        lambda: [model_to_dict(a) == model_to_dict(b) for a, b in zip(base, edited)]) / modules * 1e6
+
+    sources = [_edit(source, k) for k in range(versions)]
+    gc.collect()
+    tracemalloc.start()
+    corpus = [m for s in sources for m in parser.parse_string(s, as_semantic_model=True).children]
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    table = dedup_modules(corpus)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    results["memory_before_kb"] = before / 1024
+    results["memory_after_kb"] = after / 1024
+    results["unique_steps"] = len(table)
+    results["shared_steps"] = table.shared
+    return results
+
+
+if __name__ == "__main__":
+    modules = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    versions = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    r = run(modules, versions)
+    print(f"content hash per module: sha256(encode) {r['sha256_encode_us']:8.1f} us  "
+          f"structural {r['hash_cold_us']:8.1f} us  cached {r['hash_cached_us']:6.2f} us")
+    print(f"compare per module:      diff {r['diff_us']:8.1f} us ({r['changes']} changes)  "
+          f"model_to_dict {r['model_to_dict_compare_us']:8.1f} us")
+    print(f"{versions} versions:             {r['memory_before_kb']:8.0f} KB -> {r['memory_after_kb']:8.0f} KB after dedup "
+          f"({r['unique_steps']} unique steps, {r['shared_steps']} shared)")
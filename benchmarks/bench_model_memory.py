@@ -0,0 +1,38 @@
+"""
+Semantic Model Memory Benchmark
+
+Parses a synthetic corpus and uses tracemalloc to report the bytes retained
+per CogentModule (model objects only; the parse itself is excluded).
+
+Run from the repository root:
+    python -m benchmarks.bench_model_memory [module_count]
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from benchmarks.bench_semantic_build import make_source
+from interpreter.parser import CogentParser
+
+
+def run(modules=2000):
+    parser = CogentParser()
+    source = make_source(modules)
+    parser.parse_string(source, as_semantic_model=True)  # warm up grammar and caches
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    models = parser.parse_string(source, as_semantic_model=True).children
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return {"modules": len(models), "bytes_per_module": retained / len(models)}
+
+
+if __name__ == "__main__":
+    modules = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    result = run(modules)
+    print(f"modules          {result['modules']}")
+    print(f"bytes/module     {result['bytes_per_module']:.0f}")
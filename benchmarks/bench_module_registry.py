@@ -0,0 +1,72 @@
+"""
+Module Registry Benchmark
+
+Builds a synthetic import graph `depth` levels deep and `width` modules wide
+(each module imports two modules on the next level) and times a cold
+resolve, a memoized resolve, and a re-resolve after one leaf file changes.
+
+Run from the repository root:
+    python -m benchmarks.bench_module_registry [depth] [width] [workers]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from interpreter.module_registry import ModuleRegistry
+
+
+def write_graph(root, depth, width):
+    root = Path(root)
+    (root / "Root.cg").write_text(
+        "module Root {\n" + "".join(f"    import L0_{j}\n" for j in range(width))
+        + '    goal: "root"\n    inputs: []\n    process: ["Start"]\n}\n'
+    )
+    for level in range(depth):
+        for j in range(width):
+            imports = ""
+            if level + 1 < depth:
+                imports = f"    import L{level + 1}_{j}\n    import L{level + 1}_{(j + 1) % width}\n"
+            (root / f"L{level}_{j}.cg").write_text(
+                f"module L{level}_{j} {{\n{imports}"
+                f'    goal: "level {level}"\n    inputs: [x: Int]\n    process: ["Step", "Another step"]\n}}\n'
+            )
+    return root
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(depth=20, width=20, workers=1):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = write_graph(tmp, depth, width)
+        registry = ModuleRegistry([root], workers=workers)
+        cold = _timed(lambda: registry.resolve("Root"))
+        cold_parses = registry.parses
+        warm = _timed(lambda: registry.resolve("Root"))
+        leaf = root / f"L{depth - 1}_0.cg"
+        leaf.write_text(leaf.read_text().replace('"Step"', '"Changed step"'))
+        invalidated = len(registry.refresh())
+        changed = _timed(lambda: registry.resolve("Root"))
+        return {
+            "modules": depth * width + 1,
+            "cold_s": cold,
+            "cold_parses": cold_parses,
+            "warm_s": warm,
+            "invalidated": invalidated,
+            "after_change_s": changed,
+            "after_change_parses": registry.parses - cold_parses,
+        }
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    depth, width = (args + [20, 20])[:2]
+    workers = args[2] if len(args) > 2 else os.cpu_count() or 1
+    for name, value in run(depth, width, workers).items():
+        print(f"{name:20s} {value:.4f}" if isinstance(value, float) else f"{name:20s} {value}")
@@ -0,0 +1,82 @@
+"""
+Module Store Benchmark
+
+Builds memory-mapped module stores of increasing size and reports open
+time (expected flat), random name lookups per second, and the memory held
+after touching one module versus decoding every module into objects.
+
+Run from the repository root:
+    python -m benchmarks.bench_module_store [max_modules]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.corpus import CorpusSpec, generate
+from interpreter.binary_format import decode_modules
+from interpreter.module_store import ModuleStore, write_store
+from interpreter.parser import CogentParser
+
+
+def run(max_modules=20000):
+    parser = CogentParser()
+    base = parser.parse_string(generate(CorpusSpec(modules=100, depth=2)), as_semantic_model=True).children
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        size = 1000
+        while size <= max_modules:
+            path = os.path.join(tmp, f"store_{size}.cgstore")
+
+            def modules():
+                for i in range(size):
+                    module = base[i % len(base)]
+                    module.name = f"Mod{i}"
+                    yield module
+
+            write_store(path, modules())
+            start = time.perf_counter()
+            store = ModuleStore(path)
+            open_sec = time.perf_counter() - start
+
+            names = [f"Mod{random.randrange(size)}" for _ in range(2000)]
+            start = time.perf_counter()
+            for name in names:
+                store[name]
+            lookups_per_sec = len(names) / (time.perf_counter() - start)
+
+            tracemalloc.start()
+            len(store[names[0]].process)
+            touched_bytes = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            store.close()
+
+            with open(path, "rb") as f:
+                data = f.read()
+            tracemalloc.start()
+            everything = decode_modules(data)
+            all_bytes = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del everything, data
+
+            results.append({
+                "modules": size,
+                "file_bytes": os.path.getsize(path),
+                "open_sec": open_sec,
+                "lookups_per_sec": lookups_per_sec,
+                "touched_bytes": touched_bytes,
+                "decode_all_bytes": all_bytes,
+            })
+            size *= 4
+    return results
+
+
+if __name__ == "__main__":
+    max_modules = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print(f"{'modules':>8s} {'file KB':>10s} {'open us':>8s} {'lookups/s':>10s} {'touch KB':>9s} {'decode-all KB':>14s}")
+    for r in run(max_modules):
+        print(f"{r['modules']:8d} {r['file_bytes'] / 1024:10.0f} {r['open_sec'] * 1e6:8.0f} "
+              f"{r['lookups_per_sec']:10.0f} {r['touched_bytes'] / 1024:9.1f} {r['decode_all_bytes'] / 1024:14.0f}")
@@ -0,0 +1,46 @@
+"""
+Parse Cache Benchmark
+
+Parses a synthetic corpus three times through a ParseCache-backed parser:
+cold (empty cache), disk-warm (fresh process state over a populated cache
+directory) and memory-warm, reporting time and hit/miss counters.
+
+Run from the repository root:
+    python -m benchmarks.bench_parse_cache [file_count]
+"""
+
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_parse_many import write_corpus
+from interpreter.batch import iter_cg_files
+from interpreter.parse_cache import ParseCache
+from interpreter.parser import CogentParser
+
+
+def _parse_all(parser, paths):
+    start = time.perf_counter()
+    for path in paths:
+        parser.parse_file(path, as_semantic_model=True)
+    return time.perf_counter() - start
+
+
+def run(files=1000):
+    rows = []
+    with tempfile.TemporaryDirectory() as corpus, tempfile.TemporaryDirectory() as cache_dir:
+        paths = list(iter_cg_files([write_corpus(corpus, files)]))
+        cache = ParseCache(cache_dir, memory_entries=files)
+        parser = CogentParser(cache=cache)
+        rows.append(("cold", _parse_all(parser, paths), cache.stats()))
+        cache = ParseCache(cache_dir, memory_entries=files)
+        parser = CogentParser(cache=cache)
+        rows.append(("disk-warm", _parse_all(parser, paths), cache.stats()))
+        rows.append(("memory-warm", _parse_all(parser, paths), dict(cache.stats())))
+    return rows
+
+
+if __name__ == "__main__":
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    for name, seconds, stats in run(files):
+        print(f"{name:12s} {seconds:8.3f}s  hits={stats['hits']} misses={stats['misses']}")
@@ -0,0 +1,48 @@
+"""
+Batch Parse Benchmark
+
+Writes a synthetic corpus of .cg files and times `CogentParser.parse_many`
+at increasing worker counts, reporting files/sec and speedup over one worker.
+
+Run from the repository root:
+    python -m benchmarks.bench_parse_many [file_count]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_semantic_build import MODULE_TEMPLATE
+from interpreter.parser import CogentParser
+
+
+def write_corpus(root, files):
+    root = Path(root)
+    for i in range(files):
+        (root / f"module_{i:05d}.cg").write_text(MODULE_TEMPLATE.format(index=i))
+    return root
+
+
+def run(files=2000):
+    cpus = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, 8, cpus} & set(range(1, cpus + 1)))
+    parser = CogentParser()
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        root = write_corpus(tmp, files)
+        for workers in worker_counts:
+            start = time.perf_counter()
+            parsed = sum(1 for r in parser.parse_many([root], workers=workers) if r.ok)
+            elapsed = time.perf_counter() - start
+            rows.append((workers, parsed / elapsed))
+    base = rows[0][1]
+    return [(workers, rate, rate / base) for workers, rate in rows]
+
+
+if __name__ == "__main__":
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"{'workers':>8s} {'files/sec':>12s} {'speedup':>8s}")
+    for workers, rate, speedup in run(files):
+        print(f"{workers:8d} {rate:12.1f} {speedup:8.2f}")
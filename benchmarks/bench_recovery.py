@@ -0,0 +1,63 @@
+"""
+Error Recovery Benchmark
+
+Times a normal semantic parse against parse_with_recovery on the same valid
+corpus (the two should be close: recovery only does extra work at errors),
+and parse_with_recovery on copies of the corpus with one syntax error
+injected per `every` modules, reporting the cost per error found.
+
+Run from the repository root:
+    python -m benchmarks.bench_recovery [modules]
+"""
+
+import sys
+import time
+
+from benchmarks.corpus import CorpusSpec, generate
+from interpreter.parser import CogentParser
+
+
+def _best(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _inject(source, every):
+    # Drop the ':' after every `every`-th module's goal keyword.
+    parts = source.split("goal:")
+    out = [parts[0]]
+    for i, part in enumerate(parts[1:]):
+        out.append(("goal" if i % every == 0 else "goal:") + part)
+    return "".join(out)
+
+
+def run(modules=200):
+    parser = CogentParser()
+    source = generate(CorpusSpec(modules=modules, steps=10, depth=1))
+    parser.parse_with_recovery(source)
+    results = {
+        "parse_string": {"ms": _best(lambda: parser.parse_string(source, as_semantic_model=True)) * 1000},
+        "recovery_valid": {"ms": _best(lambda: parser.parse_with_recovery(source)) * 1000, "errors": 0},
+    }
+    for every in (20, 5, 1):
+        broken = _inject(source, every)
+        errors = len(parser.parse_with_recovery(broken).diagnostics)
+        results[f"recovery_1_in_{every}"] = {"ms": _best(lambda: parser.parse_with_recovery(broken)) * 1000,
+                                             "errors": errors}
+    return results
+
+
+if __name__ == "__main__":
+    modules = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    results = run(modules)
+    base = results["parse_string"]["ms"]
+    for name, r in results.items():
+        errors = r.get("errors")
+        extra = ""
+        if errors:
+            extra = f" {errors:5d} errors {(r['ms'] - base) / errors * 1000:8.1f} us/error"
+        print(f"{name:20s} {r['ms']:8.2f} ms{extra}")
@@ -0,0 +1,62 @@
+"""
+Runtime Scheduling Benchmark
+
+Runs a wide `for` loop sequentially and as @parallel on thread and process
+pools, with an I/O-bound handler (sleeps) and a CPU-bound one, and reports
+iterations per second.
+
+Run from the repository root:
+    python -m benchmarks.bench_runtime [iterations] [workers]
+"""
+
+import sys
+import time
+
+from interpreter.parser import CogentParser
+from interpreter.runtime import Runtime
+
+SOURCE = '''
+module Wide {{
+    goal: "Wide loop"
+    inputs: [items: List<Int>]
+    process: [{annotation}for item in items: ["Work"]]
+}}
+'''
+
+
+def io_work(text, scope):
+    time.sleep(0.002)
+    return scope["item"]
+
+
+def cpu_work(text, scope):
+    total = 0
+    for i in range(20000):
+        total += i * scope["item"]
+    return total
+
+
+def run(iterations=200, workers=8):
+    parser = CogentParser()
+    sequential = parser.parse_string(SOURCE.format(annotation=""), as_semantic_model=True).children[0]
+    parallel = parser.parse_string(SOURCE.format(annotation="@parallel "), as_semantic_model=True).children[0]
+    inputs = {"items": list(range(iterations))}
+    results = {}
+    for work_name, work in (("io", io_work), ("cpu", cpu_work)):
+        for mode, module, executor in (("sequential", sequential, "thread"),
+                                       ("threads", parallel, "thread"),
+                                       ("processes", parallel, "process")):
+            with Runtime(handlers={"Work": work}, max_workers=workers, executor=executor) as runtime:
+                runtime.run(module, {"items": list(range(workers))})  # start the pool
+                start = time.perf_counter()
+                runtime.run(module, inputs)
+                elapsed = time.perf_counter() - start
+            results[f"{work_name}/{mode}"] = iterations / elapsed
+    return results
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    for name, per_sec in run(iterations, workers).items():
+        print(f"{name:16s} {per_sec:10.0f} iterations/s")
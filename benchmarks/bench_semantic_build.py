@@ -0,0 +1,60 @@
+"""
+Semantic Build Benchmark
+
+Compares building CogentModule objects in two passes (parse tree, then
+CogentTransformer) against the single-pass LALR path used by
+`parse_string(..., as_semantic_model=True)`.
+
+Run from the repository root:
+    python -m benchmarks.bench_semantic_build
+"""
+
+import statistics
+import time
+
+from interpreter.parser import CogentParser, CogentTransformer
+
+MODULE_TEMPLATE = '''
+module Bench{index} {{
+    goal: "Benchmark module {index}"
+    inputs: [@required area: Float, items: List<Material>]
+    process: [
+        "Gather",
+        @parallel for item in items: ["Score item", while "not done": ["Refine"]],
+        try ["Risky step"] catch err ["Recover"],
+        "Report"
+    ]
+}}
+'''
+
+
+def make_source(modules=200):
+    return "".join(MODULE_TEMPLATE.format(index=i) for i in range(modules))
+
+
+def _median_time(fn, trials):
+    times = []
+    for _ in range(trials):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def run(modules=200, trials=7):
+    source = make_source(modules)
+    parser = CogentParser()
+    parser.parse_string(source, as_semantic_model=True)  # warm up both paths
+    two_pass = _median_time(lambda: CogentTransformer().transform(parser.parse_string(source)), trials)
+    one_pass = _median_time(lambda: parser.parse_string(source, as_semantic_model=True), trials)
+    return {
+        "modules": modules,
+        "two_pass_modules_per_sec": modules / two_pass,
+        "one_pass_modules_per_sec": modules / one_pass,
+        "speedup": two_pass / one_pass,
+    }
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print(f"{name:26s} {value:12.2f}")
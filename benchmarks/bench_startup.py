@@ -0,0 +1,88 @@
+"""
+Start-up Benchmark
+
+Measures what the lightweight entry points cost to import, using
+`python -X importtime` in a fresh interpreter, and the wall time of
+`cogent --version` against a command that has to load the parser.
+
+IMPORT_BUDGETS_US caps the cumulative import time of each entry point and
+HEAVY_MODULES lists modules none of them may import; tests/test_startup.py
+enforces both.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup [repeat]
+"""
+
+import subprocess
+import sys
+import time
+
+# Cumulative import time allowed per entry module, in microseconds. Generous
+# next to typical figures (a few ms to ~40 ms) so that slow machines pass but
+# an eager Lark or matplotlib import (~100 ms and up) does not.
+IMPORT_BUDGETS_US = {
+    "interpreter": 10_000,
+    "interpreter.cli": 60_000,
+    "interpreter.type_checker": 60_000,
+    "interpreter.daemon": 100_000,
+}
+
+HEAVY_MODULES = ("lark", "matplotlib", "concurrent.futures")
+
+
+def import_profile(module):
+    """
+    Import `module` in a fresh interpreter; returns {imported module: cumulative microseconds}.
+    """
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, check=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def import_cost(module, repeat=3):
+    """
+    Best-of-`repeat` cumulative import time of `module` in microseconds, and the heavy modules it pulled in.
+    """
+    best = None
+    heavy = set()
+    for _ in range(repeat):
+        times = import_profile(module)
+        best = times[module] if best is None else min(best, times[module])
+        heavy.update(name for name in times if name in HEAVY_MODULES)
+    return best, sorted(heavy)
+
+
+def _wall_ms(args, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "interpreter.cli", *args], check=True, capture_output=True)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(repeat=3):
+    results = {}
+    for module, budget in IMPORT_BUDGETS_US.items():
+        cost, heavy = import_cost(module, repeat)
+        results[f"import {module}"] = {"us": cost, "budget_us": budget, "heavy": heavy}
+    results["cogent --version"] = {"ms": _wall_ms(["--version"], repeat)}
+    results["cogent check (local parse)"] = {"ms": _wall_ms(["check", "-j", "1", "examples/"], repeat)}
+    return results
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    for name, r in run(repeat).items():
+        if "us" in r:
+            heavy = f"  imports {', '.join(r['heavy'])}" if r["heavy"] else ""
+            print(f"{name:32s} {r['us'] / 1000:7.1f} ms (budget {r['budget_us'] / 1000:.0f} ms){heavy}")
+        else:
+            print(f"{name:32s} {r['ms']:7.1f} ms wall")
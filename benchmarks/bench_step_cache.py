@@ -0,0 +1,60 @@
+"""
+Step Cache Benchmark
+
+Runs a module whose @cache steps call a slow handler (a sleep standing in
+for a model or service call) once cold and then repeatedly warm, with the
+memory and disk backends, and reports the time per run.
+
+Run from the repository root:
+    python -m benchmarks.bench_step_cache [items] [sleep_ms] [runs]
+"""
+
+import sys
+import tempfile
+import time
+
+from interpreter.parser import CogentParser
+from interpreter.runtime import Runtime
+from interpreter.step_cache import StepCache, MemoryBackend, DiskBackend
+
+SOURCE = '''
+module Scored {
+    goal: "Score items"
+    inputs: [items: List<Int>]
+    process: [@cache "Load rubric", for item in items: [@cache(item) "Score item"], "Report"]
+}
+'''
+
+
+def run(items=50, sleep_ms=5.0, runs=5):
+    parser = CogentParser()
+    module = parser.parse_string(SOURCE, as_semantic_model=True).children[0]
+    delay = sleep_ms / 1000
+    inputs = {"items": list(range(items))}
+
+    def slow(text, scope):
+        time.sleep(delay)
+        return scope.get("item")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, backend in (("memory", MemoryBackend()), ("disk", DiskBackend(directory))):
+            runtime = Runtime(default=slow, step_cache=StepCache(backend))
+            start = time.perf_counter()
+            runtime.run(module, inputs)
+            cold = time.perf_counter() - start
+            start = time.perf_counter()
+            for _ in range(runs):
+                runtime.run(module, inputs)
+            warm = (time.perf_counter() - start) / runs
+            results[name] = {"cold_ms": cold * 1000, "warm_ms": warm * 1000, "stats": runtime.step_cache.stats()}
+    return results
+
+
+if __name__ == "__main__":
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    sleep_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    runs = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    for name, r in run(items, sleep_ms, runs).items():
+        print(f"{name:8s} cold {r['cold_ms']:9.1f} ms  warm {r['warm_ms']:9.2f} ms/run  "
+              f"hits {r['stats']['hits']} misses {r['stats']['misses']}")
@@ -0,0 +1,49 @@
+"""
+Streaming Parse Benchmark
+
+Compares peak traced memory of `parse_file` against consuming
+`CogentParser.iter_modules` one module at a time, on a large generated file.
+
+Run from the repository root:
+    python -m benchmarks.bench_streaming [module_count]
+"""
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.bench_semantic_build import make_source
+from interpreter.parser import CogentParser
+
+
+def _peak(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def run(modules=2000):
+    parser = CogentParser()
+    parser.parse_string(make_source(1), as_semantic_model=True)  # warm grammar
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "large.cg"
+        path.write_text(make_source(modules))
+        full = _peak(lambda: parser.parse_file(path, as_semantic_model=True))
+        streamed = _peak(lambda: sum(1 for _ in parser.iter_modules(path)))
+        size = path.stat().st_size
+    return {"file_bytes": size, "full": full, "streamed": streamed}
+
+
+if __name__ == "__main__":
+    modules = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    result = run(modules)
+    print(f"file size  {result['file_bytes'] / 1024:10.1f} KB")
+    for name in ("full", "streamed"):
+        elapsed, peak = result[name]
+        print(f"{name:9s}  {elapsed:8.3f}s  peak {peak / 1024:10.1f} KB")
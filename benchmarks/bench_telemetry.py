@@ -0,0 +1,38 @@
+"""
+Telemetry Overhead Benchmark
+
+Reports nanoseconds per call for log_event, span begin/end and count, with
+telemetry disabled and enabled (ring buffer, no sinks).
+
+Run from the repository root:
+    python -m benchmarks.bench_telemetry
+"""
+
+import timeit
+
+from interpreter.telemetry import Telemetry
+
+CALLS = 200_000
+
+
+def _ns_per_call(stmt, telemetry):
+    seconds = min(timeit.repeat(stmt, globals={"t": telemetry}, number=CALLS, repeat=5))
+    return seconds / CALLS * 1e9
+
+
+def run():
+    results = {}
+    for label, enabled in (("disabled", False), ("enabled", True)):
+        telemetry = Telemetry(capacity=4096, enabled=enabled)
+        results[label] = {
+            "log_event": _ns_per_call("t.log_event('e', None)", telemetry),
+            "span": _ns_per_call("t.end_span(t.begin_span('s'))", telemetry),
+            "count": _ns_per_call("t.count('c')", telemetry),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    for label, calls in run().items():
+        for name, ns in calls.items():
+            print(f"{label:9s} {name:10s} {ns:8.1f} ns/call")
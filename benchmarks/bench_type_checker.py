@@ -0,0 +1,42 @@
+"""
+Type Checker Benchmark
+
+Checks synthetic batches of increasing size (each module imports the
+previous one and declares generic aliases and enums) and reports time per
+module, which should stay flat if checking is linear, plus the number of
+distinct types in the table and diagnostics found.
+
+Run from the repository root:
+    python -m benchmarks.bench_type_checker [max_modules]
+"""
+
+import sys
+import time
+
+from benchmarks.corpus import CorpusSpec, generate
+from interpreter.parser import CogentParser
+from interpreter.type_checker import TypeChecker, TypeTable
+
+
+def run(max_modules=2000):
+    parser = CogentParser()
+    results = {}
+    count = max_modules // 8
+    while count <= max_modules:
+        source = generate(CorpusSpec(modules=count, steps=2, depth=0, types=4, enums=2))
+        modules = parser.parse_string(source, as_semantic_model=True).children
+        table = TypeTable()
+        start = time.perf_counter()
+        result = TypeChecker(table).check(modules)
+        elapsed = time.perf_counter() - start
+        results[count] = {"us_per_module": elapsed / count * 1e6, "types": len(table),
+                          "diagnostics": len(result.diagnostics)}
+        count *= 2
+    return results
+
+
+if __name__ == "__main__":
+    max_modules = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    for count, r in run(max_modules).items():
+        print(f"{count:6d} modules {r['us_per_module']:8.1f} us/module "
+              f"{r['types']:6d} types {r['diagnostics']:7d} diagnostics")
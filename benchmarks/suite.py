@@ -0,0 +1,163 @@
+"""
+Benchmark Suite
+
+Runs repeatable parse benchmarks over synthetic corpora (see corpus.py) that
+scale one axis at a time, and gates on regressions against a stored baseline.
+Each scenario is warmed up, then timed over several trials; the report has
+median and p95 time, throughput and peak traced memory. Everything runs
+offline; matplotlib is only needed for --plot.
+
+Run from the repository root:
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json --threshold 0.15
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from benchmarks.corpus import CorpusSpec, generate
+from interpreter.parser import CogentParser
+
+SCENARIOS = {
+    "modules_50": CorpusSpec(modules=50),
+    "modules_400": CorpusSpec(modules=400),
+    "steps_200": CorpusSpec(modules=5, steps=200),
+    "depth_8": CorpusSpec(modules=10, steps=4, depth=8),
+    "annotations_dense": CorpusSpec(modules=50, annotation_density=0.9),
+    "types_enums_40": CorpusSpec(modules=20, types=40, enums=40),
+}
+
+# Metrics where a larger value is a regression; throughput metrics regress when they shrink.
+LOWER_IS_BETTER = ("median_sec", "p95_sec", "peak_bytes")
+HIGHER_IS_BETTER = ("median_mb_per_sec", "median_modules_per_sec")
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_scenario(parser, spec, trials=7, warmup=2):
+    source = generate(spec)
+    parse = lambda: parser.parse_string(source, as_semantic_model=True)
+    for _ in range(warmup):
+        parse()
+    times = []
+    for _ in range(trials):
+        start = time.perf_counter()
+        parse()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    parse()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    median = statistics.median(times)
+    return {
+        "spec": spec.to_dict(),
+        "source_bytes": len(source.encode("utf-8")),
+        "trials": trials,
+        "median_sec": median,
+        "p95_sec": percentile(times, 0.95),
+        "median_mb_per_sec": len(source.encode("utf-8")) / median / 1e6,
+        "median_modules_per_sec": spec.modules / median,
+        "peak_bytes": peak,
+    }
+
+
+def run_suite(scenarios=None, trials=7, warmup=2):
+    import lark
+    parser = CogentParser()
+    names = scenarios or list(SCENARIOS)
+    return {
+        "meta": {"python": platform.python_version(), "lark": lark.__version__, "machine": platform.machine()},
+        "scenarios": {name: run_scenario(parser, SCENARIOS[name], trials, warmup) for name in names},
+    }
+
+
+def compare(results, baseline, threshold=0.1):
+    """
+    Return a list of regression messages: metrics that got worse than the
+    baseline by more than `threshold` (a fraction, 0.1 = 10%).
+    """
+    regressions = []
+    for name, current in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        for metric in LOWER_IS_BETTER:
+            if base.get(metric) and current[metric] > base[metric] * (1 + threshold):
+                regressions.append(f"{name}.{metric}: {current[metric]:.6g} vs baseline {base[metric]:.6g}")
+        for metric in HIGHER_IS_BETTER:
+            if base.get(metric) and current[metric] < base[metric] * (1 - threshold):
+                regressions.append(f"{name}.{metric}: {current[metric]:.6g} vs baseline {base[metric]:.6g}")
+    return regressions
+
+
+def plot(results, path):
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib is not installed; skipping plot", file=sys.stderr)
+        return False
+    names = list(results["scenarios"])
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 4))
+    ax1.bar(names, [results["scenarios"][n]["median_mb_per_sec"] for n in names])
+    ax1.set_ylabel("Median throughput (MB/s)")
+    ax2.bar(names, [results["scenarios"][n]["peak_bytes"] / 1024 for n in names], color="r")
+    ax2.set_ylabel("Peak traced memory (KB)")
+    for ax in (ax1, ax2):
+        ax.tick_params(axis="x", rotation=30)
+    fig.tight_layout()
+    fig.savefig(path)
+    return True
+
+
+def print_report(results):
+    print(f"{'scenario':20s} {'median ms':>10s} {'p95 ms':>10s} {'MB/s':>8s} {'mod/s':>10s} {'peak KB':>10s}")
+    for name, r in results["scenarios"].items():
+        print(f"{name:20s} {r['median_sec'] * 1000:10.2f} {r['p95_sec'] * 1000:10.2f} "
+              f"{r['median_mb_per_sec']:8.2f} {r['median_modules_per_sec']:10.1f} {r['peak_bytes'] / 1024:10.1f}")
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Cogent parser benchmark suite")
+    arg_parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="run only these scenarios")
+    arg_parser.add_argument("--trials", type=int, default=7)
+    arg_parser.add_argument("--warmup", type=int, default=2)
+    arg_parser.add_argument("--output", help="write results JSON here")
+    arg_parser.add_argument("--save-baseline", help="write results JSON as the new baseline")
+    arg_parser.add_argument("--baseline", help="compare against this baseline JSON")
+    arg_parser.add_argument("--threshold", type=float, default=0.1, help="allowed regression fraction (default 0.1)")
+    arg_parser.add_argument("--plot", help="save a PNG chart here (requires matplotlib)")
+    args = arg_parser.parse_args(argv)
+
+    results = run_suite(args.scenario, args.trials, args.warmup)
+    print_report(results)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(results, f, indent=2)
+    if args.plot:
+        plot(results, args.plot)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print("Regressions beyond threshold:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+        print("No regressions beyond threshold.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
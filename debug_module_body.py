@@ -8,7 +8,7 @@ module Example {
     process: ["Print 'hello'"]
 }
 '''
-parser = CogentParser(grammar_path="grammar/cogent.ebnf")
+parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
 tree = parser.parse_string(source)
 
 # Print the module_body children and their transformed values
@@ -0,0 +1,10 @@
+"""
+Cogent interpreter: parser, semantic model, binary model store, type
+checker and runtime.
+
+Importing the package is deliberately cheap: submodules are not imported
+here, and the Lark-based parser is only loaded by code that parses. The
+`cogent` command (interpreter.cli) relies on this for fast start-up.
+"""
+
+__version__ = "0.2.0.dev0"
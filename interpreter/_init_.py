@@ -1,2 +0,0 @@
-# Cogent Interpreter package initializer.
-# This file marks the interpreter directory as a package.
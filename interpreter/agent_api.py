@@ -3,8 +3,16 @@ Agent API
 
 Minimal, transparent API for agents to inspect and interact with Cogent modules.
 Supports clarity, traceability, and future feedback-driven evolution.
+
+AgentAPI wraps a single module; CollectionAgentAPI indexes many for queries.
 """
 
+import re
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_TYPE_COMPONENT = re.compile(r"\w+")
+
+
 class AgentAPI:
     def __init__(self, semantic_model):
         self.semantic_model = semantic_model
@@ -28,3 +36,195 @@ class AgentAPI:
         return getattr(self.semantic_model, "process", None)
 
     # Extendable: methods for feedback, self-evolution, module provenance
+
+
+class StepRef:
+    """
+    Location of a process step: the module name and the attribute/index
+    path to it, e.g. (1, "steps", 0) or (2, "catch_steps", 1).
+    """
+    __slots__ = ("module", "path", "step")
+
+    def __init__(self, module, path, step):
+        self.module = module
+        self.path = path
+        self.step = step
+
+    def __repr__(self):
+        return f"<StepRef {self.module}{list(self.path)}>"
+
+
+def _tokens(text):
+    return set(_TOKEN.findall(text.lower())) if text else set()
+
+
+def _annotation_value(arg):
+    # String arguments keep their quotes in the model; @cost("high") and @cost(high) index alike.
+    arg = str(arg)
+    if len(arg) >= 2 and arg[0] == arg[-1] == '"':
+        return arg[1:-1]
+    return arg
+
+
+def _annotation_values(value):
+    if value is True:
+        return ()
+    if isinstance(value, str):
+        return (_annotation_value(value),)
+    return tuple(_annotation_value(arg) for arg in value)
+
+
+def _walk_steps(steps, path=()):
+    for i, step in enumerate(steps):
+        step_path = path + (i,)
+        yield step_path, step
+        for field in ("steps", "try_steps", "catch_steps"):
+            children = getattr(step, field, None)
+            if children:
+                yield from _walk_steps(children, step_path + (field,))
+
+
+class CollectionAgentAPI:
+    """
+    AgentAPI over a collection of modules, keyed by module name. Inverted
+    indexes on input types, annotations, imports, enum members and step text
+    tokens answer queries by set lookups instead of scanning every module,
+    and are updated incrementally by `add` and `remove`.
+    """
+    INDEXES = ("input_type", "type_component", "module_annotation", "step_annotation",
+               "import", "enum_member", "step_token")
+
+    def __init__(self, modules=()):
+        self.modules = {}
+        self._indexes = {name: {} for name in self.INDEXES}
+        # Per module, the (index, key, ref) entries it added, so removal touches only those.
+        self._postings = {}
+        for module in modules:
+            self.add(module)
+
+    def __len__(self):
+        return len(self.modules)
+
+    def __contains__(self, name):
+        return name in self.modules
+
+    def add(self, module):
+        """
+        Index `module`, replacing any module already indexed under its name.
+        """
+        if module.name in self.modules:
+            self.remove(module.name)
+        self.modules[module.name] = module
+        postings = self._postings[module.name] = []
+
+        def post(index, key, ref):
+            refs = self._indexes[index].setdefault(key, set())
+            if ref not in refs:
+                refs.add(ref)
+                postings.append((index, key, ref))
+
+        name = module.name
+        for item in module.inputs:
+            post("input_type", item.type_name, name)
+            for component in _TYPE_COMPONENT.findall(item.type_name or ""):
+                post("type_component", component, name)
+        for key, value in module.annotations.items():
+            post("module_annotation", (key, None), name)
+            for arg in _annotation_values(value):
+                post("module_annotation", (key, arg), name)
+        for imported in module.imports:
+            post("import", imported, name)
+        for type_name, declared in module.types.items():
+            for member in getattr(declared, "items", ()):
+                post("enum_member", member, (name, type_name))
+        for path, step in _walk_steps(module.process):
+            ref = (name, path)
+            for key, value in step.annotations.items():
+                post("step_annotation", (key, None), ref)
+                for arg in _annotation_values(value):
+                    post("step_annotation", (key, arg), ref)
+            for text in (getattr(step, "text", None), getattr(step, "condition", None)):
+                for token in _tokens(text):
+                    post("step_token", token, ref)
+
+    def remove(self, name):
+        """
+        Drop module `name` and its index entries. Raises KeyError if it is not indexed.
+        """
+        del self.modules[name]
+        for index, key, ref in self._postings.pop(name):
+            refs = self._indexes[index][key]
+            refs.discard(ref)
+            if not refs:
+                del self._indexes[index][key]
+
+    def module(self, name):
+        return self.modules.get(name)
+
+    def get_goal(self, name):
+        return getattr(self.modules.get(name), "goal", None)
+
+    def get_inputs(self, name):
+        return getattr(self.modules.get(name), "inputs", None)
+
+    def get_process(self, name):
+        return getattr(self.modules.get(name), "process", None)
+
+    def _lookup(self, index, key):
+        return self._indexes[index].get(key, ())
+
+    def _step_refs(self, refs):
+        result = []
+        for module_name, path in sorted(refs):
+            node = self.modules[module_name].process
+            for part in path:
+                node = node[part] if isinstance(part, int) else getattr(node, part)
+            result.append(StepRef(module_name, path, node))
+        return result
+
+    def modules_with_input_type(self, type_name):
+        """
+        Names of modules with an input of exactly `type_name`, e.g. "List<Material>".
+        """
+        return sorted(self._lookup("input_type", type_name))
+
+    def modules_using_type(self, name):
+        """
+        Names of modules whose input types mention `name` anywhere, e.g. "Material".
+        """
+        return sorted(self._lookup("type_component", name))
+
+    def modules_annotated(self, key, value=None):
+        """
+        Names of modules carrying @key (with `value` among its arguments, if given).
+        """
+        return sorted(self._lookup("module_annotation", (key, value if value is None else _annotation_value(value))))
+
+    def steps_annotated(self, key, value=None):
+        """
+        StepRefs for steps carrying @key (with `value` among its arguments, if given).
+        """
+        return self._step_refs(self._lookup("step_annotation", (key, value if value is None else _annotation_value(value))))
+
+    def modules_importing(self, name):
+        return sorted(self._lookup("import", name))
+
+    def enums_with_member(self, member):
+        """
+        (module name, enum name) pairs for enums declaring `member`.
+        """
+        return sorted(self._lookup("enum_member", member))
+
+    def steps_containing(self, *words):
+        """
+        StepRefs for steps whose text (or while condition) contains every
+        word, case-insensitively.
+        """
+        tokens = set()
+        for word in words:
+            tokens |= _tokens(word)
+        if not tokens:
+            return []
+        postings = sorted((self._lookup("step_token", t) for t in tokens), key=len)
+        refs = set(postings[0]).intersection(*postings[1:])
+        return self._step_refs(refs)
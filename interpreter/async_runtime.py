@@ -0,0 +1,225 @@
+"""
+Async Cogent Runtime
+
+An asyncio execution mode for I/O-bound step handlers. Handlers and while
+predicates are registered as on Runtime and may be coroutine functions or
+plain callables (plain ones run inline on the event loop, so they should
+not block).
+
+Step semantics match Runtime. Scheduling differs:
+
+- A ForStep annotated @concurrency(n) runs up to n iterations at once; one
+  annotated @parallel uses `default_concurrency`. Each annotated step gets
+  one semaphore per run, shared by every execution of that step, and a new
+  iteration is only started once a slot is free, so wide loops apply
+  backpressure instead of creating every task up front.
+- Consecutive sibling steps annotated @independent run concurrently.
+- @timeout(seconds) on any step bounds it; expiry raises TimeoutError,
+  which a surrounding try/catch can handle like any other error.
+- @cache steps are memoized through `step_cache` exactly as on Runtime.
+
+Cancellation propagates: cancelling `run` (or its `timeout` expiring)
+cancels every in-flight handler, and when one concurrent iteration fails
+its siblings are cancelled before the error is raised. try/catch never
+catches cancellation.
+"""
+
+import asyncio
+import inspect
+
+from .runtime import (
+    Runtime, RunResult, StepResult, NoHandlerError, LoopLimitError, CogentRuntimeError, _RunState, _current_run,
+)
+from .semantic_model import ProcessStep, ForStep, WhileStep, TryStep
+
+
+def _annotation_number(annotations, key):
+    value = annotations.get(key)
+    if value is None or value is True:
+        return None
+    arg = value[0] if isinstance(value, list) else value
+    try:
+        return float(arg)
+    except ValueError:
+        raise CogentRuntimeError(f"@{key} expects a number, got {arg!r}") from None
+
+
+async def _call(fn, *args):
+    result = fn(*args)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+async def _wait_for(aw, timeout):
+    # Before Python 3.11 asyncio.wait_for raises asyncio.TimeoutError, which is not the builtin.
+    try:
+        return await asyncio.wait_for(aw, timeout)
+    except asyncio.TimeoutError as e:
+        if isinstance(e, TimeoutError):
+            raise
+        raise TimeoutError(f"timed out after {timeout} s") from e
+
+
+async def _gather_or_cancel(aws):
+    """
+    Await tasks and return their results in order. As soon as one fails (or
+    the caller is cancelled), cancel the rest and wait for them, then raise
+    the first failure in task order.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    if not tasks:
+        return []
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    for task in tasks:
+        if not task.cancelled() and task.exception() is not None:
+            raise task.exception()
+    return [task.result() for task in tasks]
+
+
+class AsyncRuntime(Runtime):
+    def __init__(self, handlers=None, default=None, default_concurrency=16, max_loop_iterations=10000, telemetry=None,
+                 step_cache=None):
+        super().__init__(handlers, default, max_workers=1, max_loop_iterations=max_loop_iterations, telemetry=telemetry,
+                         step_cache=step_cache)
+        self.default_concurrency = default_concurrency
+
+    async def run(self, module, inputs=None, timeout=None):
+        """
+        Execute `module.process` with `inputs` in scope, optionally bounded by `timeout` seconds overall.
+        """
+        scope = dict(inputs or {})
+        out = []
+        semaphores = {}
+        # Tasks copy the context when created, so concurrent runs each see their own module.
+        token = _current_run.set(_RunState(module))
+        try:
+            with self.telemetry.span("runtime.run", {"module": module.name, "mode": "async"}):
+                await _wait_for(self._run_steps(module.process, scope, (), (), out, semaphores), timeout)
+        finally:
+            _current_run.reset(token)
+        return RunResult(module, out, scope)
+
+    def run_sync(self, module, inputs=None, timeout=None):
+        return asyncio.run(self.run(module, inputs, timeout))
+
+    async def _run_steps(self, steps, scope, path, iteration, out, semaphores):
+        i = 0
+        while i < len(steps):
+            step = steps[i]
+            if "independent" in step.annotations:
+                j = i
+                while j < len(steps) and "independent" in steps[j].annotations:
+                    j += 1
+                if j - i > 1:
+                    outputs = [[] for _ in range(i, j)]
+                    await _gather_or_cancel(
+                        self._run_step(steps[k], scope, path + (k,), iteration, outputs[k - i], semaphores)
+                        for k in range(i, j))
+                    for output in outputs:
+                        out.extend(output)
+                    i = j
+                    continue
+            await self._run_step(step, scope, path + (i,), iteration, out, semaphores)
+            i += 1
+
+    async def _run_step(self, step, scope, path, iteration, out, semaphores):
+        timeout = _annotation_number(step.annotations, "timeout")
+        if timeout is None:
+            await self._execute(step, scope, path, iteration, out, semaphores)
+        else:
+            await _wait_for(self._execute(step, scope, path, iteration, out, semaphores), timeout)
+
+    async def _execute(self, step, scope, path, iteration, out, semaphores):
+        if isinstance(step, ProcessStep):
+            self.telemetry.count("runtime.steps")
+            handler = self.handler_for(step.text)
+            if self.step_cache is not None and "cache" in step.annotations:
+                key, ttl, hit, value = self._cache_lookup(step.text, step.annotations["cache"], scope, path)
+                if not hit:
+                    value = await _call(handler, step.text, scope)
+                    if key is not None:
+                        self.step_cache.put(key, value, ttl)
+            else:
+                value = await _call(handler, step.text, scope)
+            out.append(StepResult(path, iteration, step.text, value))
+        elif isinstance(step, ForStep):
+            await self._run_for(step, scope, path, iteration, out, semaphores)
+        elif isinstance(step, WhileStep):
+            predicate = self._conditions.get(step.condition)
+            if predicate is None:
+                raise NoHandlerError(f"No condition registered for while {step.condition!r}")
+            count = 0
+            while await _call(predicate, scope):
+                if count == self.max_loop_iterations:
+                    raise LoopLimitError(f"while {step.condition!r} exceeded {self.max_loop_iterations} iterations")
+                await self._run_steps(step.steps, scope, path + ("steps",), iteration + (count,), out, semaphores)
+                count += 1
+        elif isinstance(step, TryStep):
+            try:
+                await self._run_steps(step.try_steps, scope, path + ("try_steps",), iteration, out, semaphores)
+            except Exception as e:
+                if step.catch_steps is None:
+                    return
+                catch_scope = dict(scope)
+                if step.catch_var:
+                    catch_scope[step.catch_var] = e
+                await self._run_steps(step.catch_steps, catch_scope, path + ("catch_steps",), iteration, out,
+                                      semaphores)
+        else:
+            raise CogentRuntimeError(f"Cannot execute {step!r}")
+
+    async def _run_for(self, step, scope, path, iteration, out, semaphores):
+        if step.iterable not in scope:
+            raise CogentRuntimeError(f"for {step.var} in {step.iterable}: {step.iterable!r} is not defined")
+        items = list(scope[step.iterable])
+        body_path = path + ("steps",)
+        limit = _annotation_number(step.annotations, "concurrency")
+        if limit is None and "parallel" in step.annotations:
+            limit = self.default_concurrency
+        if limit is None or len(items) < 2:
+            for k, item in enumerate(items):
+                await self._run_steps(step.steps, {**scope, step.var: item}, body_path, iteration + (k,), out,
+                                      semaphores)
+            return
+        semaphore = semaphores.get(id(step))
+        if semaphore is None:
+            semaphore = semaphores[id(step)] = asyncio.Semaphore(max(1, int(limit)))
+
+        failed = []
+
+        async def iteration_body(k, item, output):
+            try:
+                await self._run_steps(step.steps, {**scope, step.var: item}, body_path, iteration + (k,), output,
+                                      semaphores)
+            except BaseException:
+                failed.append(k)
+                raise
+            finally:
+                semaphore.release()
+
+        outputs = [[] for _ in items]
+        tasks = []
+        try:
+            for k, item in enumerate(items):
+                await semaphore.acquire()
+                if failed:
+                    # Stop launching; the failure is raised below.
+                    semaphore.release()
+                    break
+                tasks.append(asyncio.ensure_future(iteration_body(k, item, outputs[k])))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        await _gather_or_cancel(tasks)
+        for output in outputs:
+            out.extend(output)
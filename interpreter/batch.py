@@ -0,0 +1,134 @@
+"""
+Batch Parsing
+
+Parses many Cogent files across a process pool. Each worker process warms
+its grammar once and then parses its share of files; results stream back
+as they complete, and a file that fails to parse is reported rather than
+aborting the batch.
+"""
+
+import os
+from pathlib import Path
+
+from .parse_cache import ParseCache
+
+
+class ParseResult:
+    def __init__(self, path, modules=None, error=None):
+        self.path = path
+        self.modules = modules if modules is not None else []
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        if self.error:
+            return f"ParseResult(path={self.path!r}, error={self.error!r})"
+        return f"ParseResult(path={self.path!r}, modules={[m.name for m in self.modules]})"
+
+
+def iter_cg_files(paths):
+    """
+    Expand files and directories into .cg file paths (directories recursively, sorted).
+    """
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            yield from (str(p) for p in sorted(path.rglob("*.cg")))
+        else:
+            yield str(path)
+
+
+def parse_path(parser, path):
+    """
+    Parse one file into a ParseResult, capturing any error.
+    """
+    try:
+        return ParseResult(path, parser.parse_file(path, as_semantic_model=True).children)
+    except Exception as e:
+        return ParseResult(path, error=f"{type(e).__name__}: {e}")
+
+
+_worker_parser = None
+
+
+def _make_parser(grammar_path, backend, cache_dir):
+    from .parser import CogentParser
+    cache = ParseCache(cache_dir) if cache_dir is not None else None
+    return CogentParser(grammar_path, parser=backend, cache=cache)
+
+
+def _init_worker(grammar_path, backend, cache_dir):
+    global _worker_parser
+    _worker_parser = _make_parser(grammar_path, backend, cache_dir)
+
+
+def _parse_chunk(indexed_paths):
+    return [(index, parse_path(_worker_parser, path)) for index, path in indexed_paths]
+
+
+def worker_pool(workers, grammar_path=None, backend="lalr", cache_dir=None):
+    """
+    A process pool whose workers each hold a warmed parser, for passing to
+    parse_many across several batches. The caller shuts it down.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from .parser import DEFAULT_GRAMMAR_PATH
+    if grammar_path is None:
+        grammar_path = DEFAULT_GRAMMAR_PATH
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(str(grammar_path), backend, cache_dir))
+
+
+def parse_many(paths, workers=None, ordered=False, grammar_path=None, backend="lalr",
+               chunksize=None, cache_dir=None, pool=None):
+    """
+    Parse many .cg files, yielding a ParseResult per file.
+
+    `workers` is the process count (default: CPU count); 1 parses in this process.
+    Results are yielded as they complete unless `ordered` is true, in which case
+    they come back in input order. With `cache_dir`, workers share an on-disk ParseCache.
+    `grammar_path` defaults to the bundled grammar. `pool`, from worker_pool,
+    reuses workers across calls; it is left running.
+    """
+    # Imported here so that importing this module (for iter_cg_files, say) stays cheap.
+    from concurrent.futures import as_completed
+    from .parser import DEFAULT_GRAMMAR_PATH
+    if grammar_path is None:
+        grammar_path = DEFAULT_GRAMMAR_PATH
+    paths = list(paths)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if pool is None and (workers <= 1 or len(paths) <= 1):
+        parser = _make_parser(grammar_path, backend, cache_dir)
+        for path in paths:
+            yield parse_path(parser, path)
+        return
+    if chunksize is None:
+        # A few chunks per worker keeps IPC overhead low while balancing load.
+        chunksize = max(1, min(64, len(paths) // (max(workers, 1) * 4)))
+    indexed = list(enumerate(paths))
+    chunks = [indexed[i:i + chunksize] for i in range(0, len(indexed), chunksize)]
+    owned = pool is None
+    if owned:
+        pool = worker_pool(workers, grammar_path, backend, cache_dir)
+    try:
+        futures = [pool.submit(_parse_chunk, chunk) for chunk in chunks]
+        if not ordered:
+            for future in as_completed(futures):
+                for _, result in future.result():
+                    yield result
+            return
+        pending = {}
+        next_index = 0
+        for future in as_completed(futures):
+            for index, result in future.result():
+                pending[index] = result
+            while next_index in pending:
+                yield pending.pop(next_index)
+                next_index += 1
+    finally:
+        if owned:
+            pool.shutdown()
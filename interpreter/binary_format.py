@@ -0,0 +1,560 @@
+"""
+Binary Model Format
+
+Versioned, compact binary encoding of CogentModule trees: imports, types,
+enums, inputs, nested For/While/Try steps and annotations.
+
+Layout (little-endian):
+
+    header       magic "CGMB", u16 format version, u16 flags, u32 string
+                 table offset, u32 annotation table offset, u32 index offset
+    modules      one record per module: name, goal, context and feedback,
+                 imports, annotations, then length-prefixed types, inputs
+                 and process sections. Integers are LEB128 varints, every
+                 string is a reference into the string table and every
+                 annotation set a reference into the annotation table
+                 (0 = None / no annotations)
+    strings      u32 count, (count + 1) u32 offsets, UTF-8 blob
+    annotations  u32 count, (count + 1) u32 offsets, encoded sets
+    index        u32 count, then per module: u32 record offset, u32 name ref
+
+Every distinct string (identifiers, step text, goals) and every distinct
+annotation set is stored once. Length-prefixed sections let a reader skip
+a module's types, inputs and process and decode them only when first
+touched. Readers work on a memoryview of any buffer (bytes, bytearray,
+mmap) without copying it, and decode each table entry at most once, so
+opening a buffer costs the same whatever its size. Offsets are u32, which
+limits one buffer to 4 GiB.
+"""
+
+import io
+import struct
+
+from .semantic_model import (
+    CogentModule, InputItem, ProcessStep, ForStep, WhileStep, TryStep, TypeExpr, EnumType, EMPTY_ANNOTATIONS,
+)
+
+MAGIC = b"CGMB"
+FORMAT_VERSION = 2
+
+_HEADER = struct.Struct("<4sHHIII")
+_U32 = struct.Struct("<I")
+_U32_PAIR = struct.Struct("<II")
+
+_STEP_TEXT, _STEP_FOR, _STEP_WHILE, _STEP_TRY = range(4)
+_TYPE_EXPR, _TYPE_ENUM = range(2)
+_ANN_TRUE, _ANN_STR, _ANN_LIST = range(3)
+_MISSING = object()
+
+
+class _Encoder:
+    def __init__(self, strings=None, annotation_sets=None):
+        self.strings = {} if strings is None else strings
+        self.annotation_sets = {} if annotation_sets is None else annotation_sets
+        self.out = bytearray()
+
+    def varint(self, value):
+        out = self.out
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+
+    def ref(self, value):
+        if value is None:
+            self.out.append(0)
+            return
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+        self.varint(index + 1)
+
+    def annotations(self, annotations):
+        if not annotations:
+            self.out.append(0)
+            return
+        key = []
+        for name, value in annotations.items():
+            if value is True:
+                key.append((name, _ANN_TRUE, None))
+            elif isinstance(value, str):
+                key.append((name, _ANN_STR, value))
+            elif isinstance(value, list):
+                key.append((name, _ANN_LIST, tuple(value)))
+            else:
+                raise TypeError(f"Cannot encode annotation value {value!r} for @{name}")
+        key = tuple(key)
+        index = self.annotation_sets.get(key)
+        if index is None:
+            index = self.annotation_sets[key] = len(self.annotation_sets)
+        self.varint(index + 1)
+
+    def annotation_set(self, key):
+        self.varint(len(key))
+        for name, tag, value in key:
+            self.ref(name)
+            self.out.append(tag)
+            if tag == _ANN_STR:
+                self.ref(value)
+            elif tag == _ANN_LIST:
+                self.varint(len(value))
+                for item in value:
+                    self.ref(item)
+
+    def type_node(self, node):
+        if isinstance(node, EnumType):
+            self.out.append(_TYPE_ENUM)
+            self.ref(node.name)
+            self.varint(len(node.items))
+            for item in node.items:
+                self.ref(item)
+        else:
+            self.out.append(_TYPE_EXPR)
+            self.ref(node.name)
+            if node.param is None:
+                self.out.append(0)
+            else:
+                self.out.append(1)
+                self.type_node(node.param)
+
+    def steps(self, steps):
+        self.varint(len(steps))
+        for step in steps:
+            if isinstance(step, ProcessStep):
+                self.out.append(_STEP_TEXT)
+                self.ref(step.text)
+            elif isinstance(step, ForStep):
+                self.out.append(_STEP_FOR)
+                self.ref(step.var)
+                self.ref(step.iterable)
+                self.steps(step.steps)
+            elif isinstance(step, WhileStep):
+                self.out.append(_STEP_WHILE)
+                self.ref(step.condition)
+                self.steps(step.steps)
+            elif isinstance(step, TryStep):
+                self.out.append(_STEP_TRY)
+                self.steps(step.try_steps)
+                self.ref(step.catch_var)
+                if step.catch_steps is None:
+                    self.out.append(0)
+                else:
+                    self.out.append(1)
+                    self.steps(step.catch_steps)
+            else:
+                raise TypeError(f"Cannot encode process step {step!r}")
+            self.annotations(step.annotations)
+
+    def section(self, encode, value):
+        body = _Encoder(self.strings, self.annotation_sets)
+        encode(body, value)
+        self.varint(len(body.out))
+        self.out += body.out
+
+    def types(self, types):
+        self.varint(len(types))
+        for name, node in types.items():
+            self.ref(name)
+            self.type_node(node)
+
+    def inputs(self, inputs):
+        self.varint(len(inputs))
+        for item in inputs:
+            self.ref(item.name)
+            self.ref(item.type_name)
+            self.annotations(item.annotations)
+
+    def module(self, module):
+        for value in (module.name, module.goal, module.context, module.feedback):
+            self.ref(value)
+        self.varint(len(module.imports))
+        for name in module.imports:
+            self.ref(name)
+        self.annotations(module.annotations)
+        self.section(_Encoder.types, module.types)
+        self.section(_Encoder.inputs, module.inputs)
+        self.section(_Encoder.steps, module.process)
+
+    def table(self, blobs):
+        offsets = [0]
+        for blob in blobs:
+            offsets.append(offsets[-1] + len(blob))
+        self.out += _U32.pack(len(blobs))
+        self.out += struct.pack(f"<{len(offsets)}I", *offsets)
+        self.out += b"".join(blobs)
+
+
+class ModelWriter:
+    """
+    Streams modules into a binary model buffer on a seekable binary file,
+    holding only the string and annotation tables in memory. Call `close()`
+    to write the tables, index and header.
+    """
+    def __init__(self, file):
+        self.file = file
+        self.base = file.tell()
+        self._tables = _Encoder()
+        self._index = []
+        self._position = _HEADER.size
+        file.write(bytes(_HEADER.size))
+
+    def add(self, module):
+        record = _Encoder(self._tables.strings, self._tables.annotation_sets)
+        record.module(module)
+        # Every record starts with the module name, so the name is already in the table.
+        name_ref = 0 if module.name is None else self._tables.strings[module.name] + 1
+        self._index.append((self._position, name_ref))
+        self.file.write(record.out)
+        self._position += len(record.out)
+
+    def __len__(self):
+        return len(self._index)
+
+    def close(self):
+        """
+        Finish the buffer and return its total length in bytes.
+        """
+        tables = self._tables
+        # Annotation sets reference strings, so encode them before the string table is frozen.
+        annotation_blobs = []
+        for key in tables.annotation_sets:
+            entry = _Encoder(tables.strings)
+            entry.annotation_set(key)
+            annotation_blobs.append(bytes(entry.out))
+        tail = _Encoder()
+        tail.table([s.encode("utf-8") for s in tables.strings])
+        annotations_offset = self._position + len(tail.out)
+        tail.table(annotation_blobs)
+        index_offset = self._position + len(tail.out)
+        tail.out += _U32.pack(len(self._index))
+        for offset, name_ref in self._index:
+            tail.out += _U32_PAIR.pack(offset, name_ref)
+        self.file.write(tail.out)
+        end = self.file.tell()
+        self.file.seek(self.base)
+        self.file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, self._position, annotations_offset, index_offset))
+        self.file.seek(end)
+        return end - self.base
+
+
+def encode_modules(modules):
+    """
+    Encode a list of CogentModule objects into bytes.
+    """
+    buffer = io.BytesIO()
+    writer = ModelWriter(buffer)
+    for module in modules:
+        writer.add(module)
+    writer.close()
+    return buffer.getvalue()
+
+
+class _Table:
+    __slots__ = ("view", "offsets_at", "blob_at", "entries")
+
+    def __init__(self, view, offset):
+        (count,) = _U32.unpack_from(view, offset)
+        self.view = view
+        self.offsets_at = offset + 4
+        self.blob_at = self.offsets_at + 4 * (count + 1)
+        # Decoded entries by reference; filled on demand so opening stays O(1).
+        self.entries = {0: None}
+
+    def span(self, ref):
+        start, end = _U32_PAIR.unpack_from(self.view, self.offsets_at + 4 * (ref - 1))
+        return self.blob_at + start, self.blob_at + end
+
+
+class ModuleReader:
+    """
+    Random access to the modules in an encoded buffer without copying it.
+    """
+    def __init__(self, data):
+        self.view = memoryview(data).cast("B")
+        if len(self.view) < _HEADER.size:
+            raise ValueError("Not a Cogent binary model buffer")
+        magic, version, _, strings_offset, annotations_offset, self._index_offset = _HEADER.unpack_from(self.view, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a Cogent binary model buffer")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported Cogent binary model version {version} (expected {FORMAT_VERSION})")
+        self._strings = _Table(self.view, strings_offset)
+        self._annotation_sets = _Table(self.view, annotations_offset)
+        (self.count,) = _U32.unpack_from(self.view, self._index_offset)
+
+    def __len__(self):
+        return self.count
+
+    def string(self, ref):
+        try:
+            return self._strings.entries[ref]
+        except KeyError:
+            start, end = self._strings.span(ref)
+            value = self._strings.entries[ref] = str(self.view[start:end], "utf-8")
+            return value
+
+    def annotation_set(self, ref):
+        """
+        Decoded annotation set `ref` as a tuple of (name, value) pairs; callers copy it into a dict.
+        """
+        try:
+            return self._annotation_sets.entries[ref]
+        except KeyError:
+            start, _ = self._annotation_sets.span(ref)
+            entry = self._annotation_sets.entries[ref] = _Decoder(self, start).annotation_set()
+            return entry
+
+    def _index_entry(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        return _U32_PAIR.unpack_from(self.view, self._index_offset + 4 + 8 * i)
+
+    def name(self, i):
+        """
+        Name of module `i`, read from the index without decoding the module.
+        """
+        return self.string(self._index_entry(i)[1])
+
+    def names(self):
+        return [self.name(i) for i in range(self.count)]
+
+    def record_offset(self, i):
+        return self._index_entry(i)[0]
+
+    def module(self, i, lazy=True):
+        """
+        Decode module `i`. With `lazy`, it is a LazyModule whose process list is decoded on first access.
+        """
+        if lazy:
+            return LazyModule(self, i)
+        return _Decoder(self, self.record_offset(i)).module()
+
+    def module_head(self, i):
+        """
+        Decode only the fixed fields of module `i`: (name, goal, context,
+        feedback, imports, annotations, types_at, inputs_at, process_at), where
+        the *_at offsets locate sections for `types_at`, `inputs_at` and `process_at`.
+        """
+        return _Decoder(self, self.record_offset(i)).head()
+
+    def types_at(self, offset):
+        return _Decoder(self, offset).types()
+
+    def inputs_at(self, offset):
+        return _Decoder(self, offset).inputs()
+
+    def process_at(self, offset):
+        return _Decoder(self, offset).steps()
+
+    def modules(self, lazy=False):
+        return [self.module(i, lazy) for i in range(self.count)]
+
+
+def _lazy_section(field, decode):
+    slot = getattr(CogentModule, field)
+
+    def get(self):
+        try:
+            return slot.__get__(self, CogentModule)
+        except AttributeError:
+            value = decode(self._reader, self._sections[field])
+            slot.__set__(self, value)
+            return value
+
+    def set(self, value):
+        slot.__set__(self, value)
+
+    return property(get, set, doc="Decoded from the buffer on first access.")
+
+
+class LazyModule(CogentModule):
+    """
+    A CogentModule decoded from a ModuleReader whose process list is decoded
+    on first access and then kept as a plain list. Pickling or copying it
+    yields a plain CogentModule.
+    """
+    __slots__ = ("_reader", "_sections")
+
+    # Sections decoded up front; the rest are _lazy_section properties.
+    _eager = ("types", "inputs")
+
+    def __init__(self, reader, i):
+        (self.name, self.goal, self.context, self.feedback, self.imports, annotations,
+         types_at, inputs_at, process_at) = reader.module_head(i)
+        self.annotations = annotations or EMPTY_ANNOTATIONS
+        self._reader = reader
+        self._sections = {"types": types_at, "inputs": inputs_at, "process": process_at}
+        if "types" in self._eager:
+            self.types = reader.types_at(types_at)
+        if "inputs" in self._eager:
+            self.inputs = reader.inputs_at(inputs_at)
+
+    process = _lazy_section("process", ModuleReader.process_at)
+
+    def is_loaded(self, field):
+        try:
+            getattr(CogentModule, field).__get__(self, CogentModule)
+        except AttributeError:
+            return False
+        return True
+
+    def materialize(self):
+        """
+        Return a plain CogentModule with every field decoded.
+        """
+        return CogentModule(self.name, self.goal, self.inputs, self.process, self.context, self.feedback,
+                            imports=self.imports, types=self.types, annotations=self.annotations)
+
+    def __reduce__(self):
+        return (_materialized, (self.materialize(),))
+
+
+def _materialized(module):
+    return module
+
+
+class _Decoder:
+    __slots__ = ("reader", "view", "pos", "strings")
+
+    def __init__(self, reader, pos):
+        self.reader = reader
+        self.view = reader.view
+        self.pos = pos
+        self.strings = reader._strings.entries
+
+    def varint(self):
+        view = self.view
+        byte = view[self.pos]
+        self.pos += 1
+        if byte < 0x80:
+            return byte
+        value = byte & 0x7F
+        shift = 7
+        while True:
+            byte = view[self.pos]
+            self.pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def ref(self):
+        byte = self.view[self.pos]
+        if byte < 0x80:
+            self.pos += 1
+        else:
+            byte = self.varint()
+        value = self.strings.get(byte, _MISSING)
+        if value is _MISSING:
+            value = self.reader.string(byte)
+        return value
+
+    def byte(self):
+        value = self.view[self.pos]
+        self.pos += 1
+        return value
+
+    def annotation_set(self):
+        entries = []
+        for _ in range(self.varint()):
+            name = self.ref()
+            tag = self.byte()
+            if tag == _ANN_TRUE:
+                entries.append((name, True))
+            elif tag == _ANN_STR:
+                entries.append((name, self.ref()))
+            else:
+                entries.append((name, [self.ref() for _ in range(self.varint())]))
+        return tuple(entries)
+
+    def annotations(self):
+        ref = self.varint()
+        if not ref:
+            return None
+        # Fresh dict (and argument lists) per node, so decoded models can be mutated independently.
+        return {name: value[:] if value.__class__ is list else value
+                for name, value in self.reader.annotation_set(ref)}
+
+    def type_node(self):
+        tag = self.byte()
+        name = self.ref()
+        if tag == _TYPE_ENUM:
+            return EnumType(name, [self.ref() for _ in range(self.varint())])
+        param = self.type_node() if self.byte() else None
+        return TypeExpr(name, param)
+
+    def steps(self):
+        steps = []
+        for _ in range(self.varint()):
+            tag = self.byte()
+            if tag == _STEP_TEXT:
+                step = ProcessStep(self.ref())
+            elif tag == _STEP_FOR:
+                var = self.ref()
+                iterable = self.ref()
+                step = ForStep(var, iterable, self.steps())
+            elif tag == _STEP_WHILE:
+                condition = self.ref()
+                step = WhileStep(condition, self.steps())
+            else:
+                try_steps = self.steps()
+                catch_var = self.ref()
+                catch_steps = self.steps() if self.byte() else None
+                step = TryStep(try_steps, catch_var, catch_steps)
+            if self.view[self.pos]:
+                step.annotations = self.annotations()
+            else:
+                self.pos += 1
+            steps.append(step)
+        return steps
+
+    def types(self):
+        types = {}
+        for _ in range(self.varint()):
+            type_name = self.ref()
+            types[type_name] = self.type_node()
+        return types
+
+    def inputs(self):
+        inputs = []
+        for _ in range(self.varint()):
+            input_name = self.ref()
+            type_name = self.ref()
+            inputs.append(InputItem(input_name, type_name, annotations=self.annotations()))
+        return inputs
+
+    def skip_section(self):
+        length = self.varint()
+        start = self.pos
+        self.pos += length
+        return start
+
+    def head(self):
+        name, goal, context, feedback = self.ref(), self.ref(), self.ref(), self.ref()
+        imports = [self.ref() for _ in range(self.varint())]
+        annotations = self.annotations()
+        types_at = self.skip_section()
+        inputs_at = self.skip_section()
+        process_at = self.skip_section()
+        return name, goal, context, feedback, imports, annotations, types_at, inputs_at, process_at
+
+    def module(self):
+        name, goal, context, feedback = self.ref(), self.ref(), self.ref(), self.ref()
+        imports = [self.ref() for _ in range(self.varint())]
+        annotations = self.annotations()
+        self.varint()
+        types = self.types()
+        self.varint()
+        inputs = self.inputs()
+        self.varint()
+        process = self.steps()
+        return CogentModule(name, goal, inputs, process, context, feedback,
+                            imports=imports, types=types, annotations=annotations)
+
+
+def decode_modules(data, lazy=False):
+    """
+    Decode every module in `data` (bytes, bytearray, memoryview or mmap).
+    With `lazy`, process lists are decoded on first access.
+    """
+    return ModuleReader(data).modules(lazy)
@@ -0,0 +1,120 @@
+"""
+Cogent Command Line
+
+    python -m interpreter.cli parse examples/ more/file.cg --workers 8 --ordered
+    python -m interpreter.cli daemon --cache-dir .cogent-cache &
+    python -m interpreter.cli parse --daemon examples/
+    python -m interpreter.cli check examples/
+    python -m interpreter.cli --version
+
+Installed, the same commands are available as `cogent` (see pyproject.toml).
+Heavy modules are imported by the command that needs them, so `--version`,
+`--help` and the `--daemon` client paths never load Lark.
+"""
+
+import argparse
+import sys
+
+from . import __version__
+
+
+def _parse_via_daemon(paths, socket_path):
+    # Import only the thin client: no grammar is loaded in this process.
+    from .batch import ParseResult, iter_cg_files
+    from .daemon import DaemonClient, DaemonError
+    with DaemonClient(socket_path) as client:
+        for path in iter_cg_files(paths):
+            try:
+                yield ParseResult(path, client.parse(path=path))
+            except DaemonError as e:
+                yield ParseResult(path, error=str(e))
+
+
+def _parse_results(args, ordered):
+    if args.daemon:
+        return _parse_via_daemon(args.paths, args.socket)
+    from .batch import iter_cg_files, parse_many
+    return parse_many(iter_cg_files(args.paths), workers=args.workers, ordered=ordered, cache_dir=args.cache_dir)
+
+
+def _cmd_parse(args):
+    failures = 0
+    total = 0
+    for result in _parse_results(args, args.ordered):
+        total += 1
+        if result.ok:
+            if not args.quiet:
+                print(f"{result.path}: {', '.join(m.name for m in result.modules)}")
+        else:
+            failures += 1
+            print(f"{result.path}: ERROR {result.error}")
+    print(f"parsed {total - failures}/{total} files", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def _cmd_check(args):
+    from .type_checker import check_modules
+    modules = []
+    failures = 0
+    for result in _parse_results(args, ordered=True):
+        if result.ok:
+            modules.extend(result.modules)
+        else:
+            failures += 1
+            print(f"{result.path}: ERROR {result.error}")
+    diagnostics = check_modules(modules).diagnostics
+    for diagnostic in diagnostics:
+        print(diagnostic)
+    print(f"checked {len(modules)} modules: {len(diagnostics)} problems, {failures} files failed to parse",
+          file=sys.stderr)
+    return 1 if failures or diagnostics else 0
+
+
+def _add_source_arguments(command):
+    command.add_argument("paths", nargs="+", help=".cg files or directories to search recursively")
+    command.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    command.add_argument("--cache-dir", default=None, help="reuse parsed models from this parse cache directory")
+    command.add_argument("--daemon", action="store_true", help="send files to a running `daemon` instead of parsing here")
+    command.add_argument("--socket", default=None, help="daemon socket path (default: $COGENT_SOCKET or per-user temp)")
+
+
+def _cmd_daemon(args):
+    from .daemon import ParseDaemon
+    daemon = ParseDaemon(args.socket, cache_dir=args.cache_dir).bind()
+    print(f"listening on {daemon.socket_path}", file=sys.stderr)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def build_arg_parser():
+    arg_parser = argparse.ArgumentParser(prog="cogent", description="Cogent language tools")
+    arg_parser.add_argument("--version", action="version", version=f"cogent {__version__}")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+
+    parse = commands.add_parser("parse", help="parse .cg files and directories in parallel")
+    _add_source_arguments(parse)
+    parse.add_argument("--ordered", action="store_true", help="report files in input order")
+    parse.add_argument("-q", "--quiet", action="store_true", help="only report errors")
+    parse.set_defaults(func=_cmd_parse)
+
+    check = commands.add_parser("check", help="parse and type-check .cg files together")
+    _add_source_arguments(check)
+    check.set_defaults(func=_cmd_check)
+
+    daemon = commands.add_parser("daemon", help="serve parse, check and query requests over a Unix socket")
+    daemon.add_argument("--socket", default=None, help="socket path (default: $COGENT_SOCKET or per-user temp)")
+    daemon.add_argument("--cache-dir", default=None, help="back the daemon's parse cache with this directory")
+    daemon.set_defaults(func=_cmd_daemon)
+    return arg_parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,358 @@
+"""
+Parse Daemon
+
+A resident process that keeps a warm CogentParser (and a ParseCache) and
+serves parse, check and query requests over a Unix domain socket, so
+editors, agents and hooks pay for Python start-up and grammar loading once
+instead of on every file.
+
+Every message, in both directions, is one frame:
+
+    u32 header length | u32 body length | JSON header | body bytes
+
+(lengths big-endian). A request header names the operation:
+
+    {"op": "ping"}
+    {"op": "parse"}                 body: source text (UTF-8)
+    {"op": "parse", "path": "..."}  no body; the daemon reads the file
+    {"op": "check"}                 body or path as for parse
+    {"op": "query", "method": "modules_annotated", "args": ["owner"]}   args: a JSON list
+    {"op": "stats"}
+    {"op": "shutdown"}
+
+Responses carry {"ok": true, ...} or {"ok": false, "error": "..."}. A parse
+response body is the parsed modules in the binary model format (see
+binary_format.py); check returns type-checker diagnostics in the header.
+Queries run against a CollectionAgentAPI holding the latest version of
+every module the daemon has parsed. A connection may send any number of
+requests; each client connection is served on its own thread.
+
+DaemonClient is the thin client. It imports only the standard library and
+the binary model decoder, not the parser, so a round-trip costs
+milliseconds.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import struct
+import tempfile
+import threading
+import time
+
+from .binary_format import decode_modules, encode_modules
+
+_LENGTHS = struct.Struct(">II")
+
+# Frames above this size are refused rather than buffered.
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+QUERY_METHODS = (
+    "modules_with_input_type", "modules_using_type", "modules_annotated", "steps_annotated",
+    "modules_importing", "enums_with_member", "steps_containing", "get_goal", "get_inputs",
+)
+
+
+class DaemonError(RuntimeError):
+    pass
+
+
+def default_socket_path():
+    """
+    $COGENT_SOCKET, else cogent-<uid>.sock in $XDG_RUNTIME_DIR or the temp directory.
+    """
+    path = os.environ.get("COGENT_SOCKET")
+    if path:
+        return path
+    directory = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(directory, f"cogent-{os.getuid()}.sock")
+
+
+def _recv_exactly(sock, n):
+    buf = bytearray(n)
+    view = memoryview(buf)
+    got = 0
+    while got < n:
+        k = sock.recv_into(view[got:])
+        if not k:
+            if got == 0:
+                return None
+            raise DaemonError("connection closed mid-frame")
+        got += k
+    return bytes(buf)
+
+
+def read_frame(sock):
+    """
+    Read one frame; returns (header dict, body bytes), or None at a clean end of stream.
+    """
+    lengths = _recv_exactly(sock, _LENGTHS.size)
+    if lengths is None:
+        return None
+    header_len, body_len = _LENGTHS.unpack(lengths)
+    if header_len + body_len > MAX_FRAME_BYTES:
+        raise DaemonError(f"frame of {header_len + body_len} bytes exceeds {MAX_FRAME_BYTES}")
+    header = _recv_exactly(sock, header_len) or b""
+    body = _recv_exactly(sock, body_len) if body_len else b""
+    if len(header) != header_len or body is None:
+        raise DaemonError("connection closed mid-frame")
+    header = json.loads(header)
+    if not isinstance(header, dict):
+        raise DaemonError(f"frame header must be a JSON object, not {type(header).__name__}")
+    return header, body
+
+
+def write_frame(sock, header, body=b""):
+    header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    sock.sendall(_LENGTHS.pack(len(header), len(body)) + header + body)
+
+
+def _jsonable(value):
+    # Query results: module names stay strings, StepRefs and InputItems become dicts.
+    from .agent_api import StepRef
+    if isinstance(value, StepRef):
+        return {"module": value.module, "path": list(value.path), "text": getattr(value.step, "text", None)}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if hasattr(value, "type_name"):
+        return {"name": value.name, "type": value.type_name}
+    return value
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        daemon = self.server.daemon
+        while True:
+            try:
+                frame = read_frame(self.request)
+            except (DaemonError, ValueError, OSError) as e:
+                try:
+                    write_frame(self.request, {"ok": False, "error": str(e)})
+                except OSError:
+                    pass
+                return
+            if frame is None:
+                return
+            header, body = daemon.handle(*frame)
+            try:
+                write_frame(self.request, header, body)
+            except OSError:
+                return
+            if header.get("shutting_down"):
+                return
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    # Unix sockets refuse connections outright (EAGAIN) once the backlog is full.
+    request_queue_size = 128
+
+
+class ParseDaemon:
+    def __init__(self, socket_path=None, parser=None, cache_dir=None):
+        from .agent_api import CollectionAgentAPI
+        from .parse_cache import ParseCache
+        from .parser import CogentParser
+        self.socket_path = socket_path or default_socket_path()
+        self.parser = parser or CogentParser(cache=ParseCache(cache_dir))
+        self.requests = 0
+        self._requests_lock = threading.Lock()
+        self.started = time.time()
+        self._api = CollectionAgentAPI()
+        self._api_lock = threading.Lock()
+        self._server = None
+
+    def handle(self, header, body):
+        """
+        Answer one request; returns (response header, response body).
+        """
+        with self._requests_lock:
+            self.requests += 1
+        op = header.get("op")
+        try:
+            if not isinstance(op, str):
+                raise DaemonError(f"op must be a string, not {type(op).__name__}")
+            method = getattr(self, f"_op_{op}", None)
+            if method is None:
+                raise DaemonError(f"unknown op {op!r}")
+            response, out = method(header, body)
+        except Exception as e:
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}, b""
+        response["ok"] = True
+        return response, out
+
+    def _source(self, header, body):
+        if "path" in header:
+            with open(header["path"], "r") as f:
+                return f.read()
+        return body.decode("utf-8")
+
+    def _parse(self, header, body):
+        modules = self.parser.parse_string(self._source(header, body), as_semantic_model=True).children
+        with self._api_lock:
+            for module in modules:
+                self._api.add(module)
+        return modules
+
+    def _op_ping(self, header, body):
+        return {"pid": os.getpid()}, b""
+
+    def _op_parse(self, header, body):
+        modules = self._parse(header, body)
+        return {"modules": [m.name for m in modules]}, encode_modules(modules)
+
+    def _op_check(self, header, body):
+        from .type_checker import check_modules
+        modules = self._parse(header, body)
+        result = check_modules(modules)
+        diagnostics = [{"code": d.code, "module": d.module, "subject": d.subject, "message": d.message}
+                       for d in result.diagnostics]
+        return {"modules": [m.name for m in modules], "diagnostics": diagnostics}, b""
+
+    def _op_query(self, header, body):
+        name = header.get("method")
+        if name not in QUERY_METHODS:
+            raise DaemonError(f"unknown query method {name!r}")
+        args = header.get("args", [])
+        if not isinstance(args, list):
+            raise DaemonError(f"query args must be a list, not {type(args).__name__}")
+        with self._api_lock:
+            result = getattr(self._api, name)(*args)
+        return {"result": _jsonable(result)}, b""
+
+    def _op_stats(self, header, body):
+        stats = {"requests": self.requests, "uptime": time.time() - self.started, "modules": len(self._api)}
+        if self.parser.cache is not None:
+            stats["cache"] = self.parser.cache.stats()
+        return stats, b""
+
+    def _op_shutdown(self, header, body):
+        threading.Thread(target=self.shutdown, daemon=True).start()
+        return {"shutting_down": True}, b""
+
+    def bind(self):
+        """
+        Create the listening socket (replacing a stale socket file) without serving yet.
+        """
+        if os.path.exists(self.socket_path):
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                    probe.connect(self.socket_path)
+            except OSError:
+                os.unlink(self.socket_path)
+            else:
+                raise DaemonError(f"a daemon is already listening on {self.socket_path}")
+        # Warm the semantic parser before accepting clients.
+        self.parser.parse_string("", as_semantic_model=True)
+        old_umask = os.umask(0o177)
+        try:
+            self._server = _Server(self.socket_path, _Handler)
+        finally:
+            os.umask(old_umask)
+        self._server.daemon = self
+        return self
+
+    def serve_forever(self):
+        if self._server is None:
+            self.bind()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+
+    def start(self):
+        """
+        Serve on a background thread; returns the thread.
+        """
+        if self._server is None:
+            self.bind()
+        thread = threading.Thread(target=self.serve_forever, name="cogent-daemon", daemon=True)
+        thread.start()
+        return thread
+
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+
+
+class DaemonClient:
+    def __init__(self, socket_path=None, timeout=30.0):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+        self._sock = None
+
+    def _request(self, header, body=b""):
+        if self._sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError as e:
+                sock.close()
+                raise DaemonError(f"no daemon listening on {self.socket_path}: {e}") from None
+            self._sock = sock
+        try:
+            write_frame(self._sock, header, body)
+            frame = read_frame(self._sock)
+        except OSError:
+            self.close()
+            raise
+        if frame is None:
+            self.close()
+            raise DaemonError("daemon closed the connection")
+        response, out = frame
+        if not response.get("ok"):
+            raise DaemonError(response.get("error", "request failed"))
+        return response, out
+
+    @staticmethod
+    def _source_request(op, source, path):
+        if (source is None) == (path is None):
+            raise ValueError("pass exactly one of source or path")
+        if path is not None:
+            return {"op": op, "path": os.path.abspath(path)}, b""
+        return {"op": op}, source.encode("utf-8")
+
+    def ping(self):
+        return self._request({"op": "ping"})[0]
+
+    def parse(self, source=None, path=None, lazy=False):
+        """
+        Parse `source` text or the file at `path` in the daemon; returns a list of CogentModules.
+        """
+        _, body = self._request(*self._source_request("parse", source, path))
+        return decode_modules(body, lazy=lazy)
+
+    def check(self, source=None, path=None):
+        """
+        Parse and type-check in the daemon; returns the diagnostics as dicts.
+        """
+        return self._request(*self._source_request("check", source, path))[0]["diagnostics"]
+
+    def query(self, method, *args):
+        return self._request({"op": "query", "method": method, "args": list(args)})[0]["result"]
+
+    def stats(self):
+        response = self._request({"op": "stats"})[0]
+        del response["ok"]
+        return response
+
+    def shutdown(self):
+        self._request({"op": "shutdown"})
+        self.close()
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,114 @@
+"""
+Incremental Parsing
+
+Re-parses only the modules touched by a text edit, for editor and agent
+loops that change one step at a time in large multi-module files.
+
+A ParsedDocument records where each top-level module ends in the source.
+Module boundaries are found with a cheap brace scan (strings are skipped),
+so an edit can be mapped to the modules it overlaps. Only that region is
+re-parsed; every other CogentModule is reused by identity. If the edited
+region no longer stands on its own (for example a brace was deleted), the
+whole document is re-parsed, so results always match a full parse.
+"""
+
+import re
+from bisect import bisect_right
+
+_BRACES = re.compile(r'"[^"\n]*"|[{}]')
+
+
+class TextEdit:
+    def __init__(self, start, end, text):
+        """
+        Replace source[start:end] with `text` (character offsets).
+        """
+        if not 0 <= start <= end:
+            raise ValueError(f"Invalid edit range {start}..{end}")
+        self.start = start
+        self.end = end
+        self.text = text
+
+    def apply(self, source):
+        if self.end > len(source):
+            raise ValueError(f"Edit range {self.start}..{self.end} exceeds source length {len(source)}")
+        return source[:self.start] + self.text + source[self.end:]
+
+    def __repr__(self):
+        return f"TextEdit({self.start}, {self.end}, {self.text!r})"
+
+
+class ParsedDocument:
+    def __init__(self, source, modules, module_ends, reparsed=None):
+        self.source = source
+        self.modules = modules
+        # module_ends[i] is the offset just past module i's closing brace, or
+        # None when boundaries could not be established.
+        self.module_ends = module_ends
+        # Number of modules actually parsed to produce this document.
+        self.reparsed = len(modules) if reparsed is None else reparsed
+
+    def __repr__(self):
+        return f"<ParsedDocument modules={[m.name for m in self.modules]} reparsed={self.reparsed}>"
+
+
+def scan_module_ends(text, offset=0):
+    """
+    Return the offsets just past each top-level closing brace in `text`,
+    or None if the braces do not balance.
+    """
+    ends = []
+    depth = 0
+    for match in _BRACES.finditer(text):
+        token = match.group()
+        if token == "{":
+            depth += 1
+        elif token == "}":
+            depth -= 1
+            if depth == 0:
+                ends.append(offset + match.end())
+            elif depth < 0:
+                return None
+    return ends if depth == 0 else None
+
+
+def parse_document(parser, source):
+    """
+    Fully parse `source` into a ParsedDocument.
+    """
+    modules = parser.parse_string(source, as_semantic_model=True).children
+    ends = scan_module_ends(source)
+    if ends is not None and len(ends) != len(modules):
+        ends = None
+    return ParsedDocument(source, modules, ends)
+
+
+def reparse(parser, previous, edit):
+    """
+    Apply `edit` to `previous.source` and return the new ParsedDocument,
+    re-parsing only the modules the edit overlaps.
+    """
+    source = edit.apply(previous.source)
+    ends = previous.module_ends
+    if ends is None:
+        return parse_document(parser, source)
+    delta = len(edit.text) - (edit.end - edit.start)
+    # Chunk i spans [ends[i-1], ends[i]); text after the last module is chunk len(ends).
+    first = bisect_right(ends, edit.start)
+    last = bisect_right(ends, max(edit.end - 1, edit.start))
+    region_start = ends[first - 1] if first else 0
+    region_end = (ends[last] if last < len(ends) else len(previous.source)) + delta
+    region = source[region_start:region_end]
+    region_ends = scan_module_ends(region, region_start)
+    if region_ends is None:
+        return parse_document(parser, source)
+    try:
+        region_modules = parser.parse_string(region, as_semantic_model=True).children
+    except Exception:
+        # Let a full parse report the error with document-relative positions.
+        return parse_document(parser, source)
+    if len(region_modules) != len(region_ends):
+        return parse_document(parser, source)
+    modules = previous.modules[:first] + region_modules + previous.modules[last + 1:]
+    new_ends = ends[:first] + region_ends + [end + delta for end in ends[last + 1:]]
+    return ParsedDocument(source, modules, new_ends, reparsed=len(region_modules))
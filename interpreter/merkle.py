@@ -0,0 +1,341 @@
+"""
+Structural Hashing
+
+Merkle hashes over semantic models, for telling cheaply whether two
+modules (or any two subtrees) are the same, what changed between two
+versions, and for storing identical process subtrees once.
+
+A node's hash covers its kind and its fields; child nodes contribute their
+own hashes, so a hash is computed bottom-up and each node is hashed once.
+The digest (16 bytes of BLAKE2b) is cached in the node's `_hash` slot, so
+asking again is free and hashing a new version of a module only hashes
+the nodes it does not share with the old one. Annotations and type
+declarations are hashed as mappings (order does not matter); inputs,
+imports and steps as sequences. Hashes are stable across processes and
+runs.
+
+Cached hashes assume models are not edited in place once hashed; a cached
+hash cannot notice an edit below it, since nodes do not know their parents.
+After editing a node (or a list it holds), call clear_hashes on the module,
+or pass fresh=True to structural_hash, diff, diff_corpus or dedup, which
+drops the cached hashes of the trees they are given and hashes them anew.
+
+diff(old, new) compares two nodes and descends only into children whose
+hashes differ, returning Changes whose paths follow agent_api.StepRef,
+prefixed by the module field: ("process", 1, "steps", 0). Paths of added
+and changed nodes index the new version, removed ones the old.
+
+SubtreeTable hash-conses process steps across a corpus: dedup(modules)
+replaces every step by the first structurally equal one seen, so a
+feedback loop's near-identical versions share their unchanged subtrees.
+Shared steps must then be treated as read-only.
+"""
+
+from difflib import SequenceMatcher
+
+from hashlib import blake2b
+
+from .semantic_model import EMPTY_ANNOTATIONS, MODEL_FIELDS, ForStep, WhileStep, TryStep, _MODEL_CLASSES
+
+# Fields holding lists of child nodes; they are diffed element-wise.
+_SEQUENCE_FIELDS = ("inputs", "process", "steps", "try_steps", "catch_steps")
+_STEP_CHILDREN = {ForStep: ("steps",), WhileStep: ("steps",), TryStep: ("try_steps", "catch_steps")}
+
+_KIND_TAGS = {cls: cls.__name__.encode("ascii") + b"(" for cls in _MODEL_CLASSES}
+_classes = {}
+
+
+def _model_class(node):
+    # (model class, fields) for a node, or None; subclasses such as
+    # module_store.ModuleProxy hash as the class they stand in for.
+    t = type(node)
+    found = _classes.get(t, False)
+    if found is False:
+        cls = next((c for c in t.__mro__ if c in _MODEL_CLASSES), None)
+        found = _classes[t] = (cls, MODEL_FIELDS[cls]) if cls is not None else None
+    return found
+
+
+def _encode(value, out):
+    # Appends an unambiguous byte encoding of `value` to the list `out`.
+    if value is None:
+        out.append(b"N")
+    elif value is True or value is False:
+        out.append(b"T" if value else b"F")
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        out.append(b"S%d:" % len(data))
+        out.append(data)
+    elif isinstance(value, (list, tuple)):
+        out.append(b"L%d:" % len(value))
+        for v in value:
+            if _model_class(v) is not None:
+                out.append(b"H")
+                out.append(digest(v))
+            else:
+                _encode(v, out)
+    elif isinstance(value, dict):
+        out.append(b"D%d:" % len(value))
+        for key in sorted(value):
+            _encode(key, out)
+            _encode(value[key], out)
+    elif _model_class(value) is not None:
+        out.append(b"H")
+        out.append(digest(value))
+    else:
+        data = repr(value).encode("utf-8")
+        out.append(b"R%d:" % len(data))
+        out.append(data)
+
+
+def digest(node):
+    """
+    The 16-byte structural hash of a model node, computed once and cached on it.
+    """
+    try:
+        return node._hash
+    except AttributeError:
+        pass
+    cls, fields = _model_class(node)
+    out = [_KIND_TAGS[cls]]
+    for field in fields:
+        value = getattr(node, field)
+        # Inline the common cases: most fields are strings, None or unannotated.
+        if value.__class__ is str:
+            data = value.encode("utf-8")
+            out.append(b"S%d:" % len(data))
+            out.append(data)
+        elif value is None:
+            out.append(b"N")
+        elif value is EMPTY_ANNOTATIONS:
+            out.append(b"D0:")
+        else:
+            _encode(value, out)
+    value = node._hash = blake2b(b"".join(out), digest_size=16).digest()
+    return value
+
+
+def structural_hash(node, fresh=False):
+    """
+    Hex structural hash of a model node: equal trees hash alike wherever they came from.
+    With `fresh`, hashes cached in the subtree are discarded first.
+    """
+    if fresh:
+        clear_hashes(node)
+    return digest(node).hex()
+
+
+def clear_hashes(node):
+    """
+    Drop cached hashes in `node`'s subtree (or a list of nodes), after editing it in place.
+    """
+    if isinstance(node, (list, tuple)):
+        for n in node:
+            clear_hashes(n)
+        return
+    if isinstance(node, dict):
+        for n in node.values():
+            clear_hashes(n)
+        return
+    found = _model_class(node)
+    if found is None:
+        return
+    try:
+        del node._hash
+    except AttributeError:
+        pass
+    for field in found[1]:
+        value = getattr(node, field)
+        if isinstance(value, (list, tuple, dict)) or _model_class(value) is not None:
+            clear_hashes(value)
+
+
+class Change:
+    __slots__ = ("kind", "path", "old", "new")
+
+    def __init__(self, kind, path, old, new):
+        self.kind = kind      # "added", "removed" or "changed"
+        self.path = path
+        self.old = old
+        self.new = new
+
+    def __repr__(self):
+        return f"<Change {self.kind} {list(self.path)}>"
+
+
+def diff(old, new, path=(), fresh=False):
+    """
+    Structural differences between two model nodes, as the deepest
+    differing nodes or fields; [] when they hash alike. Only subtrees whose
+    hashes differ are visited. With `fresh`, both trees are rehashed first.
+    """
+    if fresh:
+        clear_hashes(old)
+        clear_hashes(new)
+    changes = []
+    _diff(old, new, path, changes)
+    return changes
+
+
+def _diff(old, new, path, changes):
+    if old is new:
+        return
+    old_class, new_class = _model_class(old), _model_class(new)
+    if old_class is None or new_class is None or old_class[0] is not new_class[0]:
+        if old != new:
+            changes.append(Change("changed", path, old, new))
+        return
+    if digest(old) == digest(new):
+        return
+    for field in old_class[1]:
+        a, b = getattr(old, field), getattr(new, field)
+        if field in _SEQUENCE_FIELDS:
+            _diff_sequence(a or [], b or [], path + (field,), changes)
+        elif isinstance(a, dict) and isinstance(b, dict):
+            _diff_mapping(a, b, path + (field,), changes)
+        else:
+            _diff(a, b, path + (field,), changes)
+
+
+def _diff_mapping(old, new, path, changes):
+    for key, value in old.items():
+        if key not in new:
+            changes.append(Change("removed", path + (key,), value, None))
+        else:
+            _diff(value, new[key], path + (key,), changes)
+    for key, value in new.items():
+        if key not in old:
+            changes.append(Change("added", path + (key,), None, value))
+
+
+def _diff_sequence(old, new, path, changes):
+    old_hashes = [digest(n) for n in old]
+    new_hashes = [digest(n) for n in new]
+    start = 0
+    limit = min(len(old), len(new))
+    while start < limit and old_hashes[start] == new_hashes[start]:
+        start += 1
+    old_end, new_end = len(old), len(new)
+    while old_end > start and new_end > start and old_hashes[old_end - 1] == new_hashes[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+    if old_end - start == new_end - start:
+        for i in range(start, old_end):
+            _diff(old[i], new[i], path + (i,), changes)
+        return
+    matcher = SequenceMatcher(None, old_hashes[start:old_end], new_hashes[start:new_end], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        i1, i2, j1, j2 = i1 + start, i2 + start, j1 + start, j2 + start
+        if tag == "equal":
+            continue
+        # Within a replaced run, pair nodes of the same kind in order; the rest were removed or added.
+        j = j1
+        for i in range(i1, i2):
+            kind = _model_class(old[i])[0]
+            k = j
+            while k < j2 and _model_class(new[k])[0] is not kind:
+                k += 1
+            if k == j2:
+                changes.append(Change("removed", path + (i,), old[i], None))
+                continue
+            for added in range(j, k):
+                changes.append(Change("added", path + (added,), None, new[added]))
+            _diff(old[i], new[k], path + (k,), changes)
+            j = k + 1
+        for added in range(j, j2):
+            changes.append(Change("added", path + (added,), None, new[added]))
+
+
+def diff_corpus(old_modules, new_modules, fresh=False):
+    """
+    Module-level diff of two batches matched by module name: returns a
+    dict name -> list of Changes for modules added, removed or changed.
+    With `fresh`, every module is rehashed first.
+    """
+    if fresh:
+        clear_hashes(old_modules)
+        clear_hashes(new_modules)
+    old = {m.name: m for m in old_modules}
+    new = {m.name: m for m in new_modules}
+    result = {}
+    for name, module in old.items():
+        if name not in new:
+            result[name] = [Change("removed", (), module, None)]
+        else:
+            changes = diff(module, new[name])
+            if changes:
+                result[name] = changes
+    for name, module in new.items():
+        if name not in old:
+            result[name] = [Change("added", (), None, module)]
+    return result
+
+
+class SubtreeTable:
+    """
+    Canonical process steps by structural hash, shared across a corpus.
+    """
+    def __init__(self):
+        self._steps = {}
+        self.shared = 0     # steps replaced by an equal one already in the table
+
+    def intern(self, step):
+        """
+        Return the canonical step equal to `step`, adding `step` (with its
+        children interned) if there is none yet.
+        """
+        key = digest(step)
+        found = self._steps.get(key)
+        if found is not None:
+            if found is not step:
+                self.shared += 1
+            return found
+        for field in _STEP_CHILDREN.get(_model_class(step)[0], ()):
+            steps = getattr(step, field)
+            if steps:
+                self.intern_steps(steps)
+        self._steps[key] = step
+        return step
+
+    def intern_steps(self, steps):
+        """
+        Replace each step of the list `steps` in place by its canonical step.
+        """
+        for i, step in enumerate(steps):
+            canonical = self.intern(step)
+            if canonical is not step:
+                steps[i] = canonical
+        return steps
+
+    def dedup(self, modules, fresh=False):
+        """
+        Intern every module's process steps; returns the modules. With
+        `fresh`, the modules and the steps already in the table are rehashed
+        first, so steps edited since they were hashed are keyed correctly.
+        """
+        if fresh:
+            clear_hashes(modules)
+            steps = list(self._steps.values())
+            clear_hashes(steps)
+            self._steps = {}
+            for step in steps:
+                self._steps.setdefault(digest(step), step)
+        for module in modules:
+            if module.process:
+                self.intern_steps(module.process)
+        return modules
+
+    def __len__(self):
+        return len(self._steps)
+
+    def __contains__(self, step):
+        return digest(step) in self._steps
+
+
+def dedup_modules(modules, table=None, fresh=False):
+    """
+    Share identical process subtrees across `modules` in place; returns the SubtreeTable used.
+    """
+    table = table if table is not None else SubtreeTable()
+    table.dedup(modules, fresh)
+    return table
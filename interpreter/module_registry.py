@@ -0,0 +1,218 @@
+"""
+Module Registry
+
+Resolves `import` declarations to modules on a list of search paths and
+builds the import DAG. A module defined in an already-loaded file (such as
+the importer's own) resolves to that file; otherwise `Name` is looked up as
+`Name.cg` in each search path in order.
+
+Each file is parsed once and memoized. Independent files on the same level
+of the graph are parsed together, across a process pool when `workers` > 1;
+one pool serves every level of a resolve, and its workers share the
+parser's on-disk parse cache.
+When a file changes, only its own parse and the resolved dependency lists of
+modules that (transitively) import it are invalidated.
+"""
+
+import os
+from pathlib import Path
+
+from .batch import parse_many, parse_path, worker_pool
+from .parser import CogentParser
+
+
+class UnresolvedImportError(ImportError):
+    pass
+
+
+class ImportCycleError(ImportError):
+    def __init__(self, cycle):
+        self.cycle = cycle
+        super().__init__("Import cycle: " + " -> ".join(cycle))
+
+
+class ModuleRegistry:
+    def __init__(self, search_paths, parser=None, workers=1):
+        self.search_paths = [Path(p) for p in search_paths]
+        self.parser = parser or CogentParser.shared()
+        self.workers = workers
+        self.parses = 0
+        self._files = {}        # path -> (mtime_ns, size, [module names])
+        self._modules = {}      # name -> CogentModule
+        self._module_file = {}  # name -> path
+        self._dependents = {}   # name -> set of names importing it
+        self._resolved = {}     # name -> dependency-first list of module names
+
+    def resolve_path(self, name, importer=None):
+        """
+        Return the file defining module `name` (`importer` is only used in errors).
+        """
+        if name in self._module_file:
+            return self._module_file[name]
+        for root in self.search_paths:
+            candidate = root / f"{name}.cg"
+            if candidate.is_file():
+                return str(candidate)
+        where = f" (imported by {importer})" if importer else ""
+        raise UnresolvedImportError(f"Module {name}{where} not found in search paths {[str(p) for p in self.search_paths]}")
+
+    def add_file(self, path):
+        """
+        Parse and register every module in `path`; returns their names.
+        """
+        path = str(path)
+        if path not in self._files:
+            self._load_files([path])
+        return self._files[path][2]
+
+    def get(self, name):
+        """
+        Return module `name`, loading it and all of its dependencies.
+        """
+        self.resolve(name)
+        return self._modules[name]
+
+    def resolve(self, name):
+        """
+        Return `name` and its transitive imports as CogentModules, dependencies
+        first. Raises UnresolvedImportError or ImportCycleError.
+        """
+        order = self._resolved.get(name)
+        if order is None:
+            self._load_graph(name)
+            order = self._topological_order(name)
+            self._resolved[name] = order
+        return [self._modules[n] for n in order]
+
+    def dependents(self, name):
+        """
+        Names of loaded modules that import `name`, directly or transitively.
+        """
+        seen = set()
+        stack = [name]
+        while stack:
+            for dependent in self._dependents.get(stack.pop(), ()):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    stack.append(dependent)
+        return seen
+
+    def invalidate(self, path):
+        """
+        Forget `path` after it changed. Returns the names of modules whose
+        resolution was invalidated: the file's modules and everything importing them.
+        """
+        path = str(path)
+        entry = self._files.pop(path, None)
+        if entry is None:
+            return set()
+        affected = set()
+        for name in entry[2]:
+            affected.add(name)
+            affected |= self.dependents(name)
+        for name in entry[2]:
+            self._modules.pop(name, None)
+            self._module_file.pop(name, None)
+            for dependents in self._dependents.values():
+                dependents.discard(name)
+        for name in affected:
+            self._resolved.pop(name, None)
+        return affected
+
+    def refresh(self):
+        """
+        Invalidate every loaded file whose mtime or size changed (or that
+        was deleted). Returns the set of invalidated module names.
+        """
+        affected = set()
+        for path, (mtime, size, _) in list(self._files.items()):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                affected |= self.invalidate(path)
+                continue
+            if (stat.st_mtime_ns, stat.st_size) != (mtime, size):
+                affected |= self.invalidate(path)
+        return affected
+
+    def _load_graph(self, root):
+        # Breadth-first over imports; each level's unparsed files are loaded as one batch.
+        seen = {root}
+        level = [(root, None)]
+        pool = None
+        try:
+            while level:
+                paths = []
+                for name, importer in level:
+                    if name not in self._modules:
+                        path = self.resolve_path(name, importer)
+                        if path not in self._files and path not in paths:
+                            paths.append(path)
+                if pool is None and self.workers > 1 and len(paths) > 1:
+                    pool = self._worker_pool()
+                self._load_files(paths, pool)
+                next_level = []
+                for name, importer in level:
+                    if name not in self._modules:
+                        where = f" (imported by {importer})" if importer else ""
+                        raise UnresolvedImportError(f"Module {name}{where} is not defined in {self.resolve_path(name, importer)}")
+                    for imported in self._modules[name].imports:
+                        if imported not in seen:
+                            seen.add(imported)
+                            next_level.append((imported, name))
+                level = next_level
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def _worker_pool(self):
+        cache_dir = self.parser.cache.cache_dir if self.parser.cache is not None else None
+        return worker_pool(self.workers, self.parser.grammar_path, self.parser.backend, cache_dir)
+
+    def _load_files(self, paths, pool=None):
+        if not paths:
+            return []
+        if pool is not None and len(paths) > 1:
+            results = parse_many(paths, workers=self.workers, ordered=True, pool=pool)
+        else:
+            results = (parse_path(self.parser, path) for path in paths)
+        new_names = []
+        for result in results:
+            self.parses += 1
+            if not result.ok:
+                raise ImportError(f"Failed to load {result.path}: {result.error}")
+            stat = os.stat(result.path)
+            names = []
+            for module in result.modules:
+                self._modules[module.name] = module
+                self._module_file[module.name] = result.path
+                names.append(module.name)
+            self._files[result.path] = (stat.st_mtime_ns, stat.st_size, names)
+            new_names.extend(names)
+        for name in new_names:
+            for imported in self._modules[name].imports:
+                self._dependents.setdefault(imported, set()).add(name)
+        return new_names
+
+    def _topological_order(self, root):
+        # Iterative depth-first post-order, so deep import chains do not hit the recursion limit.
+        order = []
+        done = set()
+        on_path = {root: 0}
+        path = [root]
+        stack = [iter(self._modules[root].imports)]
+        while stack:
+            imported = next(stack[-1], None)
+            if imported is None:
+                stack.pop()
+                name = path.pop()
+                del on_path[name]
+                done.add(name)
+                order.append(name)
+            elif imported in on_path:
+                raise ImportCycleError(path[on_path[imported]:] + [imported])
+            elif imported not in done:
+                on_path[imported] = len(path)
+                path.append(imported)
+                stack.append(iter(self._modules[imported].imports))
+        return order
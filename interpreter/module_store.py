@@ -0,0 +1,179 @@
+"""
+Memory-Mapped Module Store
+
+An on-disk store of parsed modules for corpora too large to hold as Python
+objects. The file is a binary model buffer (see binary_format.py) followed
+by an open-addressing hash table from module name to module number and a
+fixed-size trailer that locates it:
+
+    model     binary model buffer
+    names     u32 slots (power of two), each module number + 1 or 0 if empty
+    trailer   magic "CGMS", u16 version, u16 reserved, u32 names offset, u32 slot count
+
+Opening a store maps the file and reads the two headers, so it costs the
+same whatever the store's size. Lookups return ModuleProxy objects that
+decode only the module's fixed fields; `types`, `inputs` and `process` are
+materialized on first access.
+"""
+
+import mmap
+import os
+import struct
+import zlib
+
+from .binary_format import LazyModule, ModelWriter, ModuleReader, _lazy_section
+
+STORE_MAGIC = b"CGMS"
+STORE_VERSION = 1
+
+_TRAILER = struct.Struct("<4sHHII")
+_U32 = struct.Struct("<I")
+
+
+def _name_hash(name):
+    return zlib.crc32(name.encode("utf-8"))
+
+
+class ModuleProxy(LazyModule):
+    """
+    A CogentModule read from a ModuleStore. Name, goal, context, feedback,
+    imports and annotations are decoded up front; types, inputs and process
+    are decoded on first access and then kept.
+    """
+    __slots__ = ()
+
+    _eager = ()
+
+    types = _lazy_section("types", ModuleReader.types_at)
+    inputs = _lazy_section("inputs", ModuleReader.inputs_at)
+
+
+def write_store(path, modules):
+    """
+    Write `modules` (any iterable, consumed one at a time) to a store at
+    `path`, replacing it atomically. Returns the number of modules written.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            writer = ModelWriter(f)
+            names = []
+            for module in modules:
+                writer.add(module)
+                names.append(module.name)
+            names_offset = writer.close()
+            slots = 1
+            while slots < 2 * len(names):
+                slots *= 2
+            table = [0] * slots
+            mask = slots - 1
+            for i, name in enumerate(names):
+                if name is None:
+                    continue
+                slot = _name_hash(name) & mask
+                while table[slot]:
+                    slot = (slot + 1) & mask
+                table[slot] = i + 1
+            f.write(struct.pack(f"<{slots}I", *table))
+            f.write(_TRAILER.pack(STORE_MAGIC, STORE_VERSION, 0, names_offset, slots))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return len(names)
+
+
+def build_store(path, sources, parser=None):
+    """
+    Parse each .cg file in `sources` with `parser` (streaming, one module at a
+    time) and write every module to a store at `path`.
+    """
+    if parser is None:
+        from .parser import CogentParser
+        parser = CogentParser.shared()
+
+    def modules():
+        for source in sources:
+            yield from parser.iter_modules(source)
+
+    return write_store(path, modules())
+
+
+class ModuleStore:
+    """
+    Read-only, memory-mapped view of a store written by `write_store`.
+    Modules are looked up by name (`store[name]`, `get`, `in`) or by number
+    (`module(i)`); when names repeat, lookup by name returns the first.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _TRAILER.size:
+                raise ValueError(f"{path} is not a Cogent module store")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, _, self._names_offset, self._slots = _TRAILER.unpack_from(self._mmap, size - _TRAILER.size)
+            if magic != STORE_MAGIC:
+                raise ValueError(f"{path} is not a Cogent module store")
+            if version != STORE_VERSION:
+                raise ValueError(f"Unsupported Cogent module store version {version} (expected {STORE_VERSION})")
+            self._reader = ModuleReader(self._mmap)
+        except BaseException:
+            self._mmap.close()
+            raise
+
+    def __len__(self):
+        return len(self._reader)
+
+    def __contains__(self, name):
+        return self.index(name) is not None
+
+    def __getitem__(self, name):
+        i = self.index(name)
+        if i is None:
+            raise KeyError(name)
+        return ModuleProxy(self._reader, i)
+
+    def __iter__(self):
+        for i in range(len(self._reader)):
+            yield ModuleProxy(self._reader, i)
+
+    def get(self, name, default=None):
+        i = self.index(name)
+        return default if i is None else ModuleProxy(self._reader, i)
+
+    def index(self, name):
+        """
+        Module number of `name`, or None if the store has no such module.
+        """
+        mask = self._slots - 1
+        slot = _name_hash(name) & mask
+        while True:
+            (entry,) = _U32.unpack_from(self._mmap, self._names_offset + 4 * slot)
+            if not entry:
+                return None
+            if self._reader.name(entry - 1) == name:
+                return entry - 1
+            slot = (slot + 1) & mask
+
+    def module(self, i):
+        return ModuleProxy(self._reader, i)
+
+    def names(self):
+        for i in range(len(self._reader)):
+            yield self._reader.name(i)
+
+    def close(self):
+        """
+        Unmap the file. Proxies whose fields have not been materialized can no longer load them.
+        """
+        self._reader.view.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,193 @@
+"""
+Parse Cache
+
+Content-addressed cache of semantic models. Entries are keyed by a hash of
+the source bytes plus the grammar/transformer version, so an unchanged file
+is never parsed twice. Serialized models live on disk (size-bounded, least
+recently used evicted first) with an in-memory LRU in front.
+
+Cached entries are stored serialized and decoded on every hit, so callers
+always get fresh objects they are free to mutate.
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+
+
+class ParseCache:
+    def __init__(self, cache_dir=None, memory_entries=256, max_disk_bytes=256 * 1024 * 1024):
+        """
+        `cache_dir` of None keeps the cache in memory only.
+        `memory_entries` bounds the in-memory LRU; `max_disk_bytes` bounds the disk store.
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.memory_entries = memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.write_errors = 0
+        self.corrupt = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = 0
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._disk_bytes = sum(p.stat().st_size for p in self.cache_dir.glob("*.model"))
+
+    @staticmethod
+    def key(source, version):
+        """
+        Cache key for `source` (str or bytes) under a grammar/transformer `version` string.
+        """
+        if isinstance(source, str):
+            source = source.encode("utf-8")
+        digest = hashlib.sha256(version.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(source)
+        return digest.hexdigest()
+
+    @staticmethod
+    def encode(modules):
+        return zlib.compress(pickle.dumps(modules, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+    @staticmethod
+    def decode(data):
+        return pickle.loads(zlib.decompress(data))
+
+    def get(self, key):
+        """
+        Return the cached list of CogentModule objects for `key`, or None.
+        """
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return self.decode(data)
+        data = self._read_disk(key)
+        modules = None
+        if data is not None:
+            try:
+                modules = self.decode(data)
+            except Exception:
+                # Truncated, corrupt or written by an incompatible version: a miss, and the entry goes.
+                self._drop_disk(key, len(data))
+        with self._lock:
+            if modules is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, data)
+        return modules
+
+    def put(self, key, modules):
+        data = self.encode(modules)
+        with self._lock:
+            self._remember(key, data)
+        if self.cache_dir is not None:
+            # A read-only or full cache directory must not fail the parse; the entry stays in memory.
+            try:
+                self._write_disk(key, data)
+            except OSError:
+                with self._lock:
+                    self.write_errors += 1
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self.cache_dir is not None:
+                for path in self.cache_dir.glob("*.model"):
+                    path.unlink(missing_ok=True)
+                self._disk_bytes = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "evictions": self.evictions,
+            "write_errors": self.write_errors,
+            "corrupt": self.corrupt,
+            "memory_entries": len(self._memory),
+            "disk_bytes": self._disk_bytes,
+        }
+
+    def _remember(self, key, data):
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key):
+        return self.cache_dir / f"{key}.model"
+
+    def _read_disk(self, key):
+        if self.cache_dir is None:
+            return None
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        # Refresh the mtime so disk eviction is least-recently-used.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def _drop_disk(self, key, size):
+        try:
+            self._path(key).unlink()
+        except OSError:
+            return
+        with self._lock:
+            self._disk_bytes = max(0, self._disk_bytes - size)
+            self.corrupt += 1
+
+    def _write_disk(self, key, data):
+        path = self._path(key)
+        if path.exists():
+            return
+        tmp = path.with_suffix(f".tmp{os.getpid()}.{threading.get_ident()}")
+        try:
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            raise
+        with self._lock:
+            self._disk_bytes += len(data)
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+
+    def _evict_disk(self):
+        entries = []
+        for path in self.cache_dir.glob("*.model"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        # Evict down to 90% of the bound so a full cache does not rescan on every write.
+        target = self.max_disk_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.evictions += 1
+        self._disk_bytes = total
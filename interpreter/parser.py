@@ -3,40 +3,191 @@ Cogent Parser
 
 Agent-centric parser for Cogent source files, built to reflect the formal EBNF grammar.
 Outputs a parse tree or semantic model for downstream analysis.
+
+Two Lark backends are supported: "lalr" (the default, and much faster) and
+"earley", which is kept as a fallback. Both produce identical trees, so the
+same CogentTransformer serves either one.
+
+Compiled grammars are shared process-wide, and LALR tables are additionally
+cached on disk (see `grammar_cache_dir`), so constructing a CogentParser after
+the first one is close to free.
+
+With the LALR backend, `as_semantic_model=True` runs CogentTransformer inside
+the parser, building model objects in a single pass without an intermediate
+tree. Transformer tracing goes to the "interpreter.parser" logger at DEBUG
+level and is skipped entirely unless that level is enabled.
 """
 
 
-from lark import Token
-from lark.tree import Tree
+import hashlib
+import logging
+import os
+import sys
+import threading
+from importlib import resources
 from pathlib import Path
 
+# Lark is needed to define CogentTransformer, so importing this module loads
+# it. Code that only needs models (the binary format, store, runtime, type
+# checker, daemon client and the CLI's argument handling) does not import
+# this module.
 try:
-    from lark import Lark, Transformer, v_args
-except ImportError:
-    Lark = None  # Will raise error if parser is constructed
+    from lark import Lark, Transformer, Tree, v_args
+    from lark import __version__ as LARK_VERSION
+except ImportError as e:
+    raise ImportError("Lark parser library is not installed. Please run 'pip install lark'.") from e
+
+from .semantic_model import (
+    CogentModule, InputItem, ProcessStep, ForStep, WhileStep, TryStep, TypeExpr, EnumType,
+    SEMANTIC_MODEL_VERSION, EMPTY_ANNOTATIONS,
+)
+from .telemetry import default_telemetry
+
+logger = logging.getLogger(__name__)
+
+PARSER_BACKENDS = ("lalr", "earley")
+
+# Shipped as package data, so an installed package finds it as well as a checkout.
+DEFAULT_GRAMMAR_PATH = Path(str(resources.files(__package__) / "grammar" / "cogent.ebnf"))
+
+# Compiled Lark instances shared by every CogentParser in this process,
+# keyed by (grammar file identity, backend, embedded transformer class).
+_compiled_grammars = {}
+_compiled_grammars_lock = threading.Lock()
+
+
+def grammar_cache_dir():
+    """
+    Directory holding serialized LALR tables. Override with COGENT_CACHE_DIR.
+    """
+    return Path(os.environ.get("COGENT_CACHE_DIR") or Path.home() / ".cache" / "cogent")
+
+
+def grammar_cache_key(grammar_text, backend):
+    """
+    Hash of the grammar text and the Lark options it is compiled with.
+    """
+    options = f"parser={backend};start=start;lark={LARK_VERSION}"
+    return hashlib.sha256((grammar_text + "\0" + options).encode("utf-8")).hexdigest()
+
+
+_transformer_version = None
+
+
+def transformer_version():
+    """
+    Short hash of this module's source, which defines CogentTransformer: editing the
+    transformer changes the models it builds, so cached models must not be reused.
+    """
+    global _transformer_version
+    if _transformer_version is None:
+        try:
+            data = Path(__file__).read_bytes()
+        except OSError:
+            data = b""
+        _transformer_version = hashlib.sha256(data).hexdigest()[:16]
+    return _transformer_version
+
+
+def clear_grammar_cache():
+    """
+    Drop the in-process compiled grammars (the on-disk cache is left alone).
+    """
+    with _compiled_grammars_lock:
+        _compiled_grammars.clear()
+
+
+def _compile_grammar(grammar_text, backend, use_disk_cache=True, transformer=None):
+    # Use 'start' as the entry rule for Lark grammar. An embedded transformer
+    # is only supported by LALR; it does not change the cached tables.
+    options = {"parser": backend, "start": "start"}
+    if transformer is not None:
+        options["transformer"] = transformer
+    if backend != "lalr" or not use_disk_cache:
+        return Lark(grammar_text, **options)
+    cache_dir = grammar_cache_dir()
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return Lark(grammar_text, **options)
+    cache_file = cache_dir / f"cogent-{backend}-{grammar_cache_key(grammar_text, backend)[:16]}.lark"
+    return Lark(grammar_text, cache=str(cache_file), **options)
+
+
+def _load_compiled(grammar_path, backend, use_disk_cache=True, transformer_class=None):
+    grammar_file = Path(grammar_path)
+    if not grammar_file.exists():
+        raise FileNotFoundError(f"Cogent grammar file not found at: {grammar_path}")
+    stat = grammar_file.stat()
+    key = (str(grammar_file.resolve()), stat.st_mtime_ns, stat.st_size, backend, transformer_class)
+    compiled = _compiled_grammars.get(key)
+    if compiled is None:
+        with _compiled_grammars_lock:
+            compiled = _compiled_grammars.get(key)
+            if compiled is None:
+                with open(grammar_file, "r") as f:
+                    grammar = f.read()
+                transformer = transformer_class() if transformer_class is not None else None
+                with default_telemetry.span("parser.compile_grammar", {"backend": backend}):
+                    compiled = _compile_grammar(grammar, backend, use_disk_cache, transformer)
+                _compiled_grammars[key] = compiled
+    return compiled
 
-# If semantic_model.py is in the same directory:
-from .semantic_model import CogentModule, InputItem, ProcessStep
 
 class CogentParser:
-    def __init__(self, grammar_path="grammar/cogent.ebnf"):
+    _shared = {}
+
+    def __init__(self, grammar_path=DEFAULT_GRAMMAR_PATH, parser="lalr", disk_cache=True, cache=None, telemetry=None):
         """
         Initialize the parser with the EBNF grammar.
+        `parser` selects the Lark backend: "lalr" (default) or "earley".
+        `disk_cache` enables the on-disk LALR table cache.
+        `cache` is an optional parse_cache.ParseCache consulted for semantic-model parses.
+        `telemetry` receives parse spans and counters (default: telemetry.default_telemetry).
         """
+        if parser not in PARSER_BACKENDS:
+            raise ValueError(f"Unknown parser backend {parser!r}; expected one of {PARSER_BACKENDS}")
         self.grammar_path = grammar_path
+        self.backend = parser
+        self.disk_cache = disk_cache
+        self.cache = cache
+        self.telemetry = telemetry or default_telemetry
         self.parser = None
+        self._semantic_parser = None
+        self._grammar_version = None
         self._load_grammar()
 
+    @classmethod
+    def shared(cls, grammar_path=DEFAULT_GRAMMAR_PATH, parser="lalr"):
+        """
+        Return a process-wide CogentParser for this grammar and backend,
+        creating it on first use.
+        """
+        key = (str(Path(grammar_path).resolve()), parser)
+        instance = cls._shared.get(key)
+        if instance is None:
+            instance = cls._shared.setdefault(key, cls(grammar_path, parser=parser))
+        return instance
+
     def _load_grammar(self):
-        if Lark is None:
-            raise ImportError("Lark parser library is not installed. Please run 'pip install lark'.")
-        grammar_file = Path(self.grammar_path)
-        if not grammar_file.exists():
-            raise FileNotFoundError(f"Cogent grammar file not found at: {self.grammar_path}")
-        with open(grammar_file, "r") as f:
-            grammar = f.read()
-        # Use 'start' as the entry rule for Lark grammar
-        self.parser = Lark(grammar, parser="earley", start="start", keep_all_tokens=True)
+        self.parser = _load_compiled(self.grammar_path, self.backend, self.disk_cache)
+
+    def _load_semantic_parser(self):
+        # LALR parser with CogentTransformer embedded: reductions build model objects directly.
+        self._semantic_parser = _load_compiled(
+            self.grammar_path, self.backend, self.disk_cache, transformer_class=CogentTransformer
+        )
+
+    @property
+    def grammar_version(self):
+        """
+        Hash of the grammar text, backend, transformer and semantic model version; parse cache entries are keyed on it.
+        """
+        if self._grammar_version is None:
+            with open(self.grammar_path, "r") as f:
+                grammar = f.read()
+            self._grammar_version = f"{grammar_cache_key(grammar, self.backend)}:{transformer_version()}:{SEMANTIC_MODEL_VERSION}"
+        return self._grammar_version
 
     def parse_file(self, file_path, as_semantic_model=False):
         """
@@ -46,292 +197,242 @@ class CogentParser:
             source_code = f.read()
         return self.parse_string(source_code, as_semantic_model=as_semantic_model)
 
+    def parse_many(self, paths, workers=None, ordered=False):
+        """
+        Parse many .cg files (or directories of them) across a process pool,
+        yielding a batch.ParseResult per file as each completes.
+        Workers share this parser's on-disk cache, if it has one.
+        See interpreter.batch.parse_many for details.
+        """
+        from .batch import iter_cg_files, parse_many
+        cache_dir = self.cache.cache_dir if self.cache is not None else None
+        return parse_many(iter_cg_files(paths), workers=workers, ordered=ordered,
+                          grammar_path=self.grammar_path, backend=self.backend, cache_dir=cache_dir)
+
+    def iter_modules(self, file_or_stream, chunk_size=None):
+        """
+        Yield each CogentModule from a path or stream as soon as its closing
+        brace has been read, without holding the whole source in memory.
+        """
+        from .streaming import DEFAULT_CHUNK_SIZE, iter_modules
+        return iter_modules(self, file_or_stream, chunk_size or DEFAULT_CHUNK_SIZE)
+
+    def parse_document(self, source_code):
+        """
+        Parse source into an incremental.ParsedDocument that `reparse` can update.
+        """
+        from .incremental import parse_document
+        return parse_document(self, source_code)
+
+    def reparse(self, previous, start, end, text):
+        """
+        Replace previous.source[start:end] with `text`, re-parsing only the
+        modules the edit touches. Unchanged modules are reused by identity.
+        """
+        from .incremental import TextEdit, reparse
+        return reparse(self, previous, TextEdit(start, end, text))
+
+    def parse_with_recovery(self, source_code):
+        """
+        Parse to semantic models without stopping at syntax errors: returns a
+        recovery.RecoveredParse holding every diagnostic (with line and
+        column) and the modules that could be built. Always uses LALR.
+        """
+        from .recovery import parse_with_recovery
+        return parse_with_recovery(self, source_code)
+
     def parse_string(self, source_code, as_semantic_model=False):
         """
         Parse Cogent source from a string.
         Returns a Lark parse tree or semantic model.
         """
+        telemetry = self.telemetry
+        if not telemetry.enabled:
+            return self._parse_string(source_code, as_semantic_model)
+        telemetry.count("parser.bytes", len(source_code))
+        with telemetry.span("parser.parse_string", {"backend": self.backend, "semantic": as_semantic_model}):
+            return self._parse_string(source_code, as_semantic_model)
+
+    def _parse_string(self, source_code, as_semantic_model):
+        if as_semantic_model and self.cache is not None:
+            key = self.cache.key(source_code, self.grammar_version)
+            modules = self.cache.get(key)
+            if modules is None:
+                self.telemetry.count("parser.cache_miss")
+                modules = self._parse_semantic(source_code).children
+                self.cache.put(key, modules)
+            else:
+                self.telemetry.count("parser.cache_hit")
+            return Tree("start", modules)
+        if as_semantic_model:
+            return self._parse_semantic(source_code)
         if self.parser is None:
             self._load_grammar()
-        tree = self.parser.parse(source_code)
-        if as_semantic_model:
-            return CogentTransformer().transform(tree)
-        return tree
+        return self.parser.parse(source_code)
+
+    def _parse_semantic(self, source_code):
+        if self.backend == "lalr" and not logger.isEnabledFor(logging.DEBUG):
+            if self._semantic_parser is None:
+                self._load_semantic_parser()
+            return self._semantic_parser.parse(source_code)
+        if self.parser is None:
+            self._load_grammar()
+        return CogentTransformer().transform(self.parser.parse(source_code))
 
-# Transformer stub for semantic model integration
-from lark import v_args
 
 class CogentTransformer(Transformer):
     """
     Convert parse trees into semantic model objects.
     Extend this class according to Cogent's grammar and semantic model.
+
+    Keyword and punctuation tokens are filtered out by Lark, so every rule
+    receives only its meaningful children (IDENTIFIER/STRING tokens and
+    already-transformed subrules). Optional `[...]` groups arrive as None.
+
+    When the "interpreter.parser" logger has DEBUG enabled at construction,
+    each step, input and annotation is traced through it.
     """
+    def __init__(self, visit_tokens=True):
+        super().__init__(visit_tokens)
+        self.trace = logger.isEnabledFor(logging.DEBUG)
+
     def module(self, items):
-        # Collect annotations at the start
-        annotations = self._collect_annotations(items)
-        idx = len(annotations)
-        name = str(items[idx+1]) if len(items) > idx+1 else None
+        # items: annotation*, IDENTIFIER, import_decl*, type_decl*, enum_decl*, module_body
+        annotations, count = self._collect_annotations(items)
+        rest = items[count:]
+        name = str(rest[0])
+        if default_telemetry.enabled:
+            default_telemetry.count("transformer.modules")
+        body = rest[-1]
         imports = []
         types = {}
-        body = None
-        i = idx+3
-        # Collect imports
-        while i < len(items) and isinstance(items[i], str):
-            imports.append(items[i])
-            i += 1
-        # Collect type and enum decls
-        while i < len(items) and (isinstance(items[i], tuple) or isinstance(items[i], dict)):
-            if isinstance(items[i], tuple):
-                tname, texpr = items[i]
+        for decl in rest[1:-1]:
+            if isinstance(decl, str):
+                imports.append(decl)
+            elif isinstance(decl, tuple):
+                tname, texpr = decl
                 types[tname] = texpr
-            elif isinstance(items[i], dict):
-                types.update(items[i])
-            i += 1
-        if i < len(items) and isinstance(items[i], list):
-            body = items[i]
-        if name is None or body is None:
-            raise ValueError("Could not extract module name and body from parse tree.")
-        goal, inputs, context, process, feedback = body + [None] * (5 - len(body))
-        return CogentModule(name, goal, inputs, process, context, feedback, imports=imports, types=types, annotations=annotations)
-
-    def type_decl(self, items):
-        # items: ['type', Token('IDENTIFIER', ...), '=', TypeExpr]
-        name = str(items[1])
-        value = items[3]
-        return (name, value)
+            elif isinstance(decl, dict):
+                types.update(decl)
+        return CogentModule(name, imports=imports, types=types, annotations=annotations, **body)
+
+    @v_args(inline=True)
+    def type_decl(self, name, value):
+        return (str(name), value)
 
     def enum_decl(self, items):
-        # items: ['enum', Token('IDENTIFIER', ...), '{', enum_item, (',' enum_item)*, '}']
-        from interpreter.semantic_model import EnumType
-        name = str(items[1])
-        # items[3:-1] are enum items and commas
-        enum_items = [str(i) for i in items[3:-1] if isinstance(i, str) and i != ',']
-        return {name: EnumType(name, enum_items)}
+        # items: IDENTIFIER, enum_item+
+        name = str(items[0])
+        return {name: EnumType(name, items[1:])}
 
     def enum_item(self, items):
         return str(items[0])
 
     def type_expr(self, items):
-        from interpreter.semantic_model import TypeExpr
         name = str(items[0])
         param = items[1] if len(items) > 1 else None
         return TypeExpr(name, param)
 
-    def type_expr_param(self, items):
-        # items: ['<', type_expr, '>']
-        return items[1]
+    @v_args(inline=True)
+    def type_expr_param(self, inner):
+        return inner
 
-    def import_decl(self, items):
-        # items: [Token('IMPORT', 'import'), Token('IDENTIFIER', ...)]
-        return str(items[1])
+    @v_args(inline=True)
+    def import_decl(self, name):
+        return str(name)
 
     def module_body(self, items):
-        goal = None
-        inputs = None
-        context = None
-        process = None
-        feedback = None
-        from interpreter.semantic_model import ProcessStep, ForStep, WhileStep, TryStep
-        for item in items:
-            if isinstance(item, str):
-                if goal is None:
-                    goal = item
-                elif context is None:
-                    context = item
-                elif feedback is None:
-                    feedback = item
-            elif isinstance(item, list):
-                if not item:
-                    if inputs is None:
-                        inputs = []
-                    elif process is None:
-                        process = []
-                elif isinstance(item[0], InputItem):
-                    inputs = item
-                elif isinstance(item[0], (ProcessStep, ForStep, WhileStep, TryStep)):
-                    process = item
-        if inputs is None:
-            inputs = []
-        if process is None:
-            process = []
-        return [goal, inputs, context, process, feedback]
+        # Each *_decl yields a (field, value) pair, so optional fields never shift position.
+        fields = {"goal": None, "inputs": [], "context": None, "process": [], "feedback": None}
+        fields.update(items)
+        return fields
 
     @v_args(inline=True)
-    def goal_decl(self, *args):
-        if len(args) == 2:
-            value = args[1]
-        elif len(args) == 1:
-            value = args[0]
-        else:
-            value = None
-        return value.strip('"') if value else None
+    def goal_decl(self, value):
+        return ("goal", value[1:-1])
 
     @v_args(inline=True)
-    def inputs_decl(self, *args):
-        if len(args) == 2:
-            value = args[1]
-        elif len(args) == 1:
-            value = args[0]
-        else:
-            value = None
-        if isinstance(value, list):
-            return [v for v in value if not (hasattr(v, 'type') and v.type in {'LSQB', 'RSQB'})]
-        else:
-            return value if value else []
+    def inputs_decl(self, value):
+        return ("inputs", value)
 
     def input_list(self, items):
-        return [item for item in items if item is not None and not (hasattr(item, 'type') and item.type in {'LSQB', 'RSQB', 'COMMA'})]
+        return [item for item in items if item is not None]
 
     def input_item(self, items):
-        print(f"[DEBUG] input_item: {items}")
-        annotations = self._collect_annotations(items)
-        idx = len(annotations)
+        annotations, idx = self._collect_annotations(items)
         name = str(items[idx])
-        type_name = str(items[idx+2]) if len(items) > idx+2 else None
-        print(f"[DEBUG] input_item: name={name}, type_name={type_name}, annotations={annotations}")
+        type_name = str(items[idx+1])
+        if self.trace:
+            logger.debug("input_item: name=%s, type_name=%s, annotations=%s", name, type_name, annotations)
         return InputItem(name, type_name, annotations=annotations)
 
     @v_args(inline=True)
-    def context_decl(self, *args):
-        if len(args) == 2:
-            value = args[1]
-        elif len(args) == 1:
-            value = args[0]
-        else:
-            value = None
-        return value.strip('"') if value else None
+    def context_decl(self, value):
+        return ("context", value[1:-1])
 
     @v_args(inline=True)
-    def process_decl(self, *args):
-        if len(args) == 2:
-            value = args[1]
-        elif len(args) == 1:
-            value = args[0]
-        else:
-            value = None
-        if isinstance(value, list):
-            return [v for v in value if not (hasattr(v, 'type') and v.type in {'LSQB', 'RSQB'})]
-        else:
-            return value if value else []
-
+    def process_decl(self, value):
+        return ("process", value)
 
     def process_list(self, items):
-        steps = [item for item in items if item is not None and not (hasattr(item, 'type') and item.type in {'LSQB', 'RSQB', 'COMMA'})]
-        from interpreter.semantic_model import ProcessStep, ForStep, WhileStep, TryStep
-        result = []
-        for step in steps:
-            if isinstance(step, (ProcessStep, ForStep, WhileStep, TryStep)):
-                result.append(step)
-            elif isinstance(step, str):
-                result.append(ProcessStep(step.strip('"')))
-        return result
+        return [item for item in items if item is not None]
 
     def process_step(self, items):
-        print(f"[DEBUG] process_step: {items}")
-        from interpreter.semantic_model import ProcessStep, ForStep, WhileStep, TryStep
-        annotations = self._collect_annotations(items)
-        idx = len(annotations)
-        # Find the first non-annotation tuple
-        j = idx
-        print(f"[DEBUG] process_step: items before annotation skip: {items}")
-        while j < len(items) and isinstance(items[j], tuple) and len(items[j]) == 2:
-            print(f"[DEBUG] Skipping annotation tuple at index {j}: {items[j]}")
-            j += 1
-        if j < len(items):
-            print(f"[DEBUG] process_step: main item at index {j}: {items[j]} (type: {type(items[j])})")
-        # try-catch: [Token('TRY', 'try'), process_list, Token('CATCH', 'catch'), IDENTIFIER, process_list]
-        if j < len(items) and hasattr(items[j], 'type') and items[j].type == 'TRY':
-            try_steps = items[j+1]
-            if j+4 < len(items) and hasattr(items[j+2], 'type') and items[j+2].type == 'CATCH':
-                catch_var = str(items[j+3])
-                catch_steps = items[j+4]
-                print(f"[DEBUG] TryStep: try_steps={try_steps}, catch_var={catch_var}, catch_steps={catch_steps}, annotations={annotations}")
-                return TryStep(try_steps, catch_var, catch_steps, annotations=annotations)
-            print(f"[DEBUG] TryStep: try_steps={try_steps}, no catch, annotations={annotations}")
-            return TryStep(try_steps, annotations=annotations)
-        # for-loop: [Token('FOR', 'for'), IDENTIFIER, Token('IN', 'in'), IDENTIFIER, Token('COLON', ':'), process_list]
-        if j+5 < len(items) and hasattr(items[j], 'type') and items[j].type == 'FOR':
-            var = str(items[j+1])
-            iterable = str(items[j+3])
-            steps = items[j+5]
-            print(f"[DEBUG] ForStep: var={var}, iterable={iterable}, steps={steps}, annotations={annotations}")
-            return ForStep(var, iterable, steps, annotations=annotations)
-        # while-loop: [Token('WHILE', 'while'), STRING, Token('COLON', ':'), process_list]
-        if j+3 < len(items) and hasattr(items[j], 'type') and items[j].type == 'WHILE':
-            condition = items[j+1]
-            if hasattr(condition, 'type') and condition.type == 'STRING':
-                condition = str(condition)[1:-1]
-            else:
-                condition = str(condition)
-            steps = items[j+3]
-            print(f"[DEBUG] WhileStep: condition={condition}, steps={steps}, annotations={annotations}")
-            return WhileStep(condition, steps, annotations=annotations)
-        # STRING step
-        if j < len(items) and (
-            (isinstance(items[j], str)) or
-            (hasattr(items[j], 'type') and items[j].type == 'STRING')
-        ):
-            text = items[j] if isinstance(items[j], str) else str(items[j])[1:-1]
-            print(f"[DEBUG] ProcessStep: text={text}, annotations={annotations}")
-            return ProcessStep(text.strip('"'), annotations=annotations)
-        return items[j] if j < len(items) else None
+        # items: annotation*, step (already built by text_step/for_step/while_step/try_step)
+        step = items[-1]
+        step.annotations = self._collect_annotations(items)[0] or EMPTY_ANNOTATIONS
+        if default_telemetry.enabled:
+            default_telemetry.count("transformer.steps")
+        if self.trace:
+            logger.debug("process_step: %r, annotations=%s", step, step.annotations)
+        return step
+
+    @v_args(inline=True)
+    def text_step(self, text):
+        return ProcessStep(text[1:-1])
+
+    @v_args(inline=True)
+    def for_step(self, var, iterable, steps):
+        return ForStep(str(var), str(iterable), steps)
+
+    @v_args(inline=True)
+    def while_step(self, condition, steps):
+        return WhileStep(condition[1:-1], steps)
+
+    @v_args(inline=True)
+    def try_step(self, try_steps, catch_var, catch_steps):
+        if catch_var is None:
+            return TryStep(try_steps)
+        return TryStep(try_steps, str(catch_var), catch_steps)
 
     def annotation(self, items):
-        print(f"[DEBUG] annotation: {items}")
-        # items: [@, IDENTIFIER, (args...)?]
-        name = str(items[1])
-        args = []
-        if len(items) > 2 and isinstance(items[2], list):
-            args = items[2]
+        # items: IDENTIFIER, annotation_args?
+        name = sys.intern(str(items[0]))
+        args = items[1] if len(items) > 1 else []
+        if self.trace:
+            logger.debug("annotation: %s%s", name, args)
         return (name, args)
 
     def annotation_args(self, items):
         return items
 
     def annotation_arg(self, items):
-        return str(items[0])
+        return sys.intern(str(items[0]))
 
     def _collect_annotations(self, items):
-        print(f"[DEBUG] _collect_annotations: {items}")
-        # Helper: collect annotation tuples from start of items, return as dict
+        # Helper: collect annotation tuples from start of items; returns them as a
+        # dict (a repeated name keeps its last arguments) and the number of items used.
         annotations = {}
         idx = 0
         while idx < len(items) and isinstance(items[idx], tuple) and len(items[idx]) == 2:
             name, args = items[idx]
             annotations[name] = args if args else True
             idx += 1
-        return annotations
-
-    def for_loop(self, items):
-        # for IDENTIFIER in IDENTIFIER : process_list
-        from interpreter.semantic_model import ForStep
-        var = str(items[1])
-        iterable = str(items[3])
-        steps = items[5]
-        print(f"[DEBUG] for_loop: var={var}, iterable={iterable}, steps={steps}")
-        return ForStep(var, iterable, steps)
-
-    def while_loop(self, items):
-        # while STRING : process_list
-        from interpreter.semantic_model import WhileStep
-        condition = items[1].strip('"')
-        steps = items[3]
-        print(f"[DEBUG] while_loop: condition={condition}, steps={steps}")
-        return WhileStep(condition, steps)
+        return annotations, idx
 
     @v_args(inline=True)
-    def feedback_decl(self, *args):
-        if len(args) == 2:
-            value = args[1]
-        elif len(args) == 1:
-            value = args[0]
-        else:
-            value = None
-        return value.strip('"') if value else None
-
-    def type_name(self, items):
-        # Simplified: just return as string
-        return "".join(str(i) for i in items)
+    def feedback_decl(self, value):
+        return ("feedback", value[1:-1])
 
 
     # Additional rules as needed...
@@ -0,0 +1,253 @@
+"""
+Compiled Execution Plans
+
+Lowers a module's process once into a flat instruction sequence that the
+runtime executes with a single dispatch loop instead of recursing through
+the step objects.
+
+A Plan holds parallel columns: `ops` (an array of opcodes) and `a`, `b`,
+`c` (operands). Loops compile to an init instruction, a test instruction
+that jumps past the body when done, the body, and a jump back to the test.
+Text steps carry their handler, resolved when the plan is compiled, and
+their step path; @cache steps (and, under a profiler, every text step)
+compile to CACHED_STEP, which goes through the runtime's step cache and
+profiler. Try blocks have no instructions of their own; they are
+entries in an exception table of (start, end, handler, catch variable,
+block depth) ranges, searched innermost-first when an instruction raises.
+
+@parallel for-loops and @independent step groups compile to a single
+instruction that hands the subtree to the Runtime's pool scheduler, so
+results are the same as tree-walking.
+"""
+
+from array import array
+
+from .merkle import structural_hash
+from .semantic_model import ProcessStep, ForStep, WhileStep, TryStep
+
+(OP_STEP, OP_FOR_INIT, OP_FOR_NEXT, OP_WHILE_INIT, OP_WHILE_TEST, OP_JUMP, OP_POP_BLOCK,
+ OP_PARALLEL_FOR, OP_INDEPENDENT, OP_CACHED_STEP) = range(10)
+
+OP_NAMES = ("STEP", "FOR_INIT", "FOR_NEXT", "WHILE_INIT", "WHILE_TEST", "JUMP", "POP_BLOCK",
+            "PARALLEL_FOR", "INDEPENDENT", "CACHED_STEP")
+
+
+def module_hash(module, fresh=False):
+    """
+    Content hash of a module: equal modules hash alike wherever they came from.
+    The hash is cached on the module (see merkle.py), so repeat lookups are
+    free; pass `fresh` (or use Runtime.invalidate) after editing it in place.
+    """
+    return structural_hash(module, fresh)
+
+
+class Plan:
+    __slots__ = ("ops", "a", "b", "c", "exception_table")
+
+    def __init__(self):
+        self.ops = array("B")
+        self.a = []
+        self.b = []
+        self.c = []
+        # (start, end, handler, catch_var, has_catch, block_depth), innermost first
+        self.exception_table = []
+
+    def __len__(self):
+        return len(self.ops)
+
+    def emit(self, op, a=None, b=None, c=None):
+        self.ops.append(op)
+        self.a.append(a)
+        self.b.append(b)
+        self.c.append(c)
+        return len(self.ops) - 1
+
+    def patch(self, pc, column, value):
+        getattr(self, column)[pc] = value
+
+    def disassemble(self):
+        lines = []
+        for pc, op in enumerate(self.ops):
+            operands = ", ".join(repr(x) for x in (self.a[pc], self.b[pc], self.c[pc]) if x is not None and not callable(x))
+            lines.append(f"{pc:4d} {OP_NAMES[op]:12s} {operands}")
+        for entry in self.exception_table:
+            lines.append(f"     try {entry[0]}..{entry[1]} -> {entry[2]} catch={entry[3]!r}")
+        return "\n".join(lines)
+
+
+class _Compiler:
+    def __init__(self, runtime):
+        self.runtime = runtime
+        self.plan = Plan()
+        self.depth = 0
+
+    def steps(self, steps, path):
+        i = 0
+        while i < len(steps):
+            step = steps[i]
+            if "independent" in step.annotations:
+                j = i
+                while j < len(steps) and "independent" in steps[j].annotations:
+                    j += 1
+                if j - i > 1:
+                    self.plan.emit(OP_INDEPENDENT, steps, (i, j), path)
+                    i = j
+                    continue
+            self.step(step, path + (i,))
+            i += 1
+
+    def step(self, step, path):
+        plan = self.plan
+        if isinstance(step, ProcessStep):
+            runtime = self.runtime
+            if runtime.profiler is not None or ("cache" in step.annotations and runtime.step_cache is not None):
+                plan.emit(OP_CACHED_STEP, step.text, self.runtime._resolve(step.text), (path, step.annotations))
+            else:
+                plan.emit(OP_STEP, step.text, self.runtime._resolve(step.text), path)
+        elif isinstance(step, ForStep):
+            if "parallel" in step.annotations:
+                plan.emit(OP_PARALLEL_FOR, step, path)
+                return
+            plan.emit(OP_FOR_INIT, step)
+            test = plan.emit(OP_FOR_NEXT)
+            self.depth += 1
+            self.steps(step.steps, path + ("steps",))
+            self.depth -= 1
+            plan.emit(OP_JUMP, test)
+            plan.patch(test, "a", len(plan))
+        elif isinstance(step, WhileStep):
+            plan.emit(OP_WHILE_INIT)
+            test = plan.emit(OP_WHILE_TEST, step.condition, self.runtime._conditions.get(step.condition))
+            self.depth += 1
+            self.steps(step.steps, path + ("steps",))
+            self.depth -= 1
+            plan.emit(OP_JUMP, test)
+            plan.patch(test, "c", len(plan))
+        elif isinstance(step, TryStep):
+            start = len(plan)
+            self.steps(step.try_steps, path + ("try_steps",))
+            if step.catch_steps is None:
+                plan.exception_table.append((start, len(plan), len(plan), None, False, self.depth))
+                return
+            skip = plan.emit(OP_JUMP)
+            handler = len(plan)
+            self.depth += 1
+            self.steps(step.catch_steps, path + ("catch_steps",))
+            self.depth -= 1
+            plan.emit(OP_POP_BLOCK)
+            plan.patch(skip, "a", len(plan))
+            plan.exception_table.append((start, skip, handler, step.catch_var, True, self.depth))
+        else:
+            raise TypeError(f"Cannot compile {step!r}")
+
+
+def compile_process(process, runtime):
+    """
+    Compile a process list into a Plan, resolving handlers against `runtime`.
+    """
+    compiler = _Compiler(runtime)
+    compiler.steps(process, ())
+    return compiler.plan
+
+
+def execute(plan, runtime, scope, out):
+    """
+    Run `plan` with `scope`, appending StepResults to `out`.
+    """
+    from .runtime import StepResult, NoHandlerError, LoopLimitError, CogentRuntimeError
+
+    ops, col_a, col_b, col_c = plan.ops, plan.a, plan.b, plan.c
+    count = runtime.telemetry.count
+    limit = runtime.max_loop_iterations
+    # Block stack entries: [items, index, saved_scope, saved_iteration, var] for loops
+    # (items is None for while loops) and [None, None, saved_scope, saved_iteration, None] for catch bodies.
+    blocks = []
+    iteration = ()
+    pc = 0
+    end = len(ops)
+    while pc < end:
+        try:
+            while pc < end:
+                op = ops[pc]
+                if op == OP_STEP:
+                    handler = col_b[pc]
+                    if handler is None:
+                        raise NoHandlerError(f"No handler registered for step {col_a[pc]!r}")
+                    count("runtime.steps")
+                    out.append(StepResult(col_c[pc], iteration, col_a[pc], handler(col_a[pc], scope)))
+                    pc += 1
+                elif op == OP_FOR_NEXT:
+                    block = blocks[-1]
+                    k = block[1] + 1
+                    if k == len(block[0]):
+                        blocks.pop()
+                        scope = block[2]
+                        iteration = block[3]
+                        pc = col_a[pc]
+                    else:
+                        block[1] = k
+                        scope = {**block[2], block[4]: block[0][k]}
+                        iteration = block[3] + (k,)
+                        pc += 1
+                elif op == OP_JUMP:
+                    pc = col_a[pc]
+                elif op == OP_FOR_INIT:
+                    step = col_a[pc]
+                    if step.iterable not in scope:
+                        raise CogentRuntimeError(
+                            f"for {step.var} in {step.iterable}: {step.iterable!r} is not defined")
+                    blocks.append([list(scope[step.iterable]), -1, scope, iteration, step.var])
+                    pc += 1
+                elif op == OP_WHILE_TEST:
+                    predicate = col_b[pc]
+                    if predicate is None:
+                        raise NoHandlerError(f"No condition registered for while {col_a[pc]!r}")
+                    block = blocks[-1]
+                    if predicate(scope):
+                        k = block[1] + 1
+                        if k == limit:
+                            raise LoopLimitError(f"while {col_a[pc]!r} exceeded {limit} iterations")
+                        block[1] = k
+                        iteration = block[3] + (k,)
+                        pc += 1
+                    else:
+                        blocks.pop()
+                        iteration = block[3]
+                        pc = col_c[pc]
+                elif op == OP_WHILE_INIT:
+                    blocks.append([None, -1, scope, iteration, None])
+                    pc += 1
+                elif op == OP_POP_BLOCK:
+                    scope = blocks.pop()[2]
+                    pc += 1
+                elif op == OP_PARALLEL_FOR:
+                    runtime._run_for(col_a[pc], scope, col_b[pc], iteration, out)
+                    pc += 1
+                elif op == OP_INDEPENDENT:
+                    runtime._run_group(col_a[pc], col_b[pc], scope, col_c[pc], iteration, out)
+                    pc += 1
+                else:  # OP_CACHED_STEP
+                    handler = col_b[pc]
+                    if handler is None:
+                        raise NoHandlerError(f"No handler registered for step {col_a[pc]!r}")
+                    count("runtime.steps")
+                    path, annotations = col_c[pc]
+                    value = runtime._call_handler(handler, col_a[pc], annotations, scope, path)
+                    out.append(StepResult(path, iteration, col_a[pc], value))
+                    pc += 1
+        except Exception as e:
+            for start, stop, handler, catch_var, has_catch, depth in plan.exception_table:
+                if start <= pc < stop:
+                    break
+            else:
+                raise
+            if len(blocks) > depth:
+                scope = blocks[depth][2]
+                iteration = blocks[depth][3]
+                del blocks[depth:]
+            if has_catch:
+                blocks.append([None, None, scope, iteration, None])
+                scope = dict(scope)
+                if catch_var:
+                    scope[catch_var] = e
+            pc = handler
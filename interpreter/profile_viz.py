@@ -1,41 +1,79 @@
-import matplotlib.pyplot as plt
-from interpreter.parser import CogentParser
-from interpreter.resource_profiler import profile_parse
+"""
+Parse Profile Plots
+
+Profiles the parse phases of every example and writes parse_profile.json
+and parse_profile.png (phase wall times stacked per file, and per-rule
+transformer time). matplotlib is only imported when plotting.
+
+    python -m interpreter.profile_viz
+"""
+
 import glob
+import json
 import os
 
-# Find all .cg files in examples/ or use a default
-cg_files = glob.glob("examples/*.cg")
-if not cg_files:
-    cg_files = [None]
-
-results = []
-labels = []
-
-for f in cg_files:
-    if f:
-        with open(f) as file:
-            code = file.read()
-        label = os.path.basename(f)
-    else:
-        code = '''module Example { goal: "Profile test" inputs: [x: Int] process: ["Step"] }'''
-        label = "default"
-    parser = CogentParser(grammar_path="grammar/cogent.ebnf")
-    res = profile_parse(parser, code)
-    results.append(res)
-    labels.append(label)
-
-# Plot
-fig, ax1 = plt.subplots()
-ax2 = ax1.twinx()
-
-ax1.bar(labels, [r.elapsed_sec for r in results], color='b', alpha=0.6, label='Time (s)')
-ax2.plot(labels, [r.peak_mem_bytes/1024 for r in results], 'ro-', label='Peak Mem (KB)')
-
-ax1.set_xlabel('File')
-ax1.set_ylabel('Parse Time (s)', color='b')
-ax2.set_ylabel('Peak Memory (KB)', color='r')
-plt.title('Cogent Parser Performance')
-fig.tight_layout()
-plt.savefig('parse_profile.png')
-plt.show()
+from interpreter.resource_profiler import profile_parse_phases, PHASES
+
+
+def collect(pattern="examples/*.cg"):
+    """
+    Profile each file matching `pattern` (or a small default module); returns (labels, results).
+    """
+    cg_files = glob.glob(pattern) or [None]
+    results = []
+    labels = []
+    for f in cg_files:
+        if f:
+            with open(f) as file:
+                code = file.read()
+            label = os.path.basename(f)
+        else:
+            code = '''module Example { goal: "Profile test" inputs: [x: Int] process: ["Step"] }'''
+            label = "default"
+        results.append(profile_parse_phases(code, grammar_path="interpreter/grammar/cogent.ebnf"))
+        labels.append(label)
+    return labels, results
+
+
+def plot(labels, results, path="parse_profile.png", show=True):
+    import matplotlib.pyplot as plt
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+
+    bottoms = [0.0] * len(results)
+    for phase in PHASES:
+        times = [r.phase(phase).wall_sec * 1000 for r in results]
+        ax1.bar(labels, times, bottom=bottoms, label=phase)
+        bottoms = [b + t for b, t in zip(bottoms, times)]
+    ax1.set_xlabel('File')
+    ax1.set_ylabel('Wall time (ms)')
+    ax1.set_title('Parse phases')
+    ax1.legend()
+
+    rule_names = sorted({name for r in results for name in r.rules})
+    bottoms = [0.0] * len(results)
+    for name in rule_names:
+        times = [r.rules.get(name, {"wall_sec": 0.0})["wall_sec"] * 1000 for r in results]
+        ax2.bar(labels, times, bottom=bottoms, label=name)
+        bottoms = [b + t for b, t in zip(bottoms, times)]
+    ax2.set_xlabel('File')
+    ax2.set_ylabel('Wall time (ms)')
+    ax2.set_title('Transformer rules')
+    ax2.legend(fontsize='small')
+
+    plt.suptitle('Cogent Parser Performance')
+    fig.tight_layout()
+    plt.savefig(path)
+    if show:
+        plt.show()
+
+
+def main():
+    labels, results = collect()
+    with open("parse_profile.json", "w") as out:
+        json.dump({label: r.to_dict() for label, r in zip(labels, results)}, out, indent=2)
+    plot(labels, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""
+Error-Recovering Parse
+
+Parses Cogent source that may contain syntax errors, reporting every error
+in one pass instead of stopping at the first, and returning CogentModules
+for what could be parsed.
+
+Recovery runs inside the LALR semantic parser through Lark's `on_error`
+hook, so error-free input costs exactly one ordinary parse. At each error
+a small local repair is chosen (after Burke and Fisher): delete the
+offending token, take back a trailing comma before a closing bracket, or
+insert up to MAX_INSERTIONS tokens before it. Each candidate is tried on a
+throwaway copy of the parser state, and the one that lets the most of the
+following LOOKAHEAD tokens parse wins, fewer edits breaking ties. Inserted identifiers and strings are placeholders
+(`_missing`, `""`), so a module with a missing goal still comes back, with
+an empty goal and a diagnostic saying what was inserted. At end of input,
+missing closers are inserted until the module is complete.
+
+Closing brackets and `module` are resynchronisation points: deleting one
+would leave a block open and derail the rest of the module, so insertion
+wins ties there, and a `module` keyword met inside an unfinished module
+closes it, so an error in one module does not swallow the next. An error
+found right after a deleted token, with nothing in between, is treated as
+part of the same mistake and not reported again.
+"""
+
+from copy import copy
+
+from lark import Token
+from lark.exceptions import UnexpectedCharacters, UnexpectedInput, UnexpectedToken
+
+from .semantic_model import CogentModule
+
+MAX_INSERTIONS = 3
+LOOKAHEAD = 3
+# Upper bound on tokens inserted at end of input to close open blocks.
+MAX_CLOSERS = 64
+
+_PLACEHOLDERS = {"IDENTIFIER": "_missing", "STRING": '""', "NUMBER": "0"}
+# Tried first when several insertions score the same.
+_PREFERRED = ("COMMA", "RSQB", "RBRACE", "RPAR", "MORETHAN", "COLON")
+_CLOSERS = ("RSQB", "RBRACE", "RPAR", "MORETHAN")
+# At end of input, keywords of optional parts are tried last and openers
+# never: either would only leave more to close. Nor is a whole module
+# made up when only stray annotations are left.
+_OPTIONAL = ("CATCH", "CONTEXT", "ENUM", "FEEDBACK", "IMPORT", "TYPE")
+_OPENERS = ("AT", "COMMA", "LESSTHAN", "LPAR", "MODULE")
+# Deleting one of these leaves a block open and the rest of the module
+# misparses, so they are resynchronised on instead: ties go to insertion,
+# and a `module` no insertion fits in closes the open module first.
+_BOUNDARIES = _CLOSERS + ("MODULE",)
+
+
+class SyntaxDiagnostic:
+    __slots__ = ("line", "column", "message", "expected", "repair")
+
+    def __init__(self, line, column, message, expected=(), repair=None):
+        self.line = line
+        self.column = column
+        self.message = message
+        self.expected = tuple(expected)
+        self.repair = repair
+
+    def __repr__(self):
+        repair = f" ({self.repair})" if self.repair else ""
+        return f"{self.line}:{self.column}: {self.message}{repair}"
+
+
+class RecoveredParse:
+    def __init__(self, modules, diagnostics):
+        self.modules = modules
+        self.diagnostics = diagnostics
+
+    @property
+    def ok(self):
+        return not self.diagnostics
+
+    def __repr__(self):
+        return f"RecoveredParse(modules={[m.name for m in self.modules]}, diagnostics={self.diagnostics})"
+
+
+class _Recovery:
+    # The on_error callback for one parse.
+    def __init__(self, source, lark):
+        self.source = source
+        self.literals = {t.name: t.pattern.value for t in lark.terminals if t.pattern.type == "str"}
+        self.diagnostics = []
+        self._deleted_end = None
+        self._last_char = None
+
+    def __call__(self, e):
+        if isinstance(e, UnexpectedCharacters):
+            return self._bad_character(e)
+        if isinstance(e, UnexpectedToken):
+            return self._bad_token(e)
+        return False
+
+    def _report(self, line, column, message, expected=(), repair=None):
+        self.diagnostics.append(SyntaxDiagnostic(line, column, message, expected, repair))
+
+    def _describe(self, type_name):
+        if type_name == "$END":
+            return "end of input"
+        literal = self.literals.get(type_name)
+        return repr(literal) if literal is not None else type_name
+
+    def _bad_character(self, e):
+        # Lark skips the character when we return True; report each run of bad characters once.
+        if self._last_char != e.pos_in_stream - 1:
+            char = self.source[e.pos_in_stream]
+            self._report(e.line, e.column, f"unexpected character {char!r}", repair=f"skipped {char!r}")
+        self._last_char = e.pos_in_stream
+        return True
+
+    # Trial parsing on copies: callbacks are stripped so nothing is built.
+
+    def _trial(self, ip):
+        trial = ip.copy(deepcopy_values=False)
+        conf = copy(trial.parser_state.parse_conf)
+        conf.callbacks = {}
+        trial.parser_state.parse_conf = conf
+        return trial
+
+    def _feed(self, trial, token):
+        try:
+            if token.type == "$END":
+                trial.parser_state.feed_token(token, True)
+            else:
+                trial.feed_token(token)
+            return True
+        except UnexpectedInput:
+            return False
+
+    def _lookahead_score(self, trial):
+        score = 0
+        try:
+            for token in trial.lexer_thread.lex(trial.parser_state):
+                if not self._feed(trial, token):
+                    return score
+                score += 1
+                if score == LOOKAHEAD:
+                    return score
+        except UnexpectedInput:
+            return score
+        end = Token.new_borrow_pos("$END", "", trial.lexer_thread.state.last_token) \
+            if trial.lexer_thread.state.last_token else Token("$END", "")
+        return score + 1 if self._feed(trial, end) else score
+
+    def _token(self, type_name, at):
+        value = self.literals.get(type_name, _PLACEHOLDERS.get(type_name, ""))
+        return Token.new_borrow_pos(type_name, value, at)
+
+    def _insertable(self, ip, order=_PREFERRED):
+        choices = [t for t in ip.choices() if t.isupper() and t != "$END"]
+        choices.sort(key=lambda t: (order.index(t) if t in order else len(order), t))
+        return choices
+
+    def _best_repair(self, ip, token):
+        # Returns (inserted token types, None), (None, "delete") or (None,
+        # "unshift"). A repair scores the tokens it lets parse (the offending
+        # one included, for insertions and unshifting) minus the tokens it edits.
+        best_score = self._lookahead_score(self._trial(ip)) - 1
+        best = (None, "delete")
+        if token.type in _CLOSERS and self._trailing_comma(ip):
+            trial = self._trial(ip)
+            self._unshift(trial)
+            if self._feed(trial, token):
+                score = self._lookahead_score(trial)
+                if score > best_score:
+                    best_score, best = score, (None, "unshift")
+        frontier = [((), ip)]
+        for depth in range(1, MAX_INSERTIONS + 1):
+            next_frontier = []
+            for inserted, state in frontier:
+                for type_name in self._insertable(state):
+                    grown = self._trial(state)
+                    if not self._feed(grown, self._token(type_name, token)):
+                        continue
+                    sequence = inserted + (type_name,)
+                    next_frontier.append((sequence, grown))
+                    trial = self._trial(grown)
+                    if not self._feed(trial, token):
+                        continue
+                    score = self._lookahead_score(trial) + 1 - depth
+                    # Strictly better only: ties go to deletion (insertion at a boundary),
+                    # then to the shortest insertion found first.
+                    if score > best_score or (score == best_score and best[1] == "delete" and token.type in _BOUNDARIES):
+                        best_score, best = score, (sequence, None)
+            frontier = next_frontier
+            if best[1] is None:
+                break
+        if best[1] == "delete" and token.type == "MODULE":
+            closers = self._closers(ip, token)
+            if closers:
+                return tuple(closers), None
+        return best
+
+    @staticmethod
+    def _trailing_comma(ip):
+        values = ip.parser_state.value_stack
+        return bool(values) and isinstance(values[-1], Token) and values[-1].type == "COMMA"
+
+    @staticmethod
+    def _unshift(ip):
+        # Take back the last shifted token: a shift only pushes, so popping restores the state before it.
+        ip.parser_state.state_stack.pop()
+        return ip.parser_state.value_stack.pop()
+
+    def _closers(self, ip, token):
+        # Closers that, inserted before `token`, let it parse; [] if there are none.
+        trial = self._trial(ip)
+        inserted = []
+        while not self._feed(self._trial(trial), token):
+            if len(inserted) == MAX_CLOSERS:
+                return []
+            choices = [t for t in self._insertable(trial, _CLOSERS) if t not in _OPENERS]
+            choices.sort(key=lambda t: t in _OPTIONAL)
+            for type_name in choices:
+                if self._feed(self._trial(trial), self._token(type_name, token)):
+                    trial.feed_token(self._token(type_name, token))
+                    inserted.append(type_name)
+                    break
+            else:
+                return []
+        return inserted
+
+    def _bad_token(self, e):
+        ip = e.interactive_parser
+        token = e.token
+        expected = sorted(self._describe(t) for t in e.expected)
+        if token.type == "$END":
+            return self._close(e, ip, expected)
+        cascade = self._deleted_end is not None and not self.source[self._deleted_end:token.start_pos].strip()
+        inserted, action = self._best_repair(ip, token)
+        if inserted:
+            for type_name in inserted:
+                ip.feed_token(self._token(type_name, token))
+            ip.feed_token(token)
+            repair = "inserted " + " ".join(self._describe(t) for t in inserted)
+            self._deleted_end = None
+        elif action == "unshift":
+            comma = self._unshift(ip)
+            ip.feed_token(token)
+            repair = f"skipped trailing {comma.value!r}"
+            self._deleted_end = None
+        else:
+            repair = f"skipped {token.value!r}"
+            self._deleted_end = token.end_pos
+        if not cascade:
+            found = self._describe(token.type)
+            if token.type not in self.literals:
+                found += f" {token.value!r}"
+            self._report(token.line, token.column, f"unexpected {found}", expected, repair)
+        return True
+
+    def _close(self, e, ip, expected):
+        inserted = []
+        end = e.token
+        while len(inserted) < MAX_CLOSERS:
+            if self._feed(self._trial(ip), end):
+                break
+            choices = [t for t in self._insertable(ip, _CLOSERS) if t not in _OPENERS]
+            choices.sort(key=lambda t: t in _OPTIONAL)
+            for type_name in choices:
+                if self._feed(self._trial(ip), self._token(type_name, end)):
+                    ip.feed_token(self._token(type_name, end))
+                    inserted.append(type_name)
+                    break
+            else:
+                break
+        line = self.source.count("\n") + 1
+        column = len(self.source) - (self.source.rfind("\n") + 1) + 1
+        repair = "inserted " + " ".join(self._describe(t) for t in inserted) if inserted else None
+        self._report(line, column, "unexpected end of input", expected, repair)
+        return bool(inserted)
+
+
+def _salvage(values):
+    # Completed modules left on the parser's value stack when recovery gave up.
+    found = []
+    for value in values:
+        if isinstance(value, CogentModule):
+            found.append(value)
+        elif isinstance(value, list):
+            found.extend(_salvage(value))
+        elif hasattr(value, "children"):
+            found.extend(_salvage(value.children))
+    return found
+
+
+def parse_with_recovery(parser, source_code):
+    """
+    Parse `source_code` with `parser`'s grammar, recovering from syntax
+    errors. Returns a RecoveredParse of modules and SyntaxDiagnostics.
+    """
+    from .parser import CogentTransformer, _load_compiled
+    lark = _load_compiled(parser.grammar_path, "lalr", parser.disk_cache, transformer_class=CogentTransformer)
+    recovery = _Recovery(source_code, lark)
+    try:
+        tree = lark.parse(source_code, on_error=recovery)
+        modules = list(tree.children)
+    except UnexpectedInput as e:
+        ip = getattr(e, "interactive_parser", None)
+        modules = _salvage(ip.parser_state.value_stack) if ip is not None else []
+        if not recovery.diagnostics:
+            recovery._report(e.line, e.column, str(e).splitlines()[0])
+    parser.telemetry.count("parser.syntax_errors", len(recovery.diagnostics))
+    return RecoveredParse(modules, recovery.diagnostics)
@@ -1,13 +1,40 @@
-
-
 """
 Resource Profiler
 
 Implements resource profiling for Cogent interpreter: track and report resource usage (CPU, memory, time, etc.) for modules and processes.
+
+`profile_parse` times a whole parse. `profile_parse_phases` breaks parsing
+down into grammar load, lexing, parsing, tree transform and semantic-model
+construction, and reports per-rule transformer timings.
+
+`ExecutionProfiler` profiles running modules: pass one to
+`Runtime(profiler=...)` and every text step's handler call is charged to
+its module and step path (as in agent_api.StepRef), with wall time, CPU
+time of the calling thread and, while tracemalloc is tracing, the net
+bytes allocated. tracemalloc counts process-wide, so a call that overlaps
+another measured call in the same process (thread-pool jobs) is charged no
+allocations rather than the other's; process-pool workers are unaffected.
+`memory=True` starts tracemalloc, in pool workers too, and `close`
+stops it again. Calls are aggregated per path, so the iterations of a
+loop add up under the steps of its body. With `sample_rate` below 1 only
+that fraction of calls is measured (every call is still counted) and
+totals are scaled up by calls / samples. Steps run in process-pool
+workers are measured there and merged into the parent's profiler when
+each job returns. Results export as a JSON summary (`to_dict`,
+`write_json`) or as collapsed stacks (`collapsed`, `write_collapsed`), one
+"module;outer step;...;step value" line per path, for flamegraph.pl,
+speedscope or inferno.
 """
 
+import json
+import os
+import random
+import threading
 import time
 import tracemalloc
+from pathlib import Path
+
+PHASES = ("grammar_load", "lex", "parse", "transform", "model_build")
 
 class ParseProfileResult:
 	def __init__(self, elapsed_sec, peak_mem_bytes):
@@ -29,10 +56,369 @@ def profile_parse(parser, source_code):
 	tracemalloc.stop()
 	return ParseProfileResult(elapsed, peak)
 
+class PhaseProfile:
+	def __init__(self, name, wall_sec=0.0, cpu_sec=0.0, retained_bytes=0, peak_bytes=None):
+		self.name = name
+		self.wall_sec = wall_sec
+		self.cpu_sec = cpu_sec
+		self.retained_bytes = retained_bytes
+		self.peak_bytes = peak_bytes
+	def to_dict(self):
+		return {
+			"name": self.name,
+			"wall_sec": self.wall_sec,
+			"cpu_sec": self.cpu_sec,
+			"retained_bytes": self.retained_bytes,
+			"peak_bytes": self.peak_bytes,
+		}
+	def __repr__(self):
+		return f"PhaseProfile({self.name}: wall={self.wall_sec:.6f}s, cpu={self.cpu_sec:.6f}s, retained={self.retained_bytes} B)"
+
+class ParsePhaseProfile:
+	def __init__(self, phases, rules):
+		self.phases = phases  # list of PhaseProfile, in PHASES order
+		self.rules = rules    # rule name -> {"calls": int, "wall_sec": float}
+	def phase(self, name):
+		for phase in self.phases:
+			if phase.name == name:
+				return phase
+		raise KeyError(name)
+	@property
+	def total_wall_sec(self):
+		return sum(p.wall_sec for p in self.phases)
+	def to_dict(self):
+		return {"phases": [p.to_dict() for p in self.phases], "rules": self.rules}
+	def __repr__(self):
+		parts = ", ".join(f"{p.name}={p.wall_sec:.6f}s" for p in self.phases)
+		return f"ParsePhaseProfile({parts})"
+
+def _timing_transformer(rules):
+	# Subclass built lazily so this module does not import Lark at load time.
+	from interpreter.parser import CogentTransformer
+
+	class TimingTransformer(CogentTransformer):
+		def _call_userfunc(self, tree, new_children=None):
+			start = time.perf_counter()
+			try:
+				return super()._call_userfunc(tree, new_children)
+			finally:
+				stats = rules.setdefault(str(tree.data), {"calls": 0, "wall_sec": 0.0})
+				stats["calls"] += 1
+				stats["wall_sec"] += time.perf_counter() - start
+
+	return TimingTransformer()
+
+def _measure(fn):
+	wall = time.perf_counter()
+	cpu = time.process_time()
+	result = fn()
+	return result, time.perf_counter() - wall, time.process_time() - cpu
+
+def _measure_memory(fn):
+	before = tracemalloc.get_traced_memory()[0]
+	tracemalloc.reset_peak()
+	result = fn()
+	current, peak = tracemalloc.get_traced_memory()
+	return result, current - before, peak - before
+
+def profile_parse_phases(source_code, grammar_path=None, backend="lalr"):
+	"""
+	Profile each phase of turning source_code into semantic models:
+
+	  grammar_load - compiling the grammar from scratch (no caches)
+	  lex          - tokenizing the source on its own
+	  parse        - building the parse tree, minus the lex time (LALR lexes on the fly)
+	  transform    - CogentTransformer walking the tree, outside rule callbacks
+	  model_build  - time inside rule callbacks, which build the semantic model objects
+
+	Timings come from one pass; retained and peak memory from a second pass under
+	tracemalloc, so tracing does not distort the timings. Everything the transform
+	pass retains is the semantic model, so it is reported under model_build; the
+	tree walk's transient memory shows up as the transform peak.
+	Returns a ParsePhaseProfile with per-rule transformer timings.
+	"""
+	from interpreter.parser import DEFAULT_GRAMMAR_PATH, _compile_grammar, CogentTransformer
+
+	grammar_text = Path(grammar_path or DEFAULT_GRAMMAR_PATH).read_text()
+	load = lambda: _compile_grammar(grammar_text, backend, use_disk_cache=False)
+
+	# Timing pass.
+	lark, load_wall, load_cpu = _measure(load)
+	_, lex_wall, lex_cpu = _measure(lambda: list(lark.lex(source_code)))
+	tree, parse_wall, parse_cpu = _measure(lambda: lark.parse(source_code))
+	rules = {}
+	transformer = _timing_transformer(rules)
+	_, transform_wall, transform_cpu = _measure(lambda: transformer.transform(tree))
+	callback_wall = sum(r["wall_sec"] for r in rules.values())
+	callback_share = callback_wall / transform_wall if transform_wall else 0.0
+
+	# Memory pass.
+	was_tracing = tracemalloc.is_tracing()
+	if not was_tracing:
+		tracemalloc.start()
+	try:
+		lark, load_kept, load_peak = _measure_memory(load)
+		_, lex_kept, lex_peak = _measure_memory(lambda: list(lark.lex(source_code)))
+		tree, parse_kept, parse_peak = _measure_memory(lambda: lark.parse(source_code))
+		model, model_kept, transform_peak = _measure_memory(lambda: CogentTransformer().transform(tree))
+	finally:
+		if not was_tracing:
+			tracemalloc.stop()
+
+	phases = [
+		PhaseProfile("grammar_load", load_wall, load_cpu, load_kept, load_peak),
+		PhaseProfile("lex", lex_wall, lex_cpu, lex_kept, lex_peak),
+		PhaseProfile("parse", max(parse_wall - lex_wall, 0.0), max(parse_cpu - lex_cpu, 0.0), parse_kept, parse_peak),
+		PhaseProfile("transform", transform_wall - callback_wall, transform_cpu * (1 - callback_share), 0, transform_peak),
+		PhaseProfile("model_build", callback_wall, transform_cpu * callback_share, model_kept, None),
+	]
+	return ParsePhaseProfile(phases, rules)
+
+STEP_METRICS = ("wall", "cpu", "alloc")
+
+class StepProfile:
+	def __init__(self, module, path, text):
+		self.module = module
+		self.path = path
+		self.text = text
+		self.calls = 0
+		self.samples = 0
+		self.wall_sec = 0.0
+		self.cpu_sec = 0.0
+		self.alloc_bytes = 0
+		self.max_wall_sec = 0.0
+	@property
+	def scale(self):
+		# Sampled totals are scaled by calls per measured call.
+		return self.calls / self.samples if self.samples else 0.0
+	def estimate(self, metric):
+		value = {"wall": self.wall_sec, "cpu": self.cpu_sec, "alloc": self.alloc_bytes}[metric]
+		return value * self.scale
+	def to_dict(self):
+		return {
+			"module": self.module,
+			"path": list(self.path),
+			"text": self.text,
+			"calls": self.calls,
+			"samples": self.samples,
+			"wall_sec": self.wall_sec,
+			"cpu_sec": self.cpu_sec,
+			"alloc_bytes": self.alloc_bytes,
+			"max_wall_sec": self.max_wall_sec,
+			"est_wall_sec": self.estimate("wall"),
+			"est_cpu_sec": self.estimate("cpu"),
+			"est_alloc_bytes": self.estimate("alloc"),
+		}
+	def _merge(self, calls, samples, wall, cpu, alloc, max_wall):
+		self.calls += calls
+		self.samples += samples
+		self.wall_sec += wall
+		self.cpu_sec += cpu
+		self.alloc_bytes += alloc
+		self.max_wall_sec = max(self.max_wall_sec, max_wall)
+	def __repr__(self):
+		return (f"StepProfile({self.module}{list(self.path)} {self.text!r}: calls={self.calls}, "
+			f"wall={self.wall_sec:.6f}s, cpu={self.cpu_sec:.6f}s, alloc={self.alloc_bytes} B)")
+
+class ExecutionProfiler:
+	def __init__(self, sample_rate=1.0, memory=False, seed=None):
+		if not 0.0 < sample_rate <= 1.0:
+			raise ValueError(f"sample_rate must be in (0, 1], got {sample_rate}")
+		self.sample_rate = sample_rate
+		self.memory = memory
+		self._started_tracing = False
+		self.steps = {}      # (module, path) -> StepProfile
+		self.runs = {}       # module -> {"runs": int, "wall_sec": float, "cpu_sec": float}
+		self.workers = {}    # pid -> measured calls
+		self.modules = {}    # module name -> CogentModule, for stack labels
+		self._random = random.Random(seed)
+		self._lock = threading.Lock()
+		# Measured calls in flight and ever started, to spot overlapping allocation counts.
+		self._active = 0
+		self._entered = 0
+		# True in a pool worker's copy, whose results go back to the parent.
+		self.remote = False
+
+	def measure(self, module, path, text, fn, *args):
+		"""
+		Call fn(*args), charging it to step `path` of `module`. Allocations
+		are charged only if no other measured call ran at the same time.
+		"""
+		if self.sample_rate < 1.0 and self._random.random() >= self.sample_rate:
+			with self._lock:
+				self._profile(module, path, text).calls += 1
+			return fn(*args)
+		tracing = tracemalloc.is_tracing()
+		if self.memory and not tracing:
+			tracemalloc.start()
+			self._started_tracing = tracing = True
+		if tracing:
+			with self._lock:
+				alone = not self._active
+				self._active += 1
+				self._entered += 1
+				entered = self._entered
+			alloc = tracemalloc.get_traced_memory()[0]
+		cpu = time.thread_time()
+		wall = time.perf_counter()
+		try:
+			return fn(*args)
+		finally:
+			wall = time.perf_counter() - wall
+			cpu = time.thread_time() - cpu
+			alloc = tracemalloc.get_traced_memory()[0] - alloc if tracing else 0
+			with self._lock:
+				if tracing:
+					self._active -= 1
+					# Another call's allocations are mixed into this one's: charge none.
+					if not alone or self._entered != entered:
+						alloc = 0
+				self._profile(module, path, text)._merge(1, 1, wall, cpu, alloc, wall)
+				pid = os.getpid()
+				self.workers[pid] = self.workers.get(pid, 0) + 1
+
+	def _profile(self, module, path, text):
+		key = (module, path)
+		profile = self.steps.get(key)
+		if profile is None:
+			profile = self.steps[key] = StepProfile(module, path, text)
+		return profile
+
+	def run_started(self, module):
+		self.modules[module.name] = module
+		return time.perf_counter(), time.thread_time()
+
+	def run_finished(self, module, started):
+		wall = time.perf_counter() - started[0]
+		cpu = time.thread_time() - started[1]
+		with self._lock:
+			run = self.runs.setdefault(module.name, {"runs": 0, "wall_sec": 0.0, "cpu_sec": 0.0})
+			run["runs"] += 1
+			run["wall_sec"] += wall
+			run["cpu_sec"] += cpu
+
+	def drain(self):
+		"""
+		Remove and return everything measured so far, as plain data for `merge`.
+		"""
+		with self._lock:
+			steps = [(p.module, p.path, p.text, p.calls, p.samples, p.wall_sec, p.cpu_sec, p.alloc_bytes, p.max_wall_sec)
+				for p in self.steps.values()]
+			workers = self.workers
+			self.steps = {}
+			self.workers = {}
+		return {"steps": steps, "workers": workers}
+
+	def merge(self, drained):
+		"""
+		Add results drained from another profiler (such as a worker's copy).
+		"""
+		with self._lock:
+			for module, path, text, *totals in drained["steps"]:
+				self._profile(module, path, text)._merge(*totals)
+			for pid, samples in drained["workers"].items():
+				self.workers[pid] = self.workers.get(pid, 0) + samples
+
+	def reset(self):
+		with self._lock:
+			self.steps = {}
+			self.runs = {}
+			self.workers = {}
+
+	def close(self):
+		if self._started_tracing:
+			tracemalloc.stop()
+			self._started_tracing = False
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc_info):
+		self.close()
+
+	def __getstate__(self):
+		# Pool workers get an empty copy without the lock or the modules.
+		return {"sample_rate": self.sample_rate, "memory": self.memory}
+
+	def __setstate__(self, state):
+		self.__init__(state["sample_rate"], state["memory"])
+		self.remote = True
+
+	def top(self, n=10, metric="wall"):
+		"""
+		The `n` step profiles with the highest estimated `metric` total.
+		"""
+		return sorted(self.steps.values(), key=lambda p: p.estimate(metric), reverse=True)[:n]
+
+	def to_dict(self):
+		steps = sorted(self.steps.values(), key=lambda p: p.estimate("wall"), reverse=True)
+		return {
+			"sample_rate": self.sample_rate,
+			"runs": self.runs,
+			"workers": {str(pid): samples for pid, samples in self.workers.items()},
+			"steps": [p.to_dict() for p in steps],
+		}
+
+	def write_json(self, path):
+		with open(path, "w") as f:
+			json.dump(self.to_dict(), f, indent=2)
+
+	def _frames(self, profile):
+		# Stack frame labels from the module down to the step.
+		frames = [profile.module or "?"]
+		module = self.modules.get(profile.module)
+		steps = module.process if module is not None else None
+		step = None
+		last = len(profile.path) - 1
+		for i, part in enumerate(profile.path):
+			if isinstance(part, str):
+				if part == "catch_steps":
+					catch_var = getattr(step, "catch_var", None)
+					frames.append(f"catch {catch_var}" if catch_var else "catch")
+				steps = getattr(step, part, None)
+				continue
+			step = steps[part] if steps is not None and part < len(steps) else None
+			frames.append(_frame_label(step, profile.text if i == last else None, part))
+		return [f.replace(";", ",") for f in frames]
+
+	def collapsed(self, metric="wall"):
+		"""
+		Collapsed stacks, one "frame;frame;... value" line per step path;
+		values are estimated microseconds (wall, cpu) or bytes (alloc).
+		"""
+		if metric not in STEP_METRICS:
+			raise ValueError(f"Unknown metric {metric!r}; expected one of {STEP_METRICS}")
+		scale = 1 if metric == "alloc" else 1e6
+		lines = []
+		for profile in sorted(self.steps.values(), key=lambda p: (str(p.module), p.path)):
+			if profile.samples:
+				value = int(round(profile.estimate(metric) * scale))
+				lines.append(f"{';'.join(self._frames(profile))} {value}")
+		return "\n".join(lines) + ("\n" if lines else "")
+
+	def write_collapsed(self, path, metric="wall"):
+		with open(path, "w") as f:
+			f.write(self.collapsed(metric))
+
+	def __repr__(self):
+		return f"ExecutionProfiler(steps={len(self.steps)}, sample_rate={self.sample_rate})"
+
+def _frame_label(step, text, index):
+	from interpreter.semantic_model import ProcessStep, ForStep, WhileStep, TryStep
+	if isinstance(step, ProcessStep):
+		return step.text
+	if isinstance(step, ForStep):
+		return f"for {step.var} in {step.iterable}"
+	if isinstance(step, WhileStep):
+		return f"while {step.condition}"
+	if isinstance(step, TryStep):
+		return "try"
+	return text if text is not None else f"[{index}]"
+
 # Example usage (for test or CLI):
 # from interpreter.parser import CogentParser
-# parser = CogentParser(grammar_path="grammar/cogent.ebnf")
+# parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
 # with open("examples/decking_analysis.cg") as f:
 #     code = f.read()
 # print(profile_parse(parser, code))
-
+# print(profile_parse_phases(code).to_dict())
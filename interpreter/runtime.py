@@ -0,0 +1,430 @@
+"""
+Cogent Runtime
+
+Executes a module's process against registered step handlers.
+
+- A text step runs the handler registered for its text: an exact string
+  match first, then regular expressions in registration order, then the
+  default handler. Handlers are called as handler(text, scope), where scope
+  is a dict of the module inputs plus any loop or catch variables in effect.
+- `for x in items` iterates the scope value named `items`, running the body
+  with `x` bound in a copy of the scope.
+- `while "cond"` re-runs its body while the predicate registered for
+  "cond" returns true, up to `max_loop_iterations`.
+- `try [...] catch err [...]` runs the catch body with `err` bound to the
+  exception; a `try` without a catch discards the error. Results of steps
+  that completed before the error are kept.
+
+Scheduling: a ForStep annotated @parallel runs its iterations on a pool,
+and consecutive sibling steps annotated @independent run concurrently as
+a group, sharing one scope. The pool is a thread pool by default
+(`executor="process"` for a process pool, which needs picklable handlers
+and reports worker telemetry to the worker's own `default_telemetry`)
+sized by `max_workers`.
+Parallel work started from inside a pool worker runs sequentially, so
+nested loops cannot exhaust the pool. Results are always reported in
+program order.
+
+By default each module is first compiled to a flat Plan (see plan.py),
+cached by module content hash, and run by a dispatch loop; pass
+`compiled=False` to walk the step objects directly. Registering a handler
+or condition discards cached plans, since plans hold resolved handlers.
+The content hash is cached on the module, so a module edited in place
+must be passed to `invalidate` before it is run again.
+
+With a `step_cache` (see step_cache.py), text steps annotated @cache are
+memoized across runs, keyed by module content hash, step path and the
+step's inputs.
+
+With a `profiler` (a resource_profiler.ExecutionProfiler), every text
+step's handler call is timed and charged to its module and step path,
+including calls made in pool workers.
+"""
+
+import contextvars
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from .semantic_model import ProcessStep, ForStep, WhileStep, TryStep
+from .step_cache import StepCache, parse_cache_args
+from .telemetry import default_telemetry
+
+EXECUTORS = ("thread", "process")
+
+
+class CogentRuntimeError(Exception):
+    pass
+
+
+class NoHandlerError(CogentRuntimeError):
+    pass
+
+
+class LoopLimitError(CogentRuntimeError):
+    pass
+
+
+class StepResult:
+    """
+    One executed text step: its path (as in agent_api.StepRef), the loop
+    iteration indices in effect (outermost first), its text and the handler's return value.
+    """
+    __slots__ = ("path", "iteration", "text", "value")
+
+    def __init__(self, path, iteration, text, value):
+        self.path = path
+        self.iteration = iteration
+        self.text = text
+        self.value = value
+
+    def __repr__(self):
+        return f"StepResult({list(self.path)}, iteration={self.iteration}, text={self.text!r}, value={self.value!r})"
+
+
+class RunResult:
+    def __init__(self, module, results, scope):
+        self.module = module
+        self.results = results
+        self.scope = scope
+
+    @property
+    def values(self):
+        return [r.value for r in self.results]
+
+
+_worker_state = threading.local()
+
+
+class _RunState:
+    # The module being run, its name and its content hash, computed on first need.
+    __slots__ = ("module", "module_key", "name")
+
+    def __init__(self, module, module_key=None, name=None):
+        self.module = module
+        self.module_key = module_key
+        self.name = module.name if module is not None else name
+
+
+_current_run = contextvars.ContextVar("cogent_current_run", default=None)
+
+
+def _run_isolated(runtime, run, method, *args):
+    # Entry point for pool workers; nested parallel work inside runs sequentially.
+    # Returns the job's output and, from a process worker, what its profiler measured.
+    _worker_state.active = True
+    name, module_key = run
+    token = _current_run.set(_RunState(None, module_key, name))
+    try:
+        out = []
+        getattr(runtime, method)(*args, out)
+        profiler = runtime.profiler
+        return out, profiler.drain() if profiler is not None and profiler.remote else None
+    finally:
+        _current_run.reset(token)
+        _worker_state.active = False
+
+
+class Runtime:
+    def __init__(self, handlers=None, default=None, max_workers=4, executor="thread", max_loop_iterations=10000,
+                 telemetry=None, compiled=True, plan_cache_size=128, step_cache=None, profiler=None):
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor {executor!r}; expected one of {EXECUTORS}")
+        self.max_workers = max_workers
+        self.executor = executor
+        self.max_loop_iterations = max_loop_iterations
+        self.telemetry = telemetry if telemetry is not None else default_telemetry
+        self._exact = {}
+        self._patterns = []
+        self._conditions = {}
+        self.compiled = compiled
+        self.step_cache = step_cache
+        self.plan_cache_size = plan_cache_size
+        self._plans = OrderedDict()
+        self.default = default
+        self.profiler = profiler
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        for match, handler in (handlers or {}).items():
+            self.register(match, handler)
+
+    @property
+    def default(self):
+        return self._default
+
+    @default.setter
+    def default(self, handler):
+        # Plans hold the handler each step resolved to, the default included.
+        self._default = handler
+        self._plans.clear()
+
+    @property
+    def profiler(self):
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, profiler):
+        # Plans compile text steps differently under a profiler.
+        self._profiler = profiler
+        self._plans.clear()
+
+    def register(self, match, handler=None):
+        """
+        Register `handler` for step text `match` (a string for an exact match,
+        or a compiled regular expression matched against the whole text).
+        Without `handler`, returns a decorator.
+        """
+        if handler is None:
+            return lambda fn: self.register(match, fn) or fn
+        if isinstance(match, re.Pattern):
+            self._patterns.append((match, handler))
+        else:
+            self._exact[match] = handler
+        self._plans.clear()
+
+    def register_condition(self, condition, predicate):
+        """
+        Register predicate(scope) -> bool for `while "condition"` loops.
+        """
+        self._conditions[condition] = predicate
+        self._plans.clear()
+
+    def _resolve(self, text):
+        handler = self._exact.get(text)
+        if handler is not None:
+            return handler
+        for pattern, handler in self._patterns:
+            if pattern.fullmatch(text):
+                return handler
+        return self._default
+
+    def handler_for(self, text):
+        handler = self._resolve(text)
+        if handler is None:
+            raise NoHandlerError(f"No handler registered for step {text!r}")
+        return handler
+
+    def compile(self, module):
+        """
+        Return the Plan for `module`, compiling it on first use. Plans are
+        cached by module content hash, most recently used kept.
+        """
+        return self._compile(module)[1]
+
+    def invalidate(self, module):
+        """
+        Forget `module`'s cached content hash after editing it in place, so
+        its next run looks up (or compiles) the plan for its new content.
+        Step cache entries are keyed by the same hash and are missed too.
+        """
+        from .merkle import clear_hashes
+        clear_hashes(module)
+
+    def _compile(self, module):
+        from .plan import compile_process, module_hash
+        key = module_hash(module)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = compile_process(module.process, self)
+            self._plans[key] = plan
+            if len(self._plans) > self.plan_cache_size:
+                self._plans.popitem(last=False)
+        else:
+            self._plans.move_to_end(key)
+        return key, plan
+
+    def run(self, module, inputs=None, plan=None):
+        """
+        Execute `module.process` with `inputs` (a dict keyed by input name) in
+        scope. Pass a `plan` from `compile(module)` to skip the plan cache lookup.
+        """
+        scope = dict(inputs or {})
+        out = []
+        state = _RunState(module)
+        token = _current_run.set(state)
+        profiler = self.profiler
+        started = profiler.run_started(module) if profiler is not None else None
+        try:
+            with self.telemetry.span("runtime.run", {"module": module.name}):
+                if plan is None and self.compiled:
+                    state.module_key, plan = self._compile(module)
+                if plan is not None:
+                    from .plan import execute
+                    execute(plan, self, scope, out)
+                else:
+                    self._run_steps(module.process, scope, (), (), out)
+        finally:
+            _current_run.reset(token)
+            if started is not None:
+                profiler.run_finished(module, started)
+        return RunResult(module, out, scope)
+
+    def _module_key(self):
+        state = _current_run.get()
+        if state.module_key is None:
+            from .plan import module_hash
+            state.module_key = module_hash(state.module)
+        return state.module_key
+
+    def _cache_lookup(self, text, cache_args, scope, path):
+        """
+        Look a @cache step up; returns (key, ttl, hit, value), with key None
+        when the step's inputs cannot be fingerprinted.
+        """
+        ttl, names = parse_cache_args(cache_args)
+        fingerprint = StepCache.fingerprint(scope, names)
+        if fingerprint is None:
+            self.step_cache.note_uncacheable()
+            return None, ttl, False, None
+        key = StepCache.key(self._module_key(), path, text, fingerprint)
+        hit, value = self.step_cache.get(key)
+        return key, ttl, hit, value
+
+    def _call_handler(self, handler, text, annotations, scope, path):
+        profiler = self._profiler
+        if profiler is not None:
+            return profiler.measure(_current_run.get().name, path, text, self._invoke_handler,
+                                    handler, text, annotations, scope, path)
+        return self._invoke_handler(handler, text, annotations, scope, path)
+
+    def _invoke_handler(self, handler, text, annotations, scope, path):
+        if self.step_cache is None or "cache" not in annotations:
+            return handler(text, scope)
+        key, ttl, hit, value = self._cache_lookup(text, annotations["cache"], scope, path)
+        if hit:
+            return value
+        value = handler(text, scope)
+        if key is not None:
+            self.step_cache.put(key, value, ttl)
+        return value
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getstate__(self):
+        # Process-pool workers get a copy without the pool, its lock or the telemetry.
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        state["_pool_lock"] = None
+        state["telemetry"] = None
+        state["_plans"] = OrderedDict()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._pool_lock = threading.Lock()
+        self.telemetry = default_telemetry
+
+    def _get_pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                pool_class = ThreadPoolExecutor if self.executor == "thread" else ProcessPoolExecutor
+                self._pool = pool_class(max_workers=self.max_workers)
+            return self._pool
+
+    def _can_fan_out(self):
+        return self.max_workers > 1 and not getattr(_worker_state, "active", False)
+
+    def _fan_out(self, jobs):
+        """
+        Run (method name, *args) jobs on the pool; return their outputs in job order.
+        The first failure, in job order, is raised once every job has finished.
+        """
+        pool = self._get_pool()
+        module_key = self._module_key() if self.step_cache is not None else None
+        run = (_current_run.get().name, module_key)
+        futures = [pool.submit(_run_isolated, self, run, *job) for job in jobs]
+        outputs = []
+        error = None
+        for future in futures:
+            try:
+                output, profile = future.result()
+                outputs.append(output)
+                if profile is not None:
+                    self.profiler.merge(profile)
+            except Exception as e:
+                if error is None:
+                    error = e
+        if error is not None:
+            raise error
+        return outputs
+
+    def _run_steps(self, steps, scope, path, iteration, out):
+        i = 0
+        while i < len(steps):
+            step = steps[i]
+            if "independent" in step.annotations and self._can_fan_out():
+                j = i
+                while j < len(steps) and "independent" in steps[j].annotations:
+                    j += 1
+                if j - i > 1:
+                    self._run_group(steps, (i, j), scope, path, iteration, out)
+                    i = j
+                    continue
+            self._run_step(step, scope, path + (i,), iteration, out)
+            i += 1
+
+    def _run_group(self, steps, bounds, scope, path, iteration, out):
+        # Run steps[start:stop], a group of @independent siblings, concurrently when possible.
+        start, stop = bounds
+        if not self._can_fan_out():
+            for k in range(start, stop):
+                self._run_step(steps[k], scope, path + (k,), iteration, out)
+            return
+        jobs = [("_run_step", steps[k], scope, path + (k,), iteration) for k in range(start, stop)]
+        for output in self._fan_out(jobs):
+            out.extend(output)
+
+    def _run_step(self, step, scope, path, iteration, out):
+        if isinstance(step, ProcessStep):
+            self.telemetry.count("runtime.steps")
+            value = self._call_handler(self.handler_for(step.text), step.text, step.annotations, scope, path)
+            out.append(StepResult(path, iteration, step.text, value))
+        elif isinstance(step, ForStep):
+            self._run_for(step, scope, path, iteration, out)
+        elif isinstance(step, WhileStep):
+            predicate = self._conditions.get(step.condition)
+            if predicate is None:
+                raise NoHandlerError(f"No condition registered for while {step.condition!r}")
+            count = 0
+            while predicate(scope):
+                if count == self.max_loop_iterations:
+                    raise LoopLimitError(f"while {step.condition!r} exceeded {self.max_loop_iterations} iterations")
+                self._run_steps(step.steps, scope, path + ("steps",), iteration + (count,), out)
+                count += 1
+        elif isinstance(step, TryStep):
+            try:
+                self._run_steps(step.try_steps, scope, path + ("try_steps",), iteration, out)
+            except Exception as e:
+                if step.catch_steps is None:
+                    return
+                catch_scope = dict(scope)
+                if step.catch_var:
+                    catch_scope[step.catch_var] = e
+                self._run_steps(step.catch_steps, catch_scope, path + ("catch_steps",), iteration, out)
+        else:
+            raise CogentRuntimeError(f"Cannot execute {step!r}")
+
+    def _run_for(self, step, scope, path, iteration, out):
+        if step.iterable not in scope:
+            raise CogentRuntimeError(f"for {step.var} in {step.iterable}: {step.iterable!r} is not defined")
+        items = list(scope[step.iterable])
+        body_path = path + ("steps",)
+        if "parallel" in step.annotations and len(items) > 1 and self._can_fan_out():
+            jobs = [("_run_steps", step.steps, {**scope, step.var: item}, body_path, iteration + (k,))
+                    for k, item in enumerate(items)]
+            for output in self._fan_out(jobs):
+                out.extend(output)
+            return
+        for k, item in enumerate(items):
+            self._run_steps(step.steps, {**scope, step.var: item}, body_path, iteration + (k,), out)
@@ -1,42 +1,76 @@
-# Error handling step
-class TryStep:
-    def __init__(self, try_steps, catch_var=None, catch_steps=None, annotations=None):
-        self.try_steps = try_steps
-        self.catch_var = catch_var
-        self.catch_steps = catch_steps
-        self.annotations = annotations or {}
-    def __repr__(self):
-        if self.catch_var:
-            return f"Try {self.try_steps} Catch {self.catch_var}: {self.catch_steps}"
-        return f"Try {self.try_steps}"
 """
 Semantic Model
 
 Provides agent- and human-friendly representations of Cogent modules,
 emphasizing explicit goals, inputs, process, and feedback.
+
+The classes use __slots__ to keep large in-memory corpora compact:
+identifiers and type names are interned, and nodes without annotations all
+share the read-only EMPTY_ANNOTATIONS mapping instead of a fresh dict each.
+To annotate such a node, assign it a new dict.
+
+Every class also has a `_hash` slot where merkle.py caches the node's
+structural hash; it is not a model field.
 """
 
+import sys
+
+# Bump whenever the shape of these classes changes, so cached or serialized
+# models built by an older version are not reused.
+SEMANTIC_MODEL_VERSION = 3
+
+
+class _EmptyAnnotations(dict):
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("EMPTY_ANNOTATIONS is shared and read-only; assign a new dict instead")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __ior__ = _read_only
+
+    def __reduce__(self):
+        # Unpickles to the shared singleton.
+        return (_empty_annotations, ())
+
+    def __repr__(self):
+        return "{}"
+
+
+EMPTY_ANNOTATIONS = _EmptyAnnotations()
+
+
+def _empty_annotations():
+    return EMPTY_ANNOTATIONS
+
+
+def _intern(value):
+    # Tokens and other str subclasses cannot be interned directly.
+    return sys.intern(str(value)) if value is not None else None
 
 
 class CogentModule:
+    __slots__ = ("name", "goal", "inputs", "process", "context", "feedback", "imports", "types", "annotations", "_hash")
+
     def __init__(self, name, goal, inputs, process, context=None, feedback=None, imports=None, types=None, annotations=None):
-        self.name = name
+        self.name = _intern(name)
         self.goal = goal
         self.inputs = inputs
         self.process = process
         self.context = context
         self.feedback = feedback
-        self.imports = imports or []
+        self.imports = [_intern(i) for i in imports] if imports else []
         self.types = types or {}
-        self.annotations = annotations or {}
+        self.annotations = annotations or EMPTY_ANNOTATIONS
 
     def __repr__(self):
         return f"<CogentModule name={self.name} goal={self.goal} imports={self.imports} types={list(self.types.keys())}>"
 
 
 class TypeExpr:
+    __slots__ = ("name", "param", "_hash")
+
     def __init__(self, name, param=None):
-        self.name = name
+        self.name = _intern(name)
         self.param = param
     def __repr__(self):
         if self.param:
@@ -44,39 +78,87 @@ class TypeExpr:
         return self.name
 
 class EnumType:
+    __slots__ = ("name", "items", "_hash")
+
     def __init__(self, name, items):
-        self.name = name
-        self.items = items
+        self.name = _intern(name)
+        self.items = [_intern(i) for i in items]
     def __repr__(self):
         return f"Enum {self.name} {{{', '.join(self.items)}}}"
 
 class InputItem:
+    __slots__ = ("name", "type_name", "annotations", "_hash")
+
     def __init__(self, name, type_name, annotations=None):
-        self.name = name
-        self.type_name = type_name
-        self.annotations = annotations or {}
+        self.name = _intern(name)
+        self.type_name = _intern(type_name)
+        self.annotations = annotations or EMPTY_ANNOTATIONS
 
 
 class ProcessStep:
+    __slots__ = ("text", "annotations", "_hash")
+
     def __init__(self, text, annotations=None):
         self.text = text
-        self.annotations = annotations or {}
+        self.annotations = annotations or EMPTY_ANNOTATIONS
 
 class ForStep:
+    __slots__ = ("var", "iterable", "steps", "annotations", "_hash")
+
     def __init__(self, var, iterable, steps, annotations=None):
-        self.var = var
-        self.iterable = iterable
+        self.var = _intern(var)
+        self.iterable = _intern(iterable)
         self.steps = steps
-        self.annotations = annotations or {}
+        self.annotations = annotations or EMPTY_ANNOTATIONS
     def __repr__(self):
         return f"For {self.var} in {self.iterable}: {self.steps}"
 
 class WhileStep:
+    __slots__ = ("condition", "steps", "annotations", "_hash")
+
     def __init__(self, condition, steps, annotations=None):
         self.condition = condition
         self.steps = steps
-        self.annotations = annotations or {}
+        self.annotations = annotations or EMPTY_ANNOTATIONS
     def __repr__(self):
         return f"While {self.condition}: {self.steps}"
 
+# Error handling step
+class TryStep:
+    __slots__ = ("try_steps", "catch_var", "catch_steps", "annotations", "_hash")
+
+    def __init__(self, try_steps, catch_var=None, catch_steps=None, annotations=None):
+        self.try_steps = try_steps
+        self.catch_var = _intern(catch_var)
+        self.catch_steps = catch_steps
+        self.annotations = annotations or EMPTY_ANNOTATIONS
+    def __repr__(self):
+        if self.catch_var:
+            return f"Try {self.try_steps} Catch {self.catch_var}: {self.catch_steps}"
+        return f"Try {self.try_steps}"
+
 # Extendable: add provenance, versioning, agent feedback as needed
+
+
+def model_to_dict(node):
+    """
+    Convert a semantic model object (or list/dict of them) into plain dicts,
+    lists and strings. Useful for comparing models structurally and for JSON.
+    """
+    if isinstance(node, list):
+        return [model_to_dict(n) for n in node]
+    if isinstance(node, dict):
+        return {k: model_to_dict(v) for k, v in node.items()}
+    if isinstance(node, _MODEL_CLASSES):
+        # Subclasses (such as lazy store proxies) report the model class they stand in for.
+        cls = next(c for c in type(node).__mro__ if c in _MODEL_CLASSES)
+        fields = {"kind": cls.__name__}
+        fields.update((k, model_to_dict(getattr(node, k))) for k in MODEL_FIELDS[cls])
+        return fields
+    return node
+
+
+_MODEL_CLASSES = (CogentModule, TypeExpr, EnumType, InputItem, ProcessStep, ForStep, WhileStep, TryStep)
+
+# The model fields of each class, in declaration order (private slots left out).
+MODEL_FIELDS = {cls: tuple(s for s in cls.__slots__ if not s.startswith("_")) for cls in _MODEL_CLASSES}
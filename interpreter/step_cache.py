@@ -0,0 +1,303 @@
+"""
+Step Result Cache
+
+Memoizes the results of text steps annotated @cache, so re-running a module
+with unchanged inputs skips them. Entries are keyed by the module's content
+hash, the step path and text, and a fingerprint of the scope values the
+step can see:
+
+    @cache                    never expires; fingerprint the whole scope
+    @cache(300)               expires 300 seconds after it was stored
+    @cache(300, item, budget) fingerprint only `item` and `budget`
+    @cache(item)              no expiry; fingerprint only `item`
+
+Values are pickled on the way in and unpickled on every hit, so callers get
+fresh objects. A step whose value or inputs cannot be pickled simply runs
+uncached. Two backends share one interface: MemoryBackend (an LRU bounded
+by entry count) and DiskBackend (files bounded by total size, least
+recently used evicted first). Hits, misses, expirations, evictions and
+uncacheable steps are counted on the cache and reported to Telemetry as
+`step_cache.*` counters.
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import struct
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from .agent_api import _annotation_value
+from .telemetry import default_telemetry
+
+NO_EXPIRY = float("inf")
+
+_EXPIRES = struct.Struct("<d")
+
+# A TTL is a plain positive decimal; anything else (inf, nan, 1e3, -5) is a scope name.
+_TTL = re.compile(r"\d+(\.\d*)?|\.\d+")
+
+
+def parse_cache_args(args):
+    """
+    Split @cache arguments into (ttl seconds or None, tuple of scope names or None).
+    Quoted arguments count as unquoted: @cache("300") is a TTL, like @cache(300).
+    Only a positive decimal literal is a TTL, so @cache(inf) fingerprints a scope name `inf`.
+    """
+    if args is True or not args:
+        return None, None
+    args = [_annotation_value(args)] if isinstance(args, str) else [_annotation_value(a) for a in args]
+    ttl = None
+    if _TTL.fullmatch(args[0]) and float(args[0]) > 0:
+        ttl = float(args[0])
+        args = args[1:]
+    return ttl, tuple(args) or None
+
+
+def _canonical(value):
+    # Set iteration order follows string hashes, which vary between processes;
+    # sort set members (and dict items) so equal scopes pickle to the same bytes.
+    kind = type(value)
+    if kind in (set, frozenset):
+        return (kind.__name__, sorted((_canonical(v) for v in value), key=_pickled))
+    if kind is dict:
+        return ("dict", sorted(((_canonical(k), _canonical(v)) for k, v in value.items()), key=_pickled))
+    if kind in (list, tuple):
+        return (kind.__name__, [_canonical(v) for v in value])
+    return value
+
+
+def _pickled(value):
+    return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class MemoryBackend:
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, expires_at, data):
+        with self._lock:
+            self._entries[key] = (expires_at, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+class DiskBackend:
+    """
+    One file per entry (`<key>.step`: expiry timestamp then pickled value).
+    Evicts least recently used files once the total passes `max_bytes`.
+    """
+    def __init__(self, directory, max_bytes=64 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._bytes = sum(p.stat().st_size for p in self.directory.glob("*.step"))
+
+    def _path(self, key):
+        return self.directory / f"{key}.step"
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            raw = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return _EXPIRES.unpack_from(raw)[0], raw[_EXPIRES.size:]
+
+    def put(self, key, expires_at, data):
+        path = self._path(key)
+        raw = _EXPIRES.pack(expires_at) + data
+        tmp = path.with_suffix(f".tmp{os.getpid()}.{threading.get_ident()}")
+        tmp.write_bytes(raw)
+        try:
+            previous = path.stat().st_size
+        except FileNotFoundError:
+            previous = 0
+        os.replace(tmp, path)
+        with self._lock:
+            self._bytes += len(raw) - previous
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def delete(self, key):
+        path = self._path(key)
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            return
+        with self._lock:
+            self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            for path in self.directory.glob("*.step"):
+                path.unlink(missing_ok=True)
+            self._bytes = 0
+
+    def __len__(self):
+        return sum(1 for _ in self.directory.glob("*.step"))
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _evict(self):
+        entries = []
+        for path in self.directory.glob("*.step"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        # Evict down to 90% of the bound so a full cache does not rescan on every write.
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.evictions += 1
+        self._bytes = total
+
+
+class StepCache:
+    def __init__(self, backend=None, telemetry=None, clock=time.time):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.telemetry = telemetry if telemetry is not None else default_telemetry
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.uncacheable = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(scope, names=None):
+        """
+        Hash of the scope values a step depends on (all of them when `names`
+        is None), or None if they cannot be pickled. Sets and dicts are
+        canonicalized first, so the hash is the same in every process.
+        """
+        if names is None:
+            names = sorted(scope)
+        try:
+            data = _pickled([(name, _canonical(scope.get(name))) for name in names])
+        except Exception:
+            return None
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def key(module_key, path, text, fingerprint):
+        digest = hashlib.sha256()
+        for part in (module_key, repr(path), text, fingerprint):
+            digest.update(str(part).encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+        self.telemetry.count(f"step_cache.{name}")
+
+    def get(self, key):
+        """
+        Return (True, value) for a live entry, else (False, None).
+        """
+        entry = self.backend.get(key)
+        if entry is not None:
+            expires_at, data = entry
+            if expires_at > self.clock():
+                self._count("hits")
+                return True, pickle.loads(data)
+            self.backend.delete(key)
+            self._count("expired")
+        self._count("misses")
+        return False, None
+
+    def put(self, key, value, ttl=None):
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            self._count("uncacheable")
+            return False
+        expires_at = NO_EXPIRY if ttl is None else self.clock() + ttl
+        self.backend.put(key, expires_at, data)
+        return True
+
+    def note_uncacheable(self):
+        self._count("uncacheable")
+
+    def clear(self):
+        self.backend.clear()
+
+    def __getstate__(self):
+        # Process-pool workers get a copy reporting to their own default telemetry;
+        # only a DiskBackend shares entries with the parent.
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["telemetry"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self.telemetry = default_telemetry
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "uncacheable": self.uncacheable,
+            "evictions": self.backend.evictions,
+            "entries": len(self.backend),
+        }
@@ -0,0 +1,85 @@
+"""
+Streaming Parser
+
+Yields CogentModule objects one at a time from a file or text stream,
+reading it in fixed-size chunks. A module is parsed as soon as its closing
+brace has been read, so peak memory is bounded by the largest module (plus
+one chunk) rather than by the size of the source.
+"""
+
+import io
+import re
+from pathlib import Path
+
+from lark.exceptions import UnexpectedInput
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Only quotes, braces and newlines (which end an unterminated string) matter for splitting.
+_SIGNIFICANT = re.compile(r'[{}"\n]')
+
+
+def _read_chunks(source, chunk_size):
+    if isinstance(source, (str, Path)):
+        with open(source, "r") as f:
+            yield from iter(lambda: f.read(chunk_size), "")
+        return
+    if isinstance(source, (io.RawIOBase, io.BufferedIOBase)):
+        source = io.TextIOWrapper(source, encoding="utf-8")
+    yield from iter(lambda: source.read(chunk_size), "")
+
+
+def iter_module_sources(chunks):
+    """
+    Split a stream of text chunks into per-module source strings. Each string
+    holds one top-level module with any annotations and whitespace before it;
+    trailing text after the last module, if not blank, is yielded as-is.
+    """
+    pending = []
+    depth = 0
+    in_string = False
+    for chunk in chunks:
+        start = 0
+        for match in _SIGNIFICANT.finditer(chunk):
+            char = match.group()
+            pos = match.start()
+            if in_string:
+                if char == '"' or char == "\n":
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+                if depth == 0:
+                    pending.append(chunk[start:pos + 1])
+                    yield "".join(pending)
+                    pending = []
+                    start = pos + 1
+        pending.append(chunk[start:])
+    rest = "".join(pending)
+    if rest.strip():
+        yield rest
+
+
+def iter_modules(parser, source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Parse `source` (a path, or a text or binary stream) module by module,
+    yielding each CogentModule as soon as it is complete. Syntax errors are
+    raised with `line` adjusted to be relative to the whole source (for an
+    unexpected end of input, the last line of the unfinished module).
+    """
+    line_offset = 0
+    for module_source in iter_module_sources(_read_chunks(source, chunk_size)):
+        try:
+            tree = parser.parse_string(module_source, as_semantic_model=True)
+        except UnexpectedInput as e:
+            if e.line > 0:
+                e.line += line_offset
+            else:
+                # UnexpectedEOF carries no position: report the module's last line.
+                e.line = line_offset + module_source.rstrip().count("\n") + 1
+            raise
+        yield from tree.children
+        line_offset += module_source.count("\n")
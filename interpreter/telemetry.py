@@ -1,16 +1,227 @@
 """
 Telemetry & Traceability
 
-Stub for logging actions, resource usage, and agent/human feedback.
+Structured, low-overhead logging of actions, resource usage, and agent/human feedback.
 Core to Cogent's goal of traceable, transparent execution and evolution.
+
+Events, span begin/end markers and counters carry monotonic nanosecond
+timestamps. Events go into a fixed-capacity ring buffer whose timestamp,
+kind and span columns are preallocated arrays; when it fills it is flushed
+to the attached sinks in one batch (or, with no sinks, the oldest events
+are overwritten and counted as dropped). Batches reach sinks one at a
+time and in order; the buffer lock is reentrant, so a sink may itself
+record telemetry. Every recording call returns immediately when telemetry
+is disabled.
+
+The parser and transformer report to `default_telemetry`, which starts
+disabled; call `default_telemetry.enable()` and attach sinks to collect.
 """
 
+import itertools
+import json
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+
+EVENT = 0
+SPAN_BEGIN = 1
+SPAN_END = 2
+KIND_NAMES = ("event", "begin", "end")
+
+
 class Telemetry:
-    def __init__(self):
-        self.events = []
+    def __init__(self, capacity=4096, sinks=None, enabled=True):
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self.sinks = list(sinks or [])
+        self.enabled = enabled
+        self.counters = {}
+        self.dropped = 0
+        self._timestamps = array("q", bytes(8 * capacity))
+        self._kinds = array("B", bytes(capacity))
+        self._span_ids = array("q", bytes(8 * capacity))
+        self._names = [None] * capacity
+        self._details = [None] * capacity
+        self._start = 0
+        self._size = 0
+        self._span_counter = itertools.count(1)
+        # Held while batches are written to sinks, so they arrive in order and never concurrently.
+        self._lock = threading.RLock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
 
-    def log_event(self, event_type, details):
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+
+    def log_event(self, event_type, details=None):
         """
         Log an event for traceability and future feedback loops.
         """
-        self.events.append((event_type, details))
+        if not self.enabled:
+            return
+        self._record(EVENT, event_type, 0, details)
+
+    def begin_span(self, name, details=None):
+        """
+        Open a span and return its id, to be passed to `end_span`.
+        """
+        if not self.enabled:
+            return 0
+        span_id = next(self._span_counter)
+        self._record(SPAN_BEGIN, name, span_id, details)
+        return span_id
+
+    def end_span(self, span_id, name=None, details=None):
+        if not self.enabled or not span_id:
+            return
+        self._record(SPAN_END, name, span_id, details)
+
+    @contextmanager
+    def span(self, name, details=None):
+        span_id = self.begin_span(name, details)
+        try:
+            yield span_id
+        finally:
+            self.end_span(span_id, name)
+
+    def count(self, name, value=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    @property
+    def events(self):
+        """
+        Buffered (not yet flushed) events as (event_type, details) tuples.
+        """
+        return [(r["name"], r["details"]) for r in self.snapshot() if r["kind"] == "event"]
+
+    def snapshot(self):
+        """
+        Buffered records as dicts, oldest first, without flushing them.
+        """
+        with self._lock:
+            return self._records()
+
+    def flush(self):
+        """
+        Send all buffered records, and the current counters, to every sink in one batch.
+        """
+        with self._lock:
+            records = self._drain()
+            self._deliver(records)
+        return records
+
+    def close(self):
+        self.flush()
+        for sink in self.sinks:
+            sink.close()
+
+    def _record(self, kind, name, span_id, details):
+        with self._lock:
+            if self._size == self.capacity:
+                if self.sinks:
+                    self._deliver(self._drain())
+                else:
+                    self._start = (self._start + 1) % self.capacity
+                    self._size -= 1
+                    self.dropped += 1
+            slot = (self._start + self._size) % self.capacity
+            self._timestamps[slot] = time.perf_counter_ns()
+            self._kinds[slot] = kind
+            self._span_ids[slot] = span_id
+            self._names[slot] = name
+            self._details[slot] = details
+            self._size += 1
+
+    def _deliver(self, records):
+        # Called with the lock held.
+        counters = dict(self.counters)
+        for sink in self.sinks:
+            sink.write(records, counters)
+
+    def _records(self):
+        records = []
+        for i in range(self._size):
+            slot = (self._start + i) % self.capacity
+            records.append({
+                "ts_ns": self._timestamps[slot],
+                "kind": KIND_NAMES[self._kinds[slot]],
+                "name": self._names[slot],
+                "span": self._span_ids[slot],
+                "details": self._details[slot],
+            })
+        return records
+
+    def _drain(self):
+        # Buffered records, emptying the buffer; slots drop their references so details can be freed.
+        records = self._records()
+        for i in range(self._size):
+            slot = (self._start + i) % self.capacity
+            self._names[slot] = None
+            self._details[slot] = None
+        self._start = 0
+        self._size = 0
+        return records
+
+
+class JsonlSink:
+    """
+    Appends each record as one JSON line; counters are written as a "counters" record per batch.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, records, counters):
+        lines = [json.dumps(r, default=str) for r in records]
+        if counters:
+            lines.append(json.dumps({"kind": "counters", "counters": counters}))
+        if lines:
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class AggregatingSink:
+    """
+    In-memory aggregator: event counts by name, and span count/total/max
+    duration (nanoseconds) by name. Spans may straddle flush batches.
+    """
+    def __init__(self):
+        self.event_counts = {}
+        self.spans = {}
+        self.counters = {}
+        self._open = {}
+
+    def write(self, records, counters):
+        for r in records:
+            if r["kind"] == "event":
+                self.event_counts[r["name"]] = self.event_counts.get(r["name"], 0) + 1
+            elif r["kind"] == "begin":
+                self._open[r["span"]] = (r["name"], r["ts_ns"])
+            else:
+                name, began = self._open.pop(r["span"], (r["name"], None))
+                if began is None:
+                    continue
+                duration = r["ts_ns"] - began
+                stats = self.spans.setdefault(name, {"count": 0, "total_ns": 0, "max_ns": 0})
+                stats["count"] += 1
+                stats["total_ns"] += duration
+                stats["max_ns"] = max(stats["max_ns"], duration)
+        self.counters = counters
+
+    def close(self):
+        pass
+
+
+default_telemetry = Telemetry(enabled=False)
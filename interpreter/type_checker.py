@@ -0,0 +1,274 @@
+"""
+Static Type Checker
+
+Resolves every input type and type declaration in a batch of modules and
+reports what does not check:
+
+- unknown types (including generic parameters, as in `List<Materal>`),
+- wrong type arity (`List` without a parameter, `Int<String>`),
+- cyclic type aliases,
+- duplicate enum members,
+- types declared in more than one imported module (ambiguous),
+- declarations nothing uses, directly or through other used declarations.
+
+A name is looked up in the module's own declarations, then in the modules
+it imports (those in the batch), then among BUILTIN_TYPES. Aliases are
+transparent: `type Price = Float` resolves to Float. Enums are nominal, so
+`Color` declared in two modules gives two distinct types.
+
+Resolved types live in a TypeTable that hash-conses them: each distinct
+type (`List<Mod.Color>`, say) is stored once and compared by identity.
+TYPE_TABLE is the process-wide table used by default. Within one check,
+each (module, type string) pair and each declaration is resolved once and
+memoized, so checking a batch is linear in its size.
+"""
+
+import threading
+
+from .semantic_model import TypeExpr, EnumType
+
+# Builtin type names and how many type parameters each takes.
+BUILTIN_TYPES = {
+    "String": 0, "Int": 0, "Float": 0, "Bool": 0, "Any": 0,
+    "List": 1, "Set": 1, "Optional": 1,
+}
+
+
+class Type:
+    """
+    A resolved type. `module` is the declaring module for enums and None for
+    builtins; `params` holds resolved parameter types. Instances are made
+    only by TypeTable, so equal types are the same object.
+    """
+    __slots__ = ("id", "name", "module", "params")
+
+    def __init__(self, id, name, module, params):
+        self.id = id
+        self.name = name
+        self.module = module
+        self.params = params
+
+    def __repr__(self):
+        name = f"{self.module}.{self.name}" if self.module else self.name
+        if self.params:
+            return f"{name}<{', '.join(map(repr, self.params))}>"
+        return name
+
+
+class TypeTable:
+    def __init__(self):
+        self._types = {}
+        self._lock = threading.Lock()
+
+    def intern(self, name, module=None, params=()):
+        key = (name, module, tuple(p.id for p in params))
+        t = self._types.get(key)
+        if t is None:
+            with self._lock:
+                t = self._types.get(key)
+                if t is None:
+                    t = self._types[key] = Type(len(self._types), name, module, tuple(params))
+        return t
+
+    def __len__(self):
+        return len(self._types)
+
+    def __iter__(self):
+        return iter(self._types.values())
+
+
+TYPE_TABLE = TypeTable()
+
+
+class Diagnostic:
+    __slots__ = ("code", "module", "subject", "message")
+
+    def __init__(self, code, module, subject, message):
+        self.code = code
+        self.module = module
+        self.subject = subject
+        self.message = message
+
+    def __repr__(self):
+        return f"{self.module}: {self.subject}: {self.message} [{self.code}]"
+
+
+class TypeCheckResult:
+    def __init__(self, diagnostics, input_types):
+        self.diagnostics = diagnostics
+        # (module name, input name) -> Type, or None when it did not resolve
+        self.input_types = input_types
+
+    @property
+    def ok(self):
+        return not self.diagnostics
+
+    def by_code(self, code):
+        return [d for d in self.diagnostics if d.code == code]
+
+
+def parse_type_name(text):
+    """
+    Parse a flattened input type such as `List<Material>` into a TypeExpr.
+    """
+    text = text.strip()
+    if text.endswith(">") and "<" in text:
+        i = text.index("<")
+        return TypeExpr(text[:i].strip(), parse_type_name(text[i + 1:-1]))
+    return TypeExpr(text)
+
+
+class _Problem:
+    __slots__ = ("code", "message")
+
+    def __init__(self, code, message):
+        self.code = code
+        self.message = message
+
+
+class _Check:
+    # State for one batch; see TypeChecker.check.
+    def __init__(self, modules, table):
+        self.table = table
+        self.modules = {}
+        for module in modules:
+            self.modules.setdefault(module.name, module)
+        self.diagnostics = []
+        self._names = {}      # (module, name) -> ("decl", module) | ("builtin", None), or a _Problem
+        self._aliases = {}    # (module, name) -> Type, or None while resolving
+        self._exprs = {}      # (module, type string) -> (Type or None, [_Problem], referenced decls)
+        self._refs = {}       # declaration (module, name) -> declarations its body references
+
+    def report(self, code, module, subject, message):
+        self.diagnostics.append(Diagnostic(code, module, subject, message))
+
+    def lookup(self, module_name, name):
+        key = (module_name, name)
+        found = self._names.get(key)
+        if found is None:
+            found = self._names[key] = self._lookup(module_name, name)
+        return found
+
+    def _lookup(self, module_name, name):
+        module = self.modules[module_name]
+        if name in module.types:
+            return ("decl", module_name)
+        owners = [i for i in dict.fromkeys(module.imports) if i in self.modules and name in self.modules[i].types]
+        if len(owners) > 1:
+            return _Problem("ambiguous-type", f"type {name!r} is declared in several imports: {', '.join(owners)}")
+        if owners:
+            return ("decl", owners[0])
+        if name in BUILTIN_TYPES:
+            return ("builtin", None)
+        return _Problem("unknown-type", f"unknown type {name!r}")
+
+    def resolve(self, expr, module_name, problems, refs):
+        """
+        Resolve a TypeExpr in `module_name`'s scope. Problems are appended
+        rather than raised, so every unknown parameter is reported.
+        """
+        found = self.lookup(module_name, expr.name)
+        if isinstance(found, _Problem):
+            problems.append(found)
+            if expr.param is not None:
+                self.resolve(expr.param, module_name, problems, refs)
+            return None
+        kind, owner = found
+        if kind == "builtin":
+            arity = BUILTIN_TYPES[expr.name]
+            param = None if expr.param is None else self.resolve(expr.param, module_name, problems, refs)
+            if arity and expr.param is None:
+                problems.append(_Problem("type-arity", f"{expr.name} needs a type parameter"))
+                return None
+            if not arity and expr.param is not None:
+                problems.append(_Problem("type-arity", f"{expr.name} takes no type parameter"))
+                return None
+            if param is None and arity:
+                return None
+            return self.table.intern(expr.name, None, (param,) if arity else ())
+        refs.append((owner, expr.name))
+        if expr.param is not None:
+            self.resolve(expr.param, module_name, problems, refs)
+            problems.append(_Problem("type-arity", f"{expr.name} takes no type parameter"))
+            return None
+        return self.declaration(owner, expr.name, problems)
+
+    def declaration(self, module_name, name, problems):
+        key = (module_name, name)
+        if key in self._aliases:
+            t = self._aliases[key]
+            if t is None and key not in self._refs:
+                problems.append(_Problem("cyclic-alias", f"type alias {name!r} is part of a cycle"))
+            return t
+        decl = self.modules[module_name].types[name]
+        if isinstance(decl, EnumType):
+            t = self._aliases[key] = self.table.intern(name, module_name)
+            self._refs[key] = ()
+            return t
+        self._aliases[key] = None
+        refs = []
+        own = []
+        t = self.resolve(decl, module_name, own, refs)
+        self._aliases[key] = t
+        self._refs[key] = refs
+        for p in own:
+            self.report(p.code, module_name, f"type {name}", p.message)
+        return t
+
+    def input_type(self, module_name, type_name):
+        key = (module_name, type_name)
+        entry = self._exprs.get(key)
+        if entry is None:
+            problems, refs = [], []
+            t = self.resolve(parse_type_name(type_name), module_name, problems, refs)
+            entry = self._exprs[key] = (t, problems, refs)
+        return entry
+
+    def run(self):
+        input_types = {}
+        roots = []
+        for module_name, module in self.modules.items():
+            for decl in module.types.values():
+                if isinstance(decl, EnumType):
+                    seen = set()
+                    for item in decl.items:
+                        if item in seen:
+                            self.report("duplicate-enum-member", module_name, f"enum {decl.name}",
+                                        f"member {item!r} is declared more than once")
+                        seen.add(item)
+            for name in module.types:
+                self.declaration(module_name, name, [])
+            for item in module.inputs or ():
+                t, problems, refs = self.input_type(module_name, item.type_name)
+                input_types[(module_name, item.name)] = t
+                roots.extend(refs)
+                for p in problems:
+                    self.report(p.code, module_name, f"input {item.name}", p.message)
+        used = set()
+        while roots:
+            key = roots.pop()
+            if key not in used:
+                used.add(key)
+                roots.extend(self._refs.get(key, ()))
+        for module_name, module in self.modules.items():
+            for name, decl in module.types.items():
+                if (module_name, name) not in used:
+                    kind = "enum" if isinstance(decl, EnumType) else "type"
+                    self.report("unused-declaration", module_name, f"{kind} {name}", f"{kind} {name!r} is never used")
+        return TypeCheckResult(self.diagnostics, input_types)
+
+
+class TypeChecker:
+    def __init__(self, table=None):
+        self.table = table if table is not None else TYPE_TABLE
+
+    def check(self, modules):
+        """
+        Type-check a batch of CogentModules together; imports resolve
+        against modules in the same batch. Returns a TypeCheckResult.
+        """
+        return _Check(modules, self.table).run()
+
+
+def check_modules(modules, table=None):
+    return TypeChecker(table).check(modules)
@@ -0,0 +1,19 @@
+import os
+
+import pytest
+
+@pytest.fixture(autouse=True, scope="session")
+def _grammar_cache_dir(tmp_path_factory):
+    # Compiled grammar tables go to a temporary directory, not ~/.cache/cogent.
+    previous = os.environ.get("COGENT_CACHE_DIR")
+    os.environ["COGENT_CACHE_DIR"] = str(tmp_path_factory.mktemp("grammar-cache"))
+    yield
+    if previous is None:
+        del os.environ["COGENT_CACHE_DIR"]
+    else:
+        os.environ["COGENT_CACHE_DIR"] = previous
+
+@pytest.fixture(params=[True, False], ids=["compiled", "tree"])
+def compiled(request):
+    # Runs a runtime test with compiled plans and with tree-walking.
+    return request.param
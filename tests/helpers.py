@@ -0,0 +1,8 @@
+from interpreter.parser import CogentParser
+
+def parse_module(source):
+    """
+    The first module of `source`, as a semantic model.
+    """
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
+    return parser.parse_string(source, as_semantic_model=True).children[0]
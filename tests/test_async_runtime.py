@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from interpreter.async_runtime import AsyncRuntime
+from tests.helpers import parse_module
+
+WIDE = '''module Wide { goal: "g" inputs: [items: List<Int>]
+    process: [@concurrency(3) for item in items: ["Fetch"], "Done"] }'''
+
+def test_concurrency_annotation_bounds_in_flight_handlers():
+    active, peak = [0], [0]
+
+    async def fetch(text, scope):
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        await asyncio.sleep(0.005)
+        active[0] -= 1
+        return scope["item"]
+
+    runtime = AsyncRuntime(handlers={"Fetch": fetch, "Done": lambda text, scope: "done"})
+    result = runtime.run_sync(parse_module(WIDE), {"items": list(range(10))})
+    assert result.values == list(range(10)) + ["done"]
+    assert peak[0] == 3
+
+def test_while_try_and_timeout_semantics():
+    module = parse_module('''module Flow { goal: "g" inputs: []
+        process: [
+            while "more": ["Tick"],
+            try [@timeout(0.01) "Slow"] catch err ["Recover"]
+        ] }''')
+
+    async def slow(text, scope):
+        await asyncio.sleep(1)
+
+    async def more(scope):
+        return scope.setdefault("n", 0) < 2
+
+    def tick(text, scope):
+        scope["n"] += 1
+        return scope["n"]
+
+    runtime = AsyncRuntime(handlers={"Tick": tick, "Slow": slow,
+                                     "Recover": lambda text, scope: type(scope["err"]).__name__})
+    runtime.register_condition("more", more)
+    assert runtime.run_sync(module).values == [1, 2, "TimeoutError"]
+
+def test_failure_cancels_sibling_iterations():
+    cancelled = []
+
+    async def fetch(text, scope):
+        if scope["item"] == 0:
+            await asyncio.sleep(0.001)
+            raise ValueError("bad item")
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(scope["item"])
+            raise
+
+    runtime = AsyncRuntime(handlers={"Fetch": fetch})
+    with pytest.raises(ValueError):
+        runtime.run_sync(parse_module(WIDE), {"items": list(range(10))})
+    assert sorted(cancelled) == [1, 2]
+
+def test_run_timeout_cancels_everything():
+    cancelled = []
+
+    async def fetch(text, scope):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(scope["item"])
+            raise
+
+    runtime = AsyncRuntime(handlers={"Fetch": fetch})
+    with pytest.raises(TimeoutError):
+        runtime.run_sync(parse_module(WIDE), {"items": list(range(10))}, timeout=0.02)
+    assert len(cancelled) == 3
+
+def test_step_timeout_is_the_builtin_timeout_error_before_python_311(monkeypatch):
+    # Before 3.11, asyncio.wait_for raises asyncio.TimeoutError, a separate class.
+    class AsyncioTimeoutError(Exception):
+        pass
+
+    async def wait_for(aw, timeout):
+        if timeout is None:
+            return await aw
+        aw.close()
+        raise AsyncioTimeoutError()
+
+    monkeypatch.setattr(asyncio, "TimeoutError", AsyncioTimeoutError)
+    monkeypatch.setattr(asyncio, "wait_for", wait_for)
+    module = parse_module('module T { goal: "g" inputs: [] process: [try [@timeout(1) "Slow"] catch err ["Recover"]] }')
+    runtime = AsyncRuntime(default=lambda text, scope: type(scope["err"]).__name__ if "err" in scope else text)
+    assert runtime.run_sync(module).values == ["TimeoutError"]
+    with pytest.raises(TimeoutError):
+        runtime.run_sync(parse_module('module U { goal: "g" inputs: [] process: ["Slow"] }'), timeout=1)
@@ -0,0 +1,29 @@
+from benchmarks.corpus import CorpusSpec, generate
+from benchmarks.suite import compare, run_scenario
+from interpreter.parser import CogentParser
+from interpreter.semantic_model import ForStep, WhileStep, TryStep
+
+def _depth(steps):
+    nested = [s for s in steps if isinstance(s, (ForStep, WhileStep, TryStep))]
+    if not nested:
+        return 0
+    inner = [s.steps if not isinstance(s, TryStep) else s.try_steps for s in nested]
+    return 1 + max(_depth(i) for i in inner)
+
+def test_corpus_is_deterministic_and_scales():
+    spec = CorpusSpec(modules=4, steps=3, depth=3, types=2, enums=1, seed=7)
+    assert generate(spec) == generate(spec)
+    modules = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf").parse_string(generate(spec), as_semantic_model=True).children
+    assert len(modules) == 4
+    assert len(modules[0].types) == 3
+    assert _depth(modules[0].process) == 3
+    assert modules[1].imports == ["Gen0"]
+
+def test_compare_flags_regressions_past_threshold():
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
+    current = {"scenarios": {"tiny": run_scenario(parser, CorpusSpec(modules=2), trials=2, warmup=1)}}
+    slower = {"scenarios": {"tiny": dict(current["scenarios"]["tiny"])}}
+    assert compare(current, current) == []
+    slower["scenarios"]["tiny"]["median_sec"] = current["scenarios"]["tiny"]["median_sec"] / 2
+    regressions = compare(current, slower, threshold=0.1)
+    assert any(r.startswith("tiny.median_sec") for r in regressions)
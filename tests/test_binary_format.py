@@ -0,0 +1,83 @@
+import pickle
+
+import pytest
+
+from interpreter.parser import CogentParser
+from interpreter.binary_format import encode_modules, decode_modules, ModuleReader, LazyModule
+from interpreter.semantic_model import CogentModule, model_to_dict
+
+SOURCE = '''
+@owner(team) @critical
+module Alpha {
+    import Beta
+    type Bag = List<Map<Item>>
+    enum Color { Red, Green }
+    goal: "Round trip everything"
+    inputs: [@required items: List<Int>, budget: Float]
+    context: "Some context"
+    process: [
+        @parallel for item in items: ["Check item", "Check item"],
+        while "pending": [@retry(twice, slowly) "Retry"],
+        try ["Risky"] catch err ["Recover", "Check item"],
+        try ["Bare"]
+    ]
+    feedback: "Done"
+}
+module Beta {
+    goal: "Second"
+    inputs: []
+    process: ["Check item"]
+}
+'''
+
+@pytest.fixture(scope="module")
+def modules():
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
+    return parser.parse_string(SOURCE, as_semantic_model=True).children
+
+def test_round_trip_matches_model(modules):
+    data = encode_modules(modules)
+    assert model_to_dict(decode_modules(data)) == model_to_dict(modules)
+    assert model_to_dict(decode_modules(data, lazy=True)) == model_to_dict(modules)
+
+def test_strings_are_deduplicated(modules):
+    data = encode_modules(modules)
+    assert data.count(b"Check item") == 1
+
+def test_reader_is_zero_copy_and_lazy(modules):
+    buffer = bytearray(encode_modules(modules))
+    reader = ModuleReader(buffer)
+    assert reader.names() == ["Alpha", "Beta"]
+    assert reader.view.obj is buffer
+    alpha = reader.module(0)
+    assert isinstance(alpha, LazyModule) and not alpha.is_loaded("process")
+    assert alpha.inputs[0].annotations == {"required": True}
+    assert alpha.process[1].steps[0].annotations == {"retry": ["twice", "slowly"]}
+    assert alpha.is_loaded("process") and type(alpha.process) is list and len(alpha.process) == 4
+
+def test_lazy_process_behaves_as_a_list_from_first_use(modules):
+    data = encode_modules(modules)
+    assert len(["x"] + ModuleReader(data).module(0).process) == 5
+    assert len(sorted(ModuleReader(data).module(0).process, key=repr)) == 4
+    extended = []
+    extended.extend(ModuleReader(data).module(0).process)
+    assert len(extended) == 4
+
+def test_lazy_module_pickles_as_plain_module(modules):
+    alpha = ModuleReader(encode_modules(modules)).module(0)
+    restored = pickle.loads(pickle.dumps(alpha))
+    assert type(restored) is CogentModule and type(restored.process) is list
+    assert model_to_dict(restored) == model_to_dict(modules[0])
+
+def test_rejects_foreign_or_future_buffers(modules):
+    data = bytearray(encode_modules(modules))
+    with pytest.raises(ValueError):
+        ModuleReader(b"XXXX" + bytes(data[4:]))
+    data[4] = 99
+    with pytest.raises(ValueError):
+        ModuleReader(data)
+
+def test_shared_annotation_sets_decode_independently(modules):
+    twin = decode_modules(encode_modules(modules + modules))
+    twin[0].process[1].steps[0].annotations["retry"].append("again")
+    assert twin[2].process[1].steps[0].annotations == {"retry": ["twice", "slowly"]}
@@ -0,0 +1,67 @@
+from interpreter.parser import CogentParser
+from interpreter.agent_api import CollectionAgentAPI
+
+SOURCE = '''
+@owner(research)
+module Mixer {
+    import Supplier
+    enum Grade { Raw, Refined }
+    goal: "Blend materials"
+    inputs: [batch: List<Material>, budget: Float]
+    process: [
+        @cost("high") "Weigh each material",
+        for m in batch: [@cost(low) "Blend material into mix"],
+        try ["Heat mix"] catch err [@cost("high") "Cool the mix"],
+        while "mix is lumpy": ["Stir"]
+    ]
+}
+module Supplier {
+    enum Grade { Raw, Premium }
+    goal: "Deliver materials"
+    inputs: [orders: Map<Material>]
+    process: ["Ship material"]
+}
+'''
+
+def make_api():
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
+    return CollectionAgentAPI(parser.parse_string(SOURCE, as_semantic_model=True).children)
+
+def test_type_import_and_enum_queries():
+    api = make_api()
+    assert api.modules_with_input_type("List<Material>") == ["Mixer"]
+    assert api.modules_using_type("Material") == ["Mixer", "Supplier"]
+    assert api.modules_importing("Supplier") == ["Mixer"]
+    assert api.enums_with_member("Raw") == [("Mixer", "Grade"), ("Supplier", "Grade")]
+    assert api.modules_annotated("owner", "research") == ["Mixer"]
+    assert api.get_goal("Supplier") == "Deliver materials"
+
+def test_step_annotation_and_text_queries():
+    api = make_api()
+    costly = api.steps_annotated("cost")
+    assert [r.path for r in costly] == [(0,), (1, "steps", 0), (2, "catch_steps", 0)]
+    assert [r.step.text for r in api.steps_annotated("cost", "high")] == ["Weigh each material", "Cool the mix"]
+    assert {(r.module, r.path) for r in api.steps_containing("material")} == {("Mixer", (0,)), ("Mixer", (1, "steps", 0)), ("Supplier", (0,))}
+    assert [r.path for r in api.steps_containing("MIX", "heat")] == [(2, "try_steps", 0)]
+    assert [r.path for r in api.steps_containing("lumpy")] == [(3,)]
+    assert api.steps_containing("absent") == []
+
+def test_incremental_add_and_remove():
+    api = make_api()
+    supplier = api.module("Supplier")
+    api.remove("Supplier")
+    assert api.modules_using_type("Material") == ["Mixer"]
+    assert api.enums_with_member("Premium") == []
+    assert "Supplier" not in api
+    api.add(supplier)
+    api.add(supplier)  # re-adding replaces rather than duplicating
+    assert api.enums_with_member("Premium") == [("Supplier", "Grade")]
+    assert len(api.steps_containing("ship")) == 1 and len(api) == 2
+
+def test_readd_with_repeated_keys():
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
+    source = 'module Dup { enum E { A, A } goal: "g" inputs: [] process: ["Mix mix"] }'
+    api = CollectionAgentAPI(parser.parse_string(source, as_semantic_model=True).children)
+    api.add(api.module("Dup"))
+    assert api.enums_with_member("A") == [("Dup", "E")]
+    assert len(api.steps_containing("mix")) == 1
@@ -0,0 +1,122 @@
+import socket
+import threading
+
+import pytest
+
+from interpreter.cli import main
+from interpreter.daemon import DaemonClient, DaemonError, ParseDaemon, read_frame, write_frame
+
+SOURCE = '''
+module Deck {
+    enum Material { Wood, Composite, Wood }
+    goal: "Pick decking"
+    inputs: [material: Material, budget: Floatt]
+    process: [@owner(agent) "Compare products", "Recommend"]
+}
+'''
+
+@pytest.fixture
+def daemon(tmp_path):
+    daemon = ParseDaemon(str(tmp_path / "cogent.sock"))
+    thread = daemon.start()
+    yield daemon
+    daemon.shutdown()
+    thread.join(5)
+
+def test_parse_round_trip(daemon):
+    with DaemonClient(daemon.socket_path) as client:
+        assert "pid" in client.ping()
+        modules = client.parse(SOURCE)
+        assert [m.name for m in modules] == ["Deck"]
+        assert modules[0].goal == "Pick decking"
+        assert modules[0].process[0].annotations == {"owner": ["agent"]}
+        # The warm cache answers the repeat.
+        client.parse(SOURCE)
+        assert client.stats()["cache"]["hits"] == 1
+
+def test_parse_path(daemon, tmp_path):
+    path = tmp_path / "deck.cg"
+    path.write_text(SOURCE)
+    with DaemonClient(daemon.socket_path) as client:
+        assert [m.name for m in client.parse(path=str(path))] == ["Deck"]
+
+def test_check_and_query(daemon):
+    with DaemonClient(daemon.socket_path) as client:
+        codes = sorted(d["code"] for d in client.check(SOURCE))
+        assert codes == ["duplicate-enum-member", "unknown-type"]
+        assert client.query("modules_annotated", "owner") == []
+        assert client.query("steps_annotated", "owner", "agent") == [
+            {"module": "Deck", "path": [0], "text": "Compare products"}]
+        assert client.query("get_goal", "Deck") == "Pick decking"
+        with pytest.raises(DaemonError, match="unknown query method"):
+            client.query("__init__")
+
+def test_errors_keep_the_connection_usable(daemon):
+    with DaemonClient(daemon.socket_path) as client:
+        with pytest.raises(DaemonError, match="Unexpected"):
+            client.parse("module {")
+        with pytest.raises(DaemonError, match="unknown op"):
+            client._request({"op": "explode"})
+        with pytest.raises(DaemonError, match="op must be a string"):
+            client._request({"op": ["parse"]})
+        for args in ("owner", {"owner": 1}, 3):
+            with pytest.raises(DaemonError, match="args must be a list"):
+                client._request({"op": "query", "method": "modules_annotated", "args": args})
+        assert client.parse(SOURCE)[0].name == "Deck"
+
+def test_concurrent_clients(daemon):
+    errors = []
+
+    def worker(n):
+        try:
+            with DaemonClient(daemon.socket_path) as client:
+                for k in range(10):
+                    source = SOURCE.replace("Deck", f"Deck{n}_{k}")
+                    assert client.parse(source)[0].name == f"Deck{n}_{k}"
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    with DaemonClient(daemon.socket_path) as client:
+        stats = client.stats()
+        assert stats["modules"] == 80 and stats["requests"] == 81
+
+def test_raw_frames(daemon):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(daemon.socket_path)
+        write_frame(sock, {"op": "parse"}, SOURCE.encode())
+        header, body = read_frame(sock)
+        assert header["ok"] and header["modules"] == ["Deck"] and body[:4] == b"CGMB"
+
+def test_non_object_header_gets_an_error_frame(daemon):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(daemon.socket_path)
+        write_frame(sock, ["parse"])
+        header, _ = read_frame(sock)
+        assert not header["ok"] and "JSON object" in header["error"]
+    with DaemonClient(daemon.socket_path) as client:
+        assert client.stats()["requests"] == 1
+
+def test_refuses_second_daemon_and_missing_socket(daemon, tmp_path):
+    with pytest.raises(DaemonError, match="already listening"):
+        ParseDaemon(daemon.socket_path).bind()
+    with pytest.raises(DaemonError, match="no daemon"):
+        DaemonClient(str(tmp_path / "missing.sock")).ping()
+
+def test_shutdown_removes_socket(tmp_path):
+    daemon = ParseDaemon(str(tmp_path / "cogent.sock"))
+    thread = daemon.start()
+    DaemonClient(daemon.socket_path).shutdown()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert not (tmp_path / "cogent.sock").exists()
+
+def test_cli_parse_via_daemon(daemon, tmp_path, capsys):
+    (tmp_path / "deck.cg").write_text(SOURCE)
+    assert main(["parse", "--daemon", "--socket", daemon.socket_path, str(tmp_path / "deck.cg")]) == 0
+    assert "Deck" in capsys.readouterr().out
@@ -0,0 +1,91 @@
+from interpreter.plan import OP_NAMES, module_hash
+from interpreter.runtime import Runtime
+from tests.helpers import parse_module
+
+SOURCE = '''
+module Nested {
+    goal: "Deep control flow"
+    inputs: [rows: List<Int>, cols: List<Int>]
+    process: [
+        for r in rows: [
+            try [
+                for c in cols: ["Cell"],
+                "Row done"
+            ] catch err [
+                "Row failed",
+                try ["Explode"]
+            ]
+        ],
+        while "again": [try ["Explode"] catch e ["Recovered"]],
+        "End"
+    ]
+}
+'''
+
+def make_runtime(compiled):
+    runtime = Runtime(compiled=compiled, max_loop_iterations=50)
+
+    def cell(text, scope):
+        if scope["r"] == scope["c"] == 1:
+            raise ValueError("bad cell")
+        return (scope["r"], scope["c"])
+
+    def explode(text, scope):
+        raise RuntimeError("explode")
+
+    def again(scope):
+        scope["loops"] = scope.get("loops", 0) + 1
+        return scope["loops"] <= 2
+
+    runtime.register("Cell", cell)
+    runtime.register("Explode", explode)
+    runtime.register_condition("again", again)
+    runtime.default = lambda text, scope: text
+    return runtime
+
+def trace(result):
+    return [(r.path, r.iteration, r.value) for r in result.results]
+
+def test_plan_matches_tree_walking():
+    module = parse_module(SOURCE)
+    inputs = {"rows": [0, 1, 2], "cols": [0, 1]}
+    compiled = make_runtime(True).run(module, inputs)
+    walked = make_runtime(False).run(module, inputs)
+    assert trace(compiled) == trace(walked)
+    assert ("r" in compiled.scope, compiled.scope["loops"]) == (False, 3)
+
+def test_plan_is_flat_with_exception_table():
+    runtime = make_runtime(True)
+    plan = runtime.compile(parse_module(SOURCE))
+    assert OP_NAMES[plan.ops[0]] == "FOR_INIT"
+    assert len(plan.exception_table) == 3
+    assert "try" in plan.disassemble()
+
+def test_plans_cached_by_content_and_invalidated_by_register():
+    runtime = make_runtime(True)
+    first, second = parse_module(SOURCE), parse_module(SOURCE)
+    assert module_hash(first) == module_hash(second)
+    plan = runtime.compile(first)
+    assert runtime.compile(second) is plan
+    runtime.register("End", lambda text, scope: "ended")
+    assert runtime.compile(first) is not plan
+    assert runtime.run(first, {"rows": [], "cols": []}).values[-1] == "ended"
+
+def test_invalidate_after_editing_in_place():
+    runtime = make_runtime(True)
+    module = parse_module(SOURCE)
+    plan = runtime.compile(module)
+    module.process[-1].text = "Finish"
+    assert runtime.compile(module) is plan
+    runtime.invalidate(module)
+    assert runtime.compile(module) is not plan
+    assert runtime.run(module, {"rows": [], "cols": []}).values[-1] == "Finish"
+    assert runtime.compile(parse_module(SOURCE)) is plan
+
+def test_assigning_default_invalidates_plans():
+    runtime = make_runtime(True)
+    module = parse_module(SOURCE)
+    plan = runtime.compile(module)
+    runtime.default = lambda text, scope: text.upper()
+    assert runtime.compile(module) is not plan
+    assert runtime.run(module, {"rows": [], "cols": []}).values[-1] == "END"
@@ -0,0 +1,146 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from interpreter.resource_profiler import ExecutionProfiler
+from interpreter.runtime import Runtime
+from tests.helpers import parse_module
+
+SOURCE = '''
+module Deck {
+    goal: "Profile execution"
+    inputs: [items: List<Int>]
+    process: [
+        "Load",
+        for item in items: ["Price it", "Rate it"],
+        try ["Fail"] catch err ["Retry"]
+    ]
+}
+'''
+
+PARALLEL = '''
+module Fan {
+    goal: "Profile workers"
+    inputs: [items: List<Int>]
+    process: [@parallel for item in items: ["Work"]]
+}
+'''
+
+KEPT = []
+
+def burn(text, scope):
+    return sum(range(200000))
+
+def cheap(text, scope):
+    return text
+
+def fail(text, scope):
+    raise ValueError("no stock")
+
+def keep(text, scope):
+    KEPT.append(bytearray(100000))
+    return len(KEPT)
+
+def make_runtime(profiler, **kwargs):
+    return Runtime(handlers={"Price it": burn, "Fail": fail}, default=cheap, profiler=profiler, **kwargs)
+
+def test_calls_aggregate_per_path_across_iterations(compiled):
+    module = parse_module(SOURCE)
+    profiler = ExecutionProfiler()
+    with make_runtime(profiler, compiled=compiled) as runtime:
+        result = runtime.run(module, {"items": [1, 2, 3]})
+    with make_runtime(None, compiled=compiled) as runtime:
+        plain = runtime.run(module, {"items": [1, 2, 3]})
+    assert [(r.path, r.iteration, r.value) for r in result.results] == \
+           [(r.path, r.iteration, r.value) for r in plain.results]
+    calls = {(p.module, p.path): p.calls for p in profiler.steps.values()}
+    assert calls == {
+        ("Deck", (0,)): 1,
+        ("Deck", (1, "steps", 0)): 3,
+        ("Deck", (1, "steps", 1)): 3,
+        ("Deck", (2, "try_steps", 0)): 1,
+        ("Deck", (2, "catch_steps", 0)): 1,
+    }
+    (heaviest,) = profiler.top(1, "cpu")
+    assert heaviest.text == "Price it"
+    assert heaviest.cpu_sec > 0 and heaviest.wall_sec >= heaviest.max_wall_sec > 0
+    assert profiler.runs["Deck"]["runs"] == 1
+    assert profiler.runs["Deck"]["wall_sec"] >= sum(p.wall_sec for p in profiler.steps.values())
+
+def test_profiler_attached_later_recompiles():
+    module = parse_module(SOURCE)
+    with make_runtime(None) as runtime:
+        runtime.run(module, {"items": [1]})
+        runtime.profiler = profiler = ExecutionProfiler()
+        runtime.run(module, {"items": [1]})
+    assert sum(p.calls for p in profiler.steps.values()) == 5
+
+def test_sampling_counts_every_call_and_scales_estimates():
+    module = parse_module(SOURCE)
+    profiler = ExecutionProfiler(sample_rate=0.25, seed=7)
+    with make_runtime(profiler) as runtime:
+        runtime.run(module, {"items": list(range(200))})
+    rate = profiler.steps[("Deck", (1, "steps", 1))]
+    assert rate.calls == 200
+    assert 20 < rate.samples < 100
+    assert rate.estimate("wall") == pytest.approx(rate.wall_sec * 200 / rate.samples)
+    with pytest.raises(ValueError):
+        ExecutionProfiler(sample_rate=0)
+
+def test_process_workers_merge_into_parent():
+    profiler = ExecutionProfiler()
+    with Runtime(handlers={"Work": burn}, executor="process", max_workers=2, profiler=profiler) as runtime:
+        result = runtime.run(parse_module(PARALLEL), {"items": list(range(6))})
+    assert len(result.results) == 6
+    (work,) = profiler.steps.values()
+    assert (work.module, work.path, work.calls, work.samples) == ("Fan", (0, "steps", 0), 6, 6)
+    assert work.cpu_sec > 0
+    assert sum(profiler.workers.values()) == 6
+    assert os.getpid() not in profiler.workers
+
+def test_memory_attribution():
+    profiler = ExecutionProfiler(memory=True)
+    with profiler, Runtime(handlers={"Price it": keep}, default=cheap, profiler=profiler) as runtime:
+        runtime.run(parse_module('module M { goal: "g" inputs: [] process: ["Price it", "Rate it"] }'))
+    KEPT.clear()
+    steps = {p.text: p for p in profiler.steps.values()}
+    assert steps["Price it"].alloc_bytes >= 100000
+    assert steps["Rate it"].alloc_bytes < 10000
+
+def test_overlapping_thread_steps_are_not_charged_each_others_allocations():
+    started = threading.Barrier(2)
+    def alloc(text, scope):
+        started.wait(5)
+        KEPT.append(bytearray(100000))
+        time.sleep(0.05)
+    def idle(text, scope):
+        started.wait(5)
+        time.sleep(0.05)
+    profiler = ExecutionProfiler(memory=True)
+    with profiler, Runtime(handlers={"Alloc": alloc, "Idle": idle}, profiler=profiler) as runtime:
+        runtime.run(parse_module('module M { goal: "g" inputs: [] process: [@independent "Alloc", @independent "Idle"] }'))
+    KEPT.clear()
+    steps = {p.text: p for p in profiler.steps.values()}
+    assert steps["Alloc"].calls == steps["Idle"].calls == 1
+    assert steps["Idle"].alloc_bytes == 0
+
+def test_collapsed_stacks_and_json_export(tmp_path):
+    profiler = ExecutionProfiler()
+    with make_runtime(profiler) as runtime:
+        runtime.run(parse_module(SOURCE), {"items": [1, 2]})
+    lines = profiler.collapsed().splitlines()
+    stacks = [line.rsplit(" ", 1)[0] for line in lines]
+    assert stacks == ["Deck;Load", "Deck;for item in items;Price it", "Deck;for item in items;Rate it",
+                      "Deck;try;catch err;Retry", "Deck;try;Fail"]
+    assert int(lines[1].rsplit(" ", 1)[1]) > 0
+    profiler.write_collapsed(tmp_path / "cpu.folded", metric="cpu")
+    assert (tmp_path / "cpu.folded").read_text().startswith("Deck;")
+    profiler.write_json(tmp_path / "profile.json")
+    summary = json.loads((tmp_path / "profile.json").read_text())
+    assert summary["steps"][0]["text"] == "Price it"
+    assert {s["calls"] for s in summary["steps"] if s["path"][0] == 1} == {2}
+    with pytest.raises(ValueError):
+        profiler.collapsed("heat")
@@ -0,0 +1,29 @@
+import pytest
+
+from interpreter.parser import CogentParser, clear_grammar_cache
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("COGENT_CACHE_DIR", str(tmp_path))
+    clear_grammar_cache()
+    yield tmp_path
+    clear_grammar_cache()
+
+def test_grammar_tables_cached_on_disk(tmp_path):
+    CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
+    cached = list(tmp_path.glob("cogent-lalr-*.lark"))
+    assert len(cached) == 1
+    # A fresh process state loads the tables back instead of rebuilding them.
+    clear_grammar_cache()
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
+    assert list(tmp_path.glob("cogent-lalr-*.lark")) == cached
+    assert parser.parse_string('module M { goal: "g" inputs: [] process: [] }') is not None
+
+def test_compiled_grammar_shared_between_parsers():
+    first = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
+    second = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
+    assert first.parser is second.parser
+    assert CogentParser(parser="earley").parser is not first.parser
+
+def test_shared_parser_instance():
+    assert CogentParser.shared() is CogentParser.shared()
@@ -0,0 +1,70 @@
+import pytest
+from interpreter.parser import CogentParser
+from interpreter.semantic_model import model_to_dict
+
+SOURCE = '''
+module First {
+    goal: "First"
+    inputs: []
+    process: ["Step one"]
+}
+@owner("agent")
+module Second {
+    goal: "Second"
+    inputs: [x: Int]
+    process: ["Step two", for i in x: ["Inner"]]
+}
+module Third {
+    goal: "Third"
+    inputs: []
+    process: []
+}
+'''
+
+def _parser():
+    return CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
+
+def _edit(parser, doc, old, new):
+    start = doc.source.index(old)
+    return parser.reparse(doc, start, start + len(old), new)
+
+def _assert_matches_full_parse(parser, doc):
+    full = parser.parse_string(doc.source, as_semantic_model=True).children
+    assert model_to_dict(doc.modules) == model_to_dict(full)
+
+def test_single_step_edit_reparses_one_module():
+    parser = _parser()
+    doc = parser.parse_document(SOURCE)
+    new = _edit(parser, doc, '"Inner"', '"Inner edited", "Another"')
+    assert new.reparsed == 1
+    assert new.modules[0] is doc.modules[0]
+    assert new.modules[2] is doc.modules[2]
+    assert new.modules[1].process[1].steps[1].text == "Another"
+    _assert_matches_full_parse(parser, new)
+    # Offsets after the edit are shifted, so a second edit lands correctly.
+    newer = _edit(parser, new, '"Third"', '"Third edited"')
+    assert newer.reparsed == 1 and newer.modules[1] is new.modules[1]
+    _assert_matches_full_parse(parser, newer)
+
+def test_edits_that_add_remove_or_merge_modules():
+    parser = _parser()
+    doc = parser.parse_document(SOURCE)
+    added = _edit(parser, doc, "module Third", 'module Extra { goal: "e" inputs: [] process: [] }\nmodule Third')
+    assert [m.name for m in added.modules] == ["First", "Second", "Extra", "Third"]
+    _assert_matches_full_parse(parser, added)
+    start = doc.source.index("module First")
+    removed = parser.reparse(doc, start, doc.source.index("@owner"), "")
+    assert [m.name for m in removed.modules] == ["Second", "Third"]
+    _assert_matches_full_parse(parser, removed)
+    appended = parser.reparse(doc, len(doc.source), len(doc.source), 'module Last { goal: "l" inputs: [] process: [] }')
+    assert appended.reparsed == 1 and appended.modules[-1].name == "Last"
+    _assert_matches_full_parse(parser, appended)
+
+def test_broken_edit_raises_like_a_full_parse():
+    parser = _parser()
+    doc = parser.parse_document(SOURCE)
+    with pytest.raises(Exception):
+        _edit(parser, doc, 'goal: "Second"', 'goal: ')
+    # Deleting a brace unbalances the region; the full parse reports the error.
+    with pytest.raises(Exception):
+        _edit(parser, doc, '["Step one"]\n}', '["Step one"]')
@@ -0,0 +1,48 @@
+import io
+import pytest
+from lark.exceptions import UnexpectedInput
+from interpreter.parser import CogentParser
+from interpreter.semantic_model import CogentModule, model_to_dict
+
+SOURCE = '''
+module First {
+    goal: "Braces in strings {{ are } ignored"
+    inputs: []
+    process: ["Step1"]
+}
+@owner("agent")
+module Second {
+    goal: "Second goal"
+    inputs: [x: Int]
+    process: ["Step2", for i in x: ["Inner"]]
+}
+'''
+
+def test_iter_modules_matches_full_parse_with_tiny_chunks():
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
+    full = parser.parse_string(SOURCE, as_semantic_model=True).children
+    streamed = list(parser.iter_modules(io.StringIO(SOURCE), chunk_size=7))
+    assert all(isinstance(m, CogentModule) for m in streamed)
+    assert model_to_dict(streamed) == model_to_dict(full)
+
+def test_iter_modules_is_lazy(tmp_path):
+    path = tmp_path / "many.cg"
+    path.write_text(SOURCE + "module Broken { goal: }")
+    modules = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf").iter_modules(str(path))
+    assert next(modules).name == "First"
+    assert next(modules).name == "Second"
+    with pytest.raises(UnexpectedInput) as excinfo:
+        next(modules)
+    assert excinfo.value.line == SOURCE.count("\n") + 1
+
+def test_iter_modules_binary_stream():
+    stream = io.BytesIO(SOURCE.encode("utf-8"))
+    names = [m.name for m in CogentParser(grammar_path="interpreter/grammar/cogent.ebnf").iter_modules(stream)]
+    assert names == ["First", "Second"]
+
+def test_iter_modules_unexpected_eof_reports_last_line():
+    source = SOURCE + 'module Unfinished {\n    goal: "g"\n    inputs: []\n'
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf", parser="earley")
+    with pytest.raises(UnexpectedInput) as excinfo:
+        list(parser.iter_modules(io.StringIO(source)))
+    assert excinfo.value.line == source.rstrip().count("\n") + 1
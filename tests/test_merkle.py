@@ -0,0 +1,150 @@
+import pickle
+
+from interpreter.binary_format import decode_modules, encode_modules
+from interpreter.merkle import SubtreeTable, clear_hashes, dedup_modules, diff, diff_corpus, structural_hash
+from interpreter.parser import CogentParser
+from interpreter.plan import module_hash
+from interpreter.semantic_model import ProcessStep, model_to_dict
+
+def parse(source):
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
+    return parser.parse_string(source, as_semantic_model=True).children
+
+BASE = '''
+@owner(agent) @cost("high")
+module Deck {
+    type Options = List<String>
+    enum Finish { Oil, Stain }
+    goal: "Pick decking"
+    inputs: [options: Options, budget: Float]
+    process: ["Compare", for o in options: ["Price it", "Rate it"], try ["Order"] catch e ["Retry"]]
+}
+'''
+
+def test_equal_trees_hash_alike_wherever_they_came_from():
+    (module,) = parse(BASE)
+    (again,) = parse(BASE)
+    reordered = parse(BASE.replace('@owner(agent) @cost("high")', '@cost("high") @owner(agent)'))[0]
+    decoded = decode_modules(encode_modules([module]), lazy=True)[0]
+    unpickled = pickle.loads(pickle.dumps(module))
+    h = structural_hash(module)
+    assert len(h) == 32
+    assert structural_hash(again) == structural_hash(reordered) == structural_hash(decoded) == structural_hash(unpickled) == h
+    assert module_hash(module) == h
+    assert structural_hash(module.process[1]) == structural_hash(again.process[1])
+    assert structural_hash(module.process[1]) != structural_hash(module.process[2])
+
+def test_every_field_contributes():
+    (base,) = parse(BASE)
+    variants = [
+        BASE.replace("Pick decking", "Pick fencing"),
+        BASE.replace("Float", "Int"),
+        BASE.replace("List<String>", "List<Int>"),
+        BASE.replace("Stain", "Paint"),
+        BASE.replace("agent", "bot"),
+        BASE.replace("for o in", "for p in"),
+        BASE.replace("catch e", "catch err"),
+        BASE.replace('"Rate it"', '@parallel "Rate it"'),
+    ]
+    hashes = {structural_hash(parse(v)[0]) for v in variants}
+    assert len(hashes) == len(variants)
+    assert structural_hash(base) not in hashes
+
+def test_hashes_are_cached_and_cleared_after_edits():
+    (module,) = parse(BASE)
+    before = structural_hash(module)
+    module.process[1].steps.append(ProcessStep("Log it"))
+    assert structural_hash(module) == before
+    clear_hashes(module)
+    assert structural_hash(module) != before
+
+def test_fresh_rehashes_after_in_place_edits():
+    (module,) = parse(BASE)
+    (old,) = parse(BASE)
+    before = structural_hash(module)
+    module.process[1].steps[1].text = "Score it"
+    assert structural_hash(module) == before
+    assert diff(old, module) == []
+    assert structural_hash(module, fresh=True) != before
+    module.process[0].text = "Contrast"
+    assert [c.path for c in diff(old, module, fresh=True)] == [
+        ("process", 0, "text"), ("process", 1, "steps", 1, "text")]
+    module.goal = "Pick fencing"
+    assert [c.path for c in diff_corpus([old], [module], fresh=True)["Deck"]][0] == ("goal",)
+
+def test_fresh_dedup_rekeys_edited_steps():
+    (a,) = parse(BASE)
+    table = dedup_modules([a])
+    a.process[0].text = "Contrast"
+    (b,) = parse(BASE)
+    dedup_modules([b], table, fresh=True)
+    assert b.process[0] is not a.process[0]
+    assert b.process[0].text == "Compare"
+    (c,) = parse(BASE.replace('"Compare"', '"Contrast"'))
+    table.dedup([c])
+    assert c.process[0] is a.process[0]
+
+def test_diff_reports_only_what_changed():
+    (old,) = parse(BASE)
+    (new,) = parse(BASE.replace('"Rate it"', '"Score it"')
+                   .replace('["Compare",', '["Compare", "Shortlist",')
+                   .replace("budget: Float", "budget: Float, deadline: String")
+                   .replace("@owner(agent)", "@owner(bot)"))
+    changes = {(c.kind, c.path) for c in diff(old, new)}
+    assert changes == {
+        ("added", ("process", 1)),
+        ("changed", ("process", 2, "steps", 1, "text")),
+        ("added", ("inputs", 2)),
+        ("changed", ("annotations", "owner")),
+    }
+    assert diff(old, parse(BASE)[0]) == []
+
+def test_diff_skips_equal_subtrees():
+    (old,) = parse(BASE)
+    (new,) = parse(BASE.replace("Pick decking", "Pick fencing"))
+    visited = []
+    for module in (old, new):
+        for step in module.process:
+            structural_hash(step)
+    original = type(old.process[1]).steps
+    class Spy:
+        def __get__(self, obj, cls):
+            visited.append(obj)
+            return original.__get__(obj, cls)
+    type(old.process[1]).steps = Spy()
+    try:
+        assert [c.path for c in diff(old, new)] == [("goal",)]
+    finally:
+        type(old.process[1]).steps = original
+    assert visited == []
+
+def test_diff_corpus_matches_modules_by_name():
+    old = parse(BASE + 'module Gone { goal: "g" inputs: [] process: [] }')
+    new = parse(BASE.replace("Compare", "Contrast") + 'module Fresh { goal: "f" inputs: [] process: [] }')
+    result = diff_corpus(old, new)
+    assert sorted(result) == ["Deck", "Fresh", "Gone"]
+    assert [c.kind for c in result["Gone"]] == ["removed"]
+    assert [c.kind for c in result["Fresh"]] == ["added"]
+    assert [c.path for c in result["Deck"]] == [("process", 0, "text")]
+
+def test_dedup_shares_identical_subtrees_across_versions():
+    versions = [parse(BASE)[0], parse(BASE)[0], parse(BASE.replace('"Order"', '"Buy"'))[0]]
+    expected = model_to_dict(versions)
+    table = dedup_modules(versions)
+    assert model_to_dict(versions) == expected
+    first, second, third = (v.process for v in versions)
+    assert all(a is b for a, b in zip(first, second))
+    assert third[1] is first[1]
+    assert third[2] is not first[2]
+    assert third[2].catch_steps[0] is first[2].catch_steps[0]
+    assert table.shared == 6
+    assert len(table) == 9
+    assert ProcessStep("Retry") in table
+
+def test_table_reused_across_batches():
+    table = SubtreeTable()
+    (a,) = parse(BASE)
+    table.dedup([a])
+    (b,) = parse(BASE)
+    table.dedup([b])
+    assert b.process[0] is a.process[0]
@@ -0,0 +1,91 @@
+import os
+import pytest
+from interpreter.parser import CogentParser
+from interpreter.module_registry import ModuleRegistry, ImportCycleError, UnresolvedImportError
+
+def _module(name, *imports, step="Do"):
+    lines = "".join(f"    import {i}\n" for i in imports)
+    return f'module {name} {{\n{lines}    goal: "{name}"\n    inputs: []\n    process: ["{step}"]\n}}\n'
+
+def _write(root, name, *imports, **kwargs):
+    path = root / f"{name}.cg"
+    path.write_text(_module(name, *imports, **kwargs))
+    return path
+
+def _registry(root, workers=1):
+    return ModuleRegistry([root], parser=CogentParser(grammar_path="interpreter/grammar/cogent.ebnf"), workers=workers)
+
+def test_resolves_diamond_once_in_dependency_order(tmp_path):
+    _write(tmp_path, "App", "Left", "Right")
+    _write(tmp_path, "Left", "Base")
+    _write(tmp_path, "Right", "Base")
+    _write(tmp_path, "Base")
+    registry = _registry(tmp_path)
+    order = [m.name for m in registry.resolve("App")]
+    assert order[0] == "Base" and order[-1] == "App"
+    assert set(order) == {"App", "Left", "Right", "Base"}
+    assert registry.parses == 4
+    registry.resolve("Left")
+    assert registry.parses == 4
+
+def test_parallel_loading_matches_serial(tmp_path):
+    _write(tmp_path, "App", "A", "B", "C")
+    for name in "ABC":
+        _write(tmp_path, name, "Base")
+    _write(tmp_path, "Base")
+    serial = [m.name for m in _registry(tmp_path).resolve("App")]
+    parallel = [m.name for m in _registry(tmp_path, workers=2).resolve("App")]
+    assert serial == parallel
+
+def test_parallel_loading_shares_one_pool_and_the_parse_cache(tmp_path, monkeypatch):
+    import interpreter.module_registry as module_registry
+    from interpreter.parse_cache import ParseCache
+    _write(tmp_path, "App", "A", "B")
+    _write(tmp_path, "A", "C", "D")
+    _write(tmp_path, "B", "C", "D")
+    _write(tmp_path, "C")
+    _write(tmp_path, "D")
+    pools = []
+    original = module_registry.worker_pool
+    def counting_pool(*args):
+        pools.append(args)
+        return original(*args)
+    monkeypatch.setattr(module_registry, "worker_pool", counting_pool)
+    cache_dir = tmp_path / "cache"
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf", cache=ParseCache(cache_dir))
+    registry = ModuleRegistry([tmp_path], parser=parser, workers=2)
+    assert [m.name for m in registry.resolve("App")][-1] == "App"
+    assert len(pools) == 1 and pools[0][3] == cache_dir
+    assert len(list(cache_dir.glob("*.model"))) == 5
+
+def test_same_file_imports_resolve_locally(tmp_path):
+    (tmp_path / "Bundle.cg").write_text(_module("Bundle", "Helper") + _module("Helper"))
+    assert [m.name for m in _registry(tmp_path).resolve("Bundle")] == ["Helper", "Bundle"]
+
+def test_cycles_and_missing_imports_are_reported(tmp_path):
+    _write(tmp_path, "A", "B")
+    _write(tmp_path, "B", "C")
+    _write(tmp_path, "C", "A")
+    _write(tmp_path, "D", "Missing")
+    registry = _registry(tmp_path)
+    with pytest.raises(ImportCycleError) as excinfo:
+        registry.resolve("A")
+    assert excinfo.value.cycle == ["A", "B", "C", "A"]
+    with pytest.raises(UnresolvedImportError):
+        registry.resolve("D")
+
+def test_change_invalidates_only_dependents(tmp_path):
+    _write(tmp_path, "App", "Lib")
+    _write(tmp_path, "Other", "Util")
+    lib = _write(tmp_path, "Lib", "Util")
+    _write(tmp_path, "Util")
+    registry = _registry(tmp_path)
+    registry.resolve("App")
+    registry.resolve("Other")
+    assert registry.parses == 4
+    lib.write_text(_module("Lib", "Util", step="Changed step"))
+    os.utime(lib, ns=(0, 0))
+    assert registry.refresh() == {"Lib", "App"}
+    assert registry.get("App") is registry.resolve("App")[-1]
+    assert registry.get("Lib").process[0].text == "Changed step"
+    assert registry.parses == 5
@@ -0,0 +1,77 @@
+import pickle
+
+import pytest
+
+from interpreter.parser import CogentParser
+from interpreter.module_store import ModuleStore, ModuleProxy, build_store, write_store
+from interpreter.semantic_model import CogentModule, model_to_dict
+
+SOURCE = '''
+module Alpha {
+    type Bag = List<Item>
+    goal: "First"
+    inputs: [@required items: Bag]
+    process: ["A", for i in items: ["B"]]
+}
+@owner(team)
+module Beta {
+    import Alpha
+    goal: "Second"
+    inputs: []
+    process: [try ["C"] catch err ["D"]]
+}
+'''
+
+@pytest.fixture
+def parser():
+    return CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
+
+@pytest.fixture
+def store_path(tmp_path, parser):
+    source = tmp_path / "corpus.cg"
+    source.write_text(SOURCE)
+    path = tmp_path / "corpus.cgstore"
+    assert build_store(path, [source], parser) == 2
+    return path
+
+def test_lookup_by_name_matches_parse(store_path, parser):
+    expected = parser.parse_string(SOURCE, as_semantic_model=True).children
+    with ModuleStore(store_path) as store:
+        assert len(store) == 2 and list(store.names()) == ["Alpha", "Beta"]
+        assert "Beta" in store and "Gamma" not in store
+        assert store.get("Gamma") is None
+        with pytest.raises(KeyError):
+            store["Gamma"]
+        assert [model_to_dict(store[m.name]) for m in expected] == model_to_dict(expected)
+
+def test_proxy_materializes_fields_on_access(store_path):
+    with ModuleStore(store_path) as store:
+        beta = store["Beta"]
+        assert isinstance(beta, CogentModule)
+        assert beta.imports == ["Alpha"] and beta.annotations == {"owner": ["team"]}
+        assert not any(beta.is_loaded(f) for f in ("types", "inputs", "process"))
+        assert beta.process[0].catch_var == "err"
+        assert beta.is_loaded("process") and not beta.is_loaded("inputs")
+        beta.inputs = ["replaced"]
+        assert beta.inputs == ["replaced"]
+
+def test_proxy_pickles_as_plain_module(store_path):
+    with ModuleStore(store_path) as store:
+        alpha = pickle.loads(pickle.dumps(store["Alpha"]))
+    assert type(alpha) is CogentModule
+    assert alpha.types["Bag"].param.name == "Item"
+
+def test_many_modules_and_duplicate_names(tmp_path):
+    modules = [CogentModule(f"M{i}", f"Goal {i}", [], []) for i in range(300)]
+    modules.append(CogentModule("M7", "Shadowed", [], []))
+    path = tmp_path / "many.cgstore"
+    write_store(path, modules)
+    with ModuleStore(path) as store:
+        assert all(store[f"M{i}"].goal == f"Goal {i}" for i in range(300))
+        assert store.module(300).goal == "Shadowed"
+
+def test_rejects_non_store_files(tmp_path):
+    path = tmp_path / "bogus"
+    path.write_bytes(b"not a store at all")
+    with pytest.raises(ValueError):
+        ModuleStore(path)
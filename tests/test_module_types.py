@@ -12,7 +12,7 @@ def test_module_types_and_enums():
         process: ["Do something"]
     }
     '''
-    parser = CogentParser(grammar_path="grammar/cogent.ebnf")
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
     tree = parser.parse_string(source)
     model = CogentTransformer().transform(tree)
     if hasattr(model, 'children') and model.children:
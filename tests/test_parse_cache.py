@@ -0,0 +1,84 @@
+import zlib
+
+from interpreter.parser import CogentParser
+from interpreter.parse_cache import ParseCache
+from interpreter.semantic_model import model_to_dict
+
+SOURCE = '''
+module Cached {
+    goal: "Cache me"
+    inputs: [x: List<Int>]
+    process: ["A", for i in x: ["B"]]
+}
+'''
+
+def test_warm_parse_skips_parsing(tmp_path, monkeypatch):
+    cache = ParseCache(tmp_path)
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf", cache=cache)
+    first = parser.parse_string(SOURCE, as_semantic_model=True)
+    assert cache.stats()["misses"] == 1
+
+    # A new cache over the same directory simulates a fresh run.
+    warm_cache = ParseCache(tmp_path)
+    warm = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf", cache=warm_cache)
+    monkeypatch.setattr(warm, "_parse_semantic", lambda source: (_ for _ in ()).throw(AssertionError("parsed")))
+    second = warm.parse_string(SOURCE, as_semantic_model=True)
+    third = warm.parse_string(SOURCE, as_semantic_model=True)
+    assert model_to_dict(first.children) == model_to_dict(second.children)
+    assert warm_cache.stats()["disk_hits"] == 1
+    assert warm_cache.stats()["memory_hits"] == 1
+    # Hits decode fresh objects, so mutating a result cannot corrupt the cache.
+    assert second.children[0] is not third.children[0]
+
+def test_changed_source_misses():
+    cache = ParseCache()
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf", cache=cache)
+    parser.parse_string(SOURCE, as_semantic_model=True)
+    parser.parse_string(SOURCE.replace('"B"', '"C"'), as_semantic_model=True)
+    assert cache.stats()["misses"] == 2 and cache.stats()["hits"] == 0
+
+def test_memory_lru_and_disk_eviction(tmp_path):
+    cache = ParseCache(tmp_path, memory_entries=2, max_disk_bytes=1)
+    for i in range(4):
+        cache.put(ParseCache.key(f"source {i}", "v"), [i])
+    stats = cache.stats()
+    assert stats["memory_entries"] == 2
+    assert stats["evictions"] >= 3
+    assert len(list(tmp_path.glob("*.model"))) <= 1
+
+def test_failed_disk_write_keeps_memory_entry(tmp_path, monkeypatch):
+    cache = ParseCache(tmp_path)
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf", cache=cache)
+    def full_disk(self, data):
+        raise OSError(28, "No space left on device")
+    monkeypatch.setattr(type(tmp_path), "write_bytes", full_disk)
+    first = parser.parse_string(SOURCE, as_semantic_model=True)
+    monkeypatch.undo()
+    second = parser.parse_string(SOURCE, as_semantic_model=True)
+    assert model_to_dict(first.children) == model_to_dict(second.children)
+    assert cache.stats()["write_errors"] == 1
+    assert cache.stats()["memory_hits"] == 1
+    assert list(tmp_path.iterdir()) == []
+
+def test_transformer_change_misses(monkeypatch):
+    import interpreter.parser as parser_module
+    cache = ParseCache()
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf", cache=cache)
+    parser.parse_string(SOURCE, as_semantic_model=True)
+    monkeypatch.setattr(parser_module, "_transformer_version", "edited")
+    edited = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf", cache=cache)
+    edited.parse_string(SOURCE, as_semantic_model=True)
+    assert cache.stats()["misses"] == 2
+
+def test_corrupt_disk_entry_is_a_miss_and_removed(tmp_path):
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf", cache=ParseCache(tmp_path))
+    expected = model_to_dict(parser.parse_string(SOURCE, as_semantic_model=True).children)
+    (entry,) = tmp_path.glob("*.model")
+    for garbage in (b"not zlib at all", entry.read_bytes()[:10], zlib.compress(b"\x80\x05junk")):
+        entry.write_bytes(garbage)
+        cache = ParseCache(tmp_path)
+        warm = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf", cache=cache)
+        assert model_to_dict(warm.parse_string(SOURCE, as_semantic_model=True).children) == expected
+        assert cache.stats()["corrupt"] == 1 and cache.stats()["misses"] == 1
+        # The bad entry was replaced by a good one.
+        assert ParseCache(tmp_path).get(entry.stem) is not None
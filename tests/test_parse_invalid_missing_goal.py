@@ -8,6 +8,6 @@ def test_parse_invalid_missing_goal():
         process: ["Step"]
     }
     '''
-    parser = CogentParser(grammar_path="grammar/cogent.ebnf")
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
     with pytest.raises(Exception):
         parser.parse_string(source)
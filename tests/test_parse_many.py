@@ -0,0 +1,36 @@
+from interpreter.parser import CogentParser
+from interpreter.cli import main
+
+MODULE = 'module M{index} {{ goal: "g" inputs: [] process: ["Step {index}"] }}'
+
+def _write_corpus(root, count=6):
+    paths = []
+    for i in range(count):
+        path = root / f"m{i}.cg"
+        path.write_text(MODULE.format(index=i))
+        paths.append(str(path))
+    broken = root / "broken.cg"
+    broken.write_text("module Broken { inputs: [] }")
+    return paths, str(broken)
+
+def test_parse_many_ordered_with_errors(tmp_path):
+    paths, broken = _write_corpus(tmp_path)
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
+    results = list(parser.parse_many(paths[:3] + [broken] + paths[3:], workers=2, ordered=True))
+    assert [r.path for r in results] == paths[:3] + [broken] + paths[3:]
+    assert not results[3].ok
+    assert [r.modules[0].name for r in results if r.ok] == [f"M{i}" for i in range(6)]
+
+def test_parse_many_directory_unordered(tmp_path):
+    paths, broken = _write_corpus(tmp_path)
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
+    results = list(parser.parse_many([tmp_path], workers=2))
+    assert sorted(r.path for r in results) == sorted(paths + [broken])
+    assert sum(1 for r in results if not r.ok) == 1
+
+def test_cli_parse_reports_failures(tmp_path, capsys):
+    _write_corpus(tmp_path, count=2)
+    assert main(["parse", str(tmp_path), "--workers", "1", "--ordered"]) == 1
+    out = capsys.readouterr().out
+    assert "broken.cg: ERROR" in out
+    assert "m1.cg: M1" in out
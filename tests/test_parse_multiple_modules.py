@@ -13,6 +13,6 @@ def test_parse_multiple_modules():
         process: ["Step2"]
     }
     '''
-    parser = CogentParser(grammar_path="grammar/cogent.ebnf")
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
     tree = parser.parse_string(source)
     assert tree is not None
@@ -0,0 +1,22 @@
+import json
+from interpreter.resource_profiler import profile_parse_phases, PHASES
+
+SOURCE = '''
+module Profiled {
+    goal: "Profile phases"
+    inputs: [x: Int, items: List<String>]
+    process: ["A", for i in items: ["B"], try ["C"] catch e ["D"]]
+}
+'''
+
+def test_profile_reports_every_phase_and_rule():
+    profile = profile_parse_phases(SOURCE, grammar_path="interpreter/grammar/cogent.ebnf")
+    assert [p.name for p in profile.phases] == list(PHASES)
+    for phase in profile.phases:
+        assert phase.wall_sec >= 0 and phase.cpu_sec >= 0
+    assert profile.phase("grammar_load").peak_bytes > 0
+    assert profile.phase("model_build").retained_bytes > 0
+    assert profile.rules["process_step"]["calls"] == 6
+    assert profile.rules["input_item"]["calls"] == 2
+    assert profile.rules["module"]["calls"] == 1
+    assert json.loads(json.dumps(profile.to_dict()))["phases"][0]["name"] == "grammar_load"
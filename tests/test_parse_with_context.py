@@ -9,6 +9,6 @@ def test_parse_with_context():
         process: ["Step"]
     }
     '''
-    parser = CogentParser(grammar_path="grammar/cogent.ebnf")
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
     tree = parser.parse_string(source)
     assert tree is not None
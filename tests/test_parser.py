@@ -8,6 +8,6 @@ def test_parse_minimal_module():
         process: ["Print 'hello'"]
     }
     '''
-    parser = CogentParser(grammar_path="grammar/cogent.ebnf")
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
     tree = parser.parse_string(source)
     assert tree is not None
@@ -0,0 +1,65 @@
+from interpreter.parser import CogentParser
+from interpreter.semantic_model import CogentModule, model_to_dict
+import pytest
+
+SOURCE = '''
+@version("1")
+module Backends {
+    import Utils
+    type MyInt = Int
+    type Nested = List<List<MyInt>>
+    enum Color { Red, Green }
+    goal: "Compare backends"
+    inputs: [@required n: MyInt, items: List<Material>, context: String]
+    process: [
+        "Start",
+        @parallel for i in items: [
+            while "more": ["Inner"]
+        ],
+        try ["Risky"] catch err ["Recover"],
+        try []
+    ]
+    feedback: "Only feedback, no context"
+}
+module Second {
+    goal: "Second"
+    inputs: []
+    process: []
+}
+'''
+
+def _models(backend):
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf", parser=backend)
+    tree = parser.parse_string(SOURCE, as_semantic_model=True)
+    return [m for m in tree.children if isinstance(m, CogentModule)]
+
+def test_lalr_and_earley_produce_identical_models():
+    lalr = _models("lalr")
+    earley = _models("earley")
+    assert len(lalr) == 2
+    assert model_to_dict(lalr) == model_to_dict(earley)
+
+def test_optional_fields_keep_their_meaning():
+    module = _models("lalr")[0]
+    assert module.context is None
+    assert module.feedback == "Only feedback, no context"
+    assert module.annotations == {"version": ['"1"']}
+    assert module.inputs[0].annotations == {"required": True}
+    assert module.inputs[1].type_name == "List<Material>"
+    assert module.inputs[2].name == "context"
+    assert repr(module.types["Nested"]) == "List<List<MyInt>>"
+    assert module.process[1].annotations == {"parallel": True}
+    assert module.process[3].catch_var is None
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        CogentParser(grammar_path="interpreter/grammar/cogent.ebnf", parser="cyk")
+
+@pytest.mark.parametrize("backend", ["lalr", "earley"])
+def test_repeated_annotations_keep_names_aligned(backend):
+    source = '@tag(a) @tag(b) module M { goal: "g" inputs: [@x @x n: Int] process: [@y @y "s"] }'
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf", parser=backend)
+    (module,) = parser.parse_string(source, as_semantic_model=True).children
+    assert (module.name, module.annotations) == ("M", {"tag": ["b"]})
+    assert (module.inputs[0].name, module.inputs[0].type_name) == ("n", "Int")
+    assert module.process[0].text == "s"
@@ -18,7 +18,7 @@ def test_process_loops():
         ]
     }
     '''
-    parser = CogentParser(grammar_path="grammar/cogent.ebnf")
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
     tree = parser.parse_string(source)
     model = CogentTransformer().transform(tree)
     if hasattr(model, 'children') and model.children:
@@ -17,7 +17,7 @@ def test_process_try_catch():
         ]
     }
     '''
-    parser = CogentParser(grammar_path="grammar/cogent.ebnf")
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
     tree = parser.parse_string(source)
     print("[DEBUG] Parse tree:", tree)
     model = CogentTransformer().transform(tree)
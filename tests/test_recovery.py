@@ -0,0 +1,97 @@
+from interpreter.parser import CogentParser
+
+def parser():
+    return CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
+
+VALID = '''
+@owner(agent)
+module Deck {
+    type Options = List<String>
+    goal: "Pick decking"
+    inputs: [options: Options, budget: Float]
+    process: ["Compare", for o in options: ["Price it"], try ["Order"] catch e ["Retry"]]
+}
+module Other { goal: "g" inputs: [] process: [] }
+'''
+
+def summary(module):
+    return (module.name, module.goal, [(i.name, i.type_name) for i in module.inputs],
+            [getattr(s, "text", None) for s in module.process], module.annotations)
+
+def test_valid_input_matches_normal_parse():
+    p = parser()
+    result = p.parse_with_recovery(VALID)
+    assert result.ok
+    expected = p.parse_string(VALID, as_semantic_model=True).children
+    assert [summary(m) for m in result.modules] == [summary(m) for m in expected]
+
+def test_every_error_reported_in_one_pass():
+    source = (
+        'module A { goal: "a" inputs: [x Int] process: ["s" "t"] }\n'
+        'module B { goal "b" inputs: [] process: ["u",] }\n'
+        'module C { goal: "c" inputs: [] process: ["fine"] }\n'
+    )
+    result = parser().parse_with_recovery(source)
+    positions = [(d.line, d.column) for d in result.diagnostics]
+    assert positions == [(1, 33), (1, 52), (2, 17), (2, 46)]
+    assert result.diagnostics[0].message == "unexpected IDENTIFIER 'Int'"
+    assert result.diagnostics[0].repair == "inserted ':'"
+    assert "':'" in result.diagnostics[0].expected
+    assert [m.name for m in result.modules] == ["A", "B", "C"]
+    a = result.modules[0]
+    assert [(i.name, i.type_name) for i in a.inputs] == [("x", "Int")]
+    assert [s.text for s in a.process] == ["s", "t"]
+
+def test_missing_goal_gives_placeholder():
+    result = parser().parse_with_recovery('module A { inputs: [] process: ["s"] }')
+    assert [(d.line, d.column) for d in result.diagnostics] == [(1, 12)]
+    assert result.diagnostics[0].repair == "inserted 'goal' ':' STRING"
+    assert result.modules[0].goal == ""
+
+def test_extra_token_is_skipped_not_filled():
+    result = parser().parse_with_recovery('module A { goal: "g" inputs: [x: Int,, y: Int] process: [] }')
+    assert [d.repair for d in result.diagnostics] == ["skipped ','"]
+    assert [i.name for i in result.modules[0].inputs] == ["x", "y"]
+
+def test_run_of_stray_tokens_reported_once():
+    result = parser().parse_with_recovery('module A { goal: "g" inputs: [] process: [ } } } "a" ] }')
+    assert len(result.diagnostics) == 2
+    assert [m.name for m in result.modules] == ["A"]
+
+def test_bad_characters():
+    result = parser().parse_with_recovery('module A { goal: "g" inputs: [x: Int] $$$ process: ["s"] }')
+    assert [(d.line, d.column, d.message) for d in result.diagnostics] == [(1, 39, "unexpected character '$'")]
+    assert [s.text for s in result.modules[0].process] == ["s"]
+
+def test_unclosed_at_end_of_input():
+    source = 'module A { goal: "g" inputs: [x: Int] process: ["a", for i in x: ["b"'
+    result = parser().parse_with_recovery(source)
+    (d,) = result.diagnostics
+    assert (d.line, d.column, d.message) == (1, 70, "unexpected end of input")
+    assert d.repair == "inserted ']' ']' '}'"
+    module = result.modules[0]
+    assert module.process[0].text == "a"
+    assert module.process[1].steps[0].text == "b"
+
+def test_no_module_invented_from_junk():
+    result = parser().parse_with_recovery('module A { goal: "g" inputs: [] process: [] } hello')
+    assert [m.name for m in result.modules] == ["A"]
+    assert not result.ok
+
+def test_trailing_comma_does_not_derail_the_module():
+    source = ('module A { goal: "a" inputs: [a: Int, ] process: ["s", ] }\n'
+              'module B { goal: "b" inputs: [] process: ["t"] }\n')
+    result = parser().parse_with_recovery(source)
+    assert [(d.line, d.column, d.repair) for d in result.diagnostics] == [
+        (1, 39, "skipped trailing ','"), (1, 56, "skipped trailing ','")]
+    assert [summary(m) for m in result.modules] == [("A", "a", [("a", "Int")], ["s"], {}),
+                                                    ("B", "b", [], ["t"], {})]
+
+def test_error_in_one_module_keeps_the_next():
+    source = ('module A { goal: "a" inputs: [a: Int process: ["s", for x in a: ["q"\n'
+              'module B { goal: "b" inputs: [] process: ["t"] }\n')
+    result = parser().parse_with_recovery(source)
+    assert [(d.line, d.column) for d in result.diagnostics] == [(1, 38), (2, 1)]
+    assert result.diagnostics[1].repair == "inserted ']' ']' '}'"
+    assert [m.name for m in result.modules] == ["A", "B"]
+    assert summary(result.modules[1]) == ("B", "b", [], ["t"], {})
@@ -0,0 +1,91 @@
+import re
+import threading
+import time
+
+import pytest
+
+from interpreter.runtime import Runtime, NoHandlerError, LoopLimitError
+from tests.helpers import parse_module
+
+SOURCE = '''
+module Pipeline {
+    goal: "Exercise the runtime"
+    inputs: [items: List<Int>]
+    process: [
+        "Start",
+        for item in items: ["Square item"],
+        try ["Fail", "Never runs"] catch err ["Report error"],
+        try ["Fail"],
+        while "counting": ["Tick"]
+    ]
+}
+'''
+
+def make_runtime(**kwargs):
+    runtime = Runtime(**kwargs)
+    runtime.register("Start", lambda text, scope: "started")
+    runtime.register("Square item", lambda text, scope: scope["item"] ** 2)
+    runtime.register("Report error", lambda text, scope: f"caught {scope['err']}")
+    runtime.register("Tick", lambda text, scope: scope.__setitem__("ticks", scope.get("ticks", 0) + 1))
+
+    @runtime.register(re.compile("Fail.*"))
+    def fail(text, scope):
+        raise ValueError("boom")
+
+    runtime.register_condition("counting", lambda scope: scope.get("ticks", 0) < 3)
+    return runtime
+
+def test_sequential_semantics(compiled):
+    result = make_runtime(compiled=compiled).run(parse_module(SOURCE), {"items": [1, 2, 3]})
+    assert result.values[:5] == ["started", 1, 4, 9, "caught boom"]
+    assert [r.path for r in result.results[1:5]] == [(1, "steps", 0)] * 3 + [(2, "catch_steps", 0)]
+    assert [r.iteration for r in result.results[1:4]] == [(0,), (1,), (2,)]
+    assert result.scope["ticks"] == 3
+    assert "Never runs" not in [r.text for r in result.results]
+
+def test_parallel_for_keeps_order_and_overlaps(compiled):
+    module = parse_module('''module Wide { goal: "g" inputs: [items: List<Int>]
+        process: [@parallel for item in items: ["Work"]] }''')
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def work(text, scope):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+        return scope["item"]
+
+    with Runtime(handlers={"Work": work}, max_workers=4, compiled=compiled) as runtime:
+        result = runtime.run(module, {"items": list(range(12))})
+    assert result.values == list(range(12))
+    assert 1 < peak[0] <= 4
+
+def test_independent_steps_run_as_group(compiled):
+    module = parse_module('''module Fan { goal: "g" inputs: []
+        process: [@independent "A", @independent "B", "C"] }''')
+    with Runtime(default=lambda text, scope: text, max_workers=2, compiled=compiled) as runtime:
+        result = runtime.run(module)
+    assert [(r.path, r.value) for r in result.results] == [((0,), "A"), ((1,), "B"), ((2,), "C")]
+
+def test_parallel_failure_is_catchable(compiled):
+    module = parse_module('''module Risky { goal: "g" inputs: [items: List<Int>]
+        process: [try [@parallel for item in items: ["Check"]] catch err ["Recover"]] }''')
+
+    def check(text, scope):
+        if scope["item"] == 2:
+            raise KeyError(scope["item"])
+        return scope["item"]
+
+    with Runtime(handlers={"Check": check, "Recover": lambda text, scope: type(scope["err"]).__name__},
+                 compiled=compiled) as runtime:
+        assert runtime.run(module, {"items": [1, 2, 3]}).values == ["KeyError"]
+
+def test_errors(compiled):
+    with pytest.raises(NoHandlerError):
+        Runtime(compiled=compiled).run(parse_module(SOURCE), {"items": []})
+    runtime = make_runtime(max_loop_iterations=2, compiled=compiled)
+    with pytest.raises(LoopLimitError):
+        runtime.run(parse_module(SOURCE), {"items": []})
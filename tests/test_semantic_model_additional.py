@@ -10,7 +10,7 @@ def test_semantic_model_empty_inputs_and_process():
         process: []
     }
     '''
-    parser = CogentParser(grammar_path="grammar/cogent.ebnf")
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
     tree = parser.parse_string(source)
     model = CogentTransformer().transform(tree)
     if hasattr(model, 'children') and model.children:
@@ -31,7 +31,7 @@ def test_semantic_model_multiple_inputs_and_steps():
         process: ["Step1", "Step2", "Step3"]
     }
     '''
-    parser = CogentParser(grammar_path="grammar/cogent.ebnf")
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
     tree = parser.parse_string(source)
     model = CogentTransformer().transform(tree)
     if hasattr(model, 'children') and model.children:
@@ -60,7 +60,7 @@ def test_semantic_model_with_all_fields():
         feedback: "Test feedback"
     }
     '''
-    parser = CogentParser(grammar_path="grammar/cogent.ebnf")
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
     tree = parser.parse_string(source)
     model = CogentTransformer().transform(tree)
     if hasattr(model, 'children') and model.children:
@@ -9,7 +9,7 @@ def test_semantic_model_minimal():
         process: ["Print 'hello'"]
     }
     '''
-    parser = CogentParser(grammar_path="grammar/cogent.ebnf")
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
     tree = parser.parse_string(source)
     model = CogentTransformer().transform(tree)
     # Lark returns a Tree for the start rule; extract the module
@@ -14,7 +14,7 @@ def test_semantic_model_multiple_modules():
         process: ["Step2"]
     }
     '''
-    parser = CogentParser(grammar_path="grammar/cogent.ebnf")
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
     tree = parser.parse_string(source)
     # Lark returns a list for start rule with multiple modules
     models_tree = CogentTransformer().transform(tree)
@@ -0,0 +1,41 @@
+import pickle
+import pytest
+from interpreter.parser import CogentParser
+from interpreter.semantic_model import EMPTY_ANNOTATIONS, ProcessStep
+
+SOURCE = '''
+module Compact {
+    goal: "Slots"
+    inputs: [a: List<Material>, b: List<Material>]
+    process: ["Plain", @parallel for m in a: ["Inner"]]
+}
+'''
+
+def _module():
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
+    return parser.parse_string(SOURCE, as_semantic_model=True).children[0]
+
+def test_model_objects_have_no_instance_dict():
+    module = _module()
+    for node in (module, module.inputs[0], module.process[0], module.process[1]):
+        assert not hasattr(node, "__dict__")
+
+def test_unannotated_nodes_share_read_only_annotations():
+    module = _module()
+    assert module.annotations is EMPTY_ANNOTATIONS
+    assert module.process[0].annotations is EMPTY_ANNOTATIONS
+    assert module.process[1].annotations == {"parallel": True}
+    with pytest.raises(TypeError):
+        module.process[0].annotations["cost"] = "high"
+    step = ProcessStep("x")
+    step.annotations = {"cost": ["high"]}
+    assert ProcessStep("y").annotations == {}
+
+def test_identifiers_and_type_names_are_interned():
+    module = _module()
+    assert module.inputs[0].type_name is module.inputs[1].type_name
+
+def test_pickle_round_trip_keeps_shared_sentinel():
+    module = pickle.loads(pickle.dumps(_module()))
+    assert module.annotations is EMPTY_ANNOTATIONS
+    assert module.process[1].annotations == {"parallel": True}
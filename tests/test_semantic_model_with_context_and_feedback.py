@@ -11,7 +11,7 @@ def test_semantic_model_with_context_and_feedback():
         feedback: "This is feedback."
     }
     '''
-    parser = CogentParser(grammar_path="grammar/cogent.ebnf")
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
     tree = parser.parse_string(source)
     model = CogentTransformer().transform(tree)
     if hasattr(model, 'children') and model.children:
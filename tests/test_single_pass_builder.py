@@ -0,0 +1,32 @@
+import logging
+from interpreter.parser import CogentParser, CogentTransformer
+from interpreter.semantic_model import model_to_dict
+
+SOURCE = '''
+module Fast {
+    goal: "Single pass"
+    inputs: [@required x: Int]
+    process: ["A", @retry(twice) for i in xs: ["B"], try ["C"] catch e ["D"]]
+}
+'''
+
+def test_single_pass_matches_two_pass():
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
+    one_pass = parser.parse_string(SOURCE, as_semantic_model=True)
+    two_pass = CogentTransformer().transform(parser.parse_string(SOURCE))
+    assert model_to_dict(one_pass.children) == model_to_dict(two_pass.children)
+
+def test_transformer_is_silent_by_default(capsys):
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
+    parser.parse_string(SOURCE, as_semantic_model=True)
+    CogentTransformer().transform(parser.parse_string(SOURCE))
+    assert capsys.readouterr().out == ""
+
+def test_trace_goes_to_logger_when_enabled(caplog):
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
+    with caplog.at_level(logging.DEBUG, logger="interpreter.parser"):
+        model = parser.parse_string(SOURCE, as_semantic_model=True)
+    assert model.children[0].name == "Fast"
+    messages = [r.getMessage() for r in caplog.records]
+    assert any(m.startswith("input_item: name=x") for m in messages)
+    assert any(m.startswith("annotation: retry") for m in messages)
@@ -0,0 +1,60 @@
+import os
+import shutil
+import subprocess
+import sys
+from importlib import resources
+from pathlib import Path
+
+import pytest
+
+from benchmarks.bench_startup import IMPORT_BUDGETS_US, import_cost
+from interpreter import __version__
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS_US))
+def test_entry_point_import_budget(module):
+    cost, heavy = import_cost(module)
+    assert heavy == []
+    assert cost <= IMPORT_BUDGETS_US[module], f"importing {module} took {cost} us"
+
+def test_version_command():
+    out = subprocess.run([sys.executable, "-m", "interpreter", "--version"], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == f"cogent {__version__}"
+
+def test_check_command(tmp_path, capsys):
+    from interpreter.cli import main
+    (tmp_path / "a.cg").write_text('module A { enum E { X } goal: "g" inputs: [x: Strin] process: ["s"] }')
+    assert main(["check", "-j", "1", str(tmp_path)]) == 1
+    out = capsys.readouterr().out
+    assert "A: input x: unknown type 'Strin' [unknown-type]" in out
+    assert "unused-declaration" in out
+
+def test_profile_viz_imports_without_matplotlib():
+    proc = subprocess.run([sys.executable, "-c", "import sys, interpreter.profile_viz; print('matplotlib' in sys.modules)"],
+                          capture_output=True, text=True, check=True)
+    assert proc.stdout.strip() == "False"
+
+def test_grammar_resolves_through_package_resources():
+    from interpreter.parser import DEFAULT_GRAMMAR_PATH
+    grammar = resources.files("interpreter") / "grammar" / "cogent.ebnf"
+    assert grammar.is_file()
+    assert grammar.read_text() == DEFAULT_GRAMMAR_PATH.read_text()
+
+def test_built_package_parses_outside_the_checkout(tmp_path):
+    pytest.importorskip("setuptools")
+    root = Path(__file__).resolve().parent.parent
+    src = tmp_path / "src"
+    src.mkdir()
+    for name in ("pyproject.toml", "README.md"):
+        shutil.copy(root / name, src / name)
+    shutil.copytree(root / "interpreter", src / "interpreter", ignore=shutil.ignore_patterns("__pycache__"))
+    build = tmp_path / "build"
+    subprocess.run([sys.executable, "-c", "from setuptools import setup; setup()", "-q", "build_py", "--build-lib",
+                    str(build)], cwd=src, capture_output=True, check=True)
+    assert (build / "interpreter" / "grammar" / "cogent.ebnf").is_file()
+    env = dict(os.environ, PYTHONPATH=str(build), COGENT_CACHE_DIR=str(tmp_path / "cache"))
+    script = ("from interpreter.parser import CogentParser; "
+              "print(CogentParser().parse_string('module M { goal: \"g\" inputs: [] process: [] }', "
+              "as_semantic_model=True).children[0].name)")
+    out = subprocess.run([sys.executable, "-c", script], cwd=tmp_path, env=env, capture_output=True, text=True,
+                         check=True)
+    assert out.stdout.strip() == "M"
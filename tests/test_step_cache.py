@@ -0,0 +1,193 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+from interpreter.async_runtime import AsyncRuntime
+from interpreter.runtime import Runtime
+from interpreter.step_cache import StepCache, MemoryBackend, DiskBackend, parse_cache_args
+from interpreter.telemetry import Telemetry
+from tests.helpers import parse_module
+
+SOURCE = '''
+module Cached {
+    goal: "Skip unchanged work"
+    inputs: [items: List<Int>, budget: Int]
+    process: [
+        @cache "Fetch prices",
+        for item in items: [@cache(item) "Score item"],
+        @cache(60) "Summarize",
+        "Always runs"
+    ]
+}
+'''
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def make_runtime(cache, calls, **kwargs):
+    def handler(text, scope):
+        calls.append(text)
+        return (text, scope.get("item"), scope.get("budget"))
+    return Runtime(default=handler, step_cache=cache, **kwargs)
+
+def test_parse_cache_args():
+    assert parse_cache_args(True) == (None, None)
+    assert parse_cache_args("300") == (300.0, None)
+    assert parse_cache_args(["300", "item", "budget"]) == (300.0, ("item", "budget"))
+    assert parse_cache_args("item") == (None, ("item",))
+    assert parse_cache_args('"300"') == (300.0, None)
+    assert parse_cache_args(['"300"', '"item"']) == (300.0, ("item",))
+
+def test_only_positive_decimal_literals_are_ttls():
+    for name in ("inf", "nan", "1e3", "-5", "0", "Infinity"):
+        assert parse_cache_args([name, "item"]) == (None, (name, "item"))
+    assert parse_cache_args("0.5") == (0.5, None)
+
+def test_fingerprint_is_stable_across_processes():
+    script = ("from interpreter.step_cache import StepCache; "
+              "print(StepCache.fingerprint({'tags': {'red', 'green', 'blue', 'amber'}, "
+              "'index': {frozenset({'x', 'y'}): {'b': 1, 'a': 2}}}))")
+    fingerprints = set()
+    for seed in ("1", "2", "3"):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        result = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True)
+        fingerprints.add(result.stdout.strip())
+    assert len(fingerprints) == 1
+    assert StepCache.fingerprint({"d": {"a": 1, "b": 2}}) == StepCache.fingerprint({"d": {"b": 2, "a": 1}})
+    assert StepCache.fingerprint({"d": [1, 2]}) != StepCache.fingerprint({"d": (1, 2)})
+
+def test_repeat_run_skips_cached_steps(compiled):
+    module = parse_module(SOURCE)
+    cache = StepCache()
+    calls = []
+    runtime = make_runtime(cache, calls, compiled=compiled)
+    first = runtime.run(module, {"items": [1, 2], "budget": 5})
+    assert len(calls) == 5
+    calls.clear()
+    second = runtime.run(module, {"items": [1, 2], "budget": 5})
+    assert calls == ["Always runs"]
+    assert [(r.path, r.iteration, r.value) for r in second.results] == \
+        [(r.path, r.iteration, r.value) for r in first.results]
+    assert cache.stats()["hits"] == 4
+
+def test_changed_inputs_miss(compiled):
+    module = parse_module(SOURCE)
+    calls = []
+    runtime = make_runtime(StepCache(), calls, compiled=compiled)
+    runtime.run(module, {"items": [1, 2], "budget": 5})
+    calls.clear()
+    runtime.run(module, {"items": [1, 3], "budget": 5})
+    # Whole-scope steps see the new list; only the item=1 iteration is reused.
+    assert calls == ["Fetch prices", "Score item", "Summarize", "Always runs"]
+
+def test_named_inputs_ignore_other_scope_changes(compiled):
+    module = parse_module(SOURCE)
+    calls = []
+    runtime = make_runtime(StepCache(), calls, compiled=compiled)
+    runtime.run(module, {"items": [1, 2], "budget": 5})
+    calls.clear()
+    runtime.run(module, {"items": [1, 2], "budget": 9})
+    assert calls.count("Score item") == 0
+    assert "Fetch prices" in calls
+
+def test_ttl_expiry():
+    module = parse_module(SOURCE)
+    clock = FakeClock()
+    cache = StepCache(clock=clock)
+    calls = []
+    runtime = make_runtime(cache, calls)
+    runtime.run(module, {"items": [], "budget": 1})
+    calls.clear()
+    clock.now += 59
+    runtime.run(module, {"items": [], "budget": 1})
+    assert calls == ["Always runs"]
+    calls.clear()
+    clock.now += 2
+    runtime.run(module, {"items": [], "budget": 1})
+    assert calls == ["Summarize", "Always runs"]
+    assert cache.stats()["expired"] == 1
+
+def test_changed_module_misses():
+    cache = StepCache()
+    calls = []
+    runtime = make_runtime(cache, calls)
+    runtime.run(parse_module(SOURCE), {"items": [], "budget": 1})
+    calls.clear()
+    runtime.run(parse_module(SOURCE.replace("Skip unchanged work", "Other goal")), {"items": [], "budget": 1})
+    assert calls == ["Fetch prices", "Summarize", "Always runs"]
+
+def test_memory_backend_lru_eviction():
+    backend = MemoryBackend(max_entries=2)
+    cache = StepCache(backend)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == (True, 1)
+    cache.put("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.stats()["evictions"] == 1
+
+def test_disk_backend_persists(tmp_path):
+    module = parse_module(SOURCE)
+    calls = []
+    make_runtime(StepCache(DiskBackend(tmp_path)), calls).run(module, {"items": [1], "budget": 1})
+    calls.clear()
+    make_runtime(StepCache(DiskBackend(tmp_path)), calls).run(module, {"items": [1], "budget": 1})
+    assert calls == ["Always runs"]
+
+def test_disk_backend_size_bound(tmp_path):
+    backend = DiskBackend(tmp_path, max_bytes=1000)
+    cache = StepCache(backend)
+    for k in range(20):
+        cache.put(f"key{k}", b"x" * 100)
+    assert sum(p.stat().st_size for p in tmp_path.glob("*.step")) <= 1000
+    assert backend.evictions > 0
+    assert cache.get("key19")[0]
+
+def test_uncacheable_values_run_every_time():
+    module = parse_module('module U { goal: "g" inputs: [] process: [@cache "Make lock"] }')
+    cache = StepCache()
+    calls = []
+    runtime = Runtime(default=lambda text, scope: calls.append(text) or (lambda: None), step_cache=cache)
+    runtime.run(module)
+    runtime.run(module)
+    assert len(calls) == 2
+    assert cache.stats()["uncacheable"] == 2
+
+def test_stats_reported_to_telemetry():
+    telemetry = Telemetry()
+    runtime = make_runtime(StepCache(telemetry=telemetry), [])
+    module = parse_module(SOURCE)
+    runtime.run(module, {"items": [1], "budget": 1})
+    runtime.run(module, {"items": [1], "budget": 1})
+    assert telemetry.counters["step_cache.misses"] == 3
+    assert telemetry.counters["step_cache.hits"] == 3
+
+def test_parallel_loop_uses_cache():
+    module = parse_module(SOURCE.replace("for item", "@parallel for item"))
+    calls = []
+    with make_runtime(StepCache(), calls, max_workers=2) as runtime:
+        runtime.run(module, {"items": [1, 2, 3], "budget": 1})
+        calls.clear()
+        runtime.run(module, {"items": [1, 2, 3], "budget": 1})
+    assert calls == ["Always runs"]
+
+def test_async_runtime_uses_cache():
+    module = parse_module(SOURCE)
+    calls = []
+
+    async def handler(text, scope):
+        calls.append(text)
+        await asyncio.sleep(0)
+        return text
+
+    runtime = AsyncRuntime(default=handler, step_cache=StepCache())
+    runtime.run_sync(module, {"items": [1, 2], "budget": 1})
+    calls.clear()
+    runtime.run_sync(module, {"items": [1, 2], "budget": 1})
+    assert calls == ["Always runs"]
@@ -0,0 +1,120 @@
+import json
+import threading
+import time
+
+import pytest
+
+from interpreter.parser import CogentParser
+from interpreter.telemetry import Telemetry, JsonlSink, AggregatingSink, default_telemetry
+
+def test_log_event_keeps_simple_api():
+    telemetry = Telemetry()
+    telemetry.log_event("parse", {"file": "a.cg"})
+    assert telemetry.events == [("parse", {"file": "a.cg"})]
+
+def test_ring_buffer_is_bounded_without_sinks():
+    telemetry = Telemetry(capacity=4)
+    for i in range(10):
+        telemetry.log_event("e", i)
+    assert [details for _, details in telemetry.events] == [6, 7, 8, 9]
+    assert telemetry.dropped == 6
+
+def test_full_buffer_flushes_in_batches(tmp_path):
+    path = tmp_path / "events.jsonl"
+    aggregate = AggregatingSink()
+    telemetry = Telemetry(capacity=3, sinks=[JsonlSink(path), aggregate])
+    for _ in range(2):
+        with telemetry.span("work"):
+            telemetry.log_event("tick")
+    telemetry.count("widgets", 5)
+    telemetry.close()
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    kinds = [r["kind"] for r in records if r["kind"] != "counters"]
+    assert kinds == ["begin", "event", "end"] * 2
+    timestamps = [r["ts_ns"] for r in records if "ts_ns" in r]
+    assert timestamps == sorted(timestamps)
+    assert aggregate.event_counts == {"tick": 2}
+    assert aggregate.spans["work"]["count"] == 2
+    assert aggregate.counters == {"widgets": 5}
+
+def test_reading_the_buffer_does_not_consume_it():
+    telemetry = Telemetry()
+    telemetry.log_event("parse", {"file": "a.cg"})
+    assert telemetry.snapshot()[0]["details"] == {"file": "a.cg"}
+    assert telemetry.events == telemetry.events == [("parse", {"file": "a.cg"})]
+    assert [r["name"] for r in telemetry.flush()] == ["parse"]
+    assert telemetry.events == []
+
+def test_sink_may_record_while_overflow_is_written():
+    class EchoSink:
+        def __init__(self):
+            self.batches = []
+        def write(self, records, counters):
+            self.batches.append([r["details"] for r in records])
+            telemetry.log_event("written", len(records))
+        def close(self):
+            pass
+    sink = EchoSink()
+    telemetry = Telemetry(capacity=2, sinks=[sink])
+    for i in range(3):
+        telemetry.log_event("e", i)
+    assert sink.batches == [[0, 1]]
+    assert [details for _, details in telemetry.events] == [2, 2]
+
+def test_overflow_batches_arrive_in_order_one_at_a_time():
+    class OrderedSink(AggregatingSink):
+        def __init__(self):
+            super().__init__()
+            self.writing = False
+            self.last_ts = 0
+            self.problems = 0
+        def write(self, records, counters):
+            if self.writing or (records and records[0]["ts_ns"] < self.last_ts):
+                self.problems += 1
+            self.writing = True
+            time.sleep(0.0005)
+            if records:
+                self.last_ts = records[-1]["ts_ns"]
+            super().write(records, counters)
+            self.writing = False
+    sink = OrderedSink()
+    telemetry = Telemetry(capacity=8, sinks=[sink])
+    def work():
+        for _ in range(50):
+            with telemetry.span("work"):
+                pass
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    telemetry.flush()
+    assert sink.problems == 0
+    assert sink.spans["work"]["count"] == 200
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        Telemetry(capacity=0)
+
+def test_disabled_telemetry_records_nothing():
+    telemetry = Telemetry(enabled=False)
+    telemetry.log_event("e")
+    assert telemetry.begin_span("s") == 0
+    telemetry.count("c")
+    assert telemetry.snapshot() == [] and telemetry.counters == {}
+
+def test_parser_and_transformer_are_instrumented():
+    aggregate = AggregatingSink()
+    default_telemetry.add_sink(aggregate)
+    default_telemetry.enable()
+    try:
+        parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
+        parser.parse_string('module M { goal: "g" inputs: [] process: ["a", "b"] }', as_semantic_model=True)
+        default_telemetry.flush()
+    finally:
+        default_telemetry.disable()
+        default_telemetry.sinks.remove(aggregate)
+        default_telemetry.counters.clear()
+    assert aggregate.spans["parser.parse_string"]["count"] == 1
+    assert aggregate.counters["transformer.modules"] == 1
+    assert aggregate.counters["transformer.steps"] == 2
@@ -0,0 +1,127 @@
+from interpreter.parser import CogentParser
+from interpreter.type_checker import TypeChecker, TypeTable, check_modules, parse_type_name
+
+def parse(source):
+    parser = CogentParser(grammar_path="interpreter/grammar/cogent.ebnf")
+    return parser.parse_string(source, as_semantic_model=True).children
+
+CATALOG = '''
+module Catalog {
+    type Price = Float
+    enum Material { Wood, Composite, PVC }
+    goal: "Shared types"
+    inputs: [price: Price]
+    process: ["List products"]
+}
+'''
+
+def codes(result):
+    return sorted((d.code, d.module, d.subject) for d in result.diagnostics)
+
+def test_clean_batch_with_generics_and_imports():
+    modules = parse(CATALOG + '''
+    module Deck {
+        import Catalog
+        type Options = List<Material>
+        goal: "Pick decking"
+        inputs: [options: Options, budget: Price, tags: Set<String>, note: Optional<String>]
+        process: ["Choose"]
+    }
+    ''')
+    table = TypeTable()
+    result = TypeChecker(table).check(modules)
+    assert result.ok, result.diagnostics
+    options = result.input_types[("Deck", "options")]
+    assert repr(options) == "List<Catalog.Material>"
+    assert result.input_types[("Deck", "budget")] is result.input_types[("Catalog", "price")]
+    assert options is table.intern("List", None, (table.intern("Material", "Catalog"),))
+
+def test_types_are_stored_once():
+    modules = parse('''
+    module A { goal: "a" inputs: [x: List<Int>, y: List<Int>] process: ["s"] }
+    module B { goal: "b" inputs: [z: List<Int>] process: ["s"] }
+    ''')
+    table = TypeTable()
+    result = check_modules(modules, table)
+    assert len(table) == 2
+    assert len({id(t) for t in result.input_types.values()}) == 1
+
+def test_unknown_types_reported_per_input():
+    modules = parse('''
+    module M {
+        goal: "g"
+        inputs: [a: Materal, b: List<Materal>, c: Widget<Int>]
+        process: ["s"]
+    }
+    ''')
+    result = check_modules(modules, TypeTable())
+    assert codes(result) == [
+        ("unknown-type", "M", "input a"),
+        ("unknown-type", "M", "input b"),
+        ("unknown-type", "M", "input c"),
+    ]
+    assert result.input_types[("M", "b")] is None
+
+def test_imported_types_need_the_import():
+    modules = parse(CATALOG + '''
+    module Other { goal: "g" inputs: [m: Material] process: ["s"] }
+    ''')
+    result = check_modules(modules, TypeTable())
+    assert ("unknown-type", "Other", "input m") in codes(result)
+
+def test_arity_errors():
+    modules = parse('''
+    module M {
+        enum Color { Red }
+        goal: "g"
+        inputs: [a: List, b: Int<String>, c: Color<Int>]
+        process: ["s"]
+    }
+    ''')
+    result = check_modules(modules, TypeTable())
+    assert [d.code for d in result.diagnostics] == ["type-arity"] * 3
+
+def test_duplicate_enum_members():
+    modules = parse('''
+    module M {
+        enum Color { Red, Green, Red }
+        goal: "g"
+        inputs: [c: Color]
+        process: ["s"]
+    }
+    ''')
+    result = check_modules(modules, TypeTable())
+    assert codes(result) == [("duplicate-enum-member", "M", "enum Color")]
+    assert "'Red'" in result.diagnostics[0].message
+
+def test_unused_declarations_are_transitive():
+    modules = parse('''
+    module M {
+        type Used = List<Inner>
+        type Dead = List<DeadInner>
+        enum Inner { A }
+        enum DeadInner { B }
+        goal: "g"
+        inputs: [x: Used]
+        process: ["s"]
+    }
+    ''')
+    result = check_modules(modules, TypeTable())
+    assert codes(result) == [
+        ("unused-declaration", "M", "enum DeadInner"),
+        ("unused-declaration", "M", "type Dead"),
+    ]
+
+def test_cyclic_aliases_and_ambiguous_imports():
+    modules = parse('''
+    module A { type T = U type U = T goal: "g" inputs: [x: T] process: ["s"] }
+    module B { enum Shared { X } goal: "g" inputs: [s: Shared] process: ["s"] }
+    module C { enum Shared { Y } goal: "g" inputs: [s: Shared] process: ["s"] }
+    module D { import B import C goal: "g" inputs: [s: Shared] process: ["s"] }
+    ''')
+    result = check_modules(modules, TypeTable())
+    assert len(result.by_code("cyclic-alias")) == 1
+    assert [(d.module, d.subject) for d in result.by_code("ambiguous-type")] == [("D", "input s")]
+
+def test_parse_type_name():
+    assert repr(parse_type_name("List<Set<Int>>")) == "List<Set<Int>>"